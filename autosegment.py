@@ -0,0 +1,5 @@
+# Detect bowling phases automatically from tracked joints — implementation in fastbowliq/autosegment.py
+from fastbowliq.autosegment import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+# Run the pipeline over many deliveries in parallel — implementation in fastbowliq/batch.py
+from fastbowliq.batch import batch
+
+if __name__ == "__main__":
+    batch()
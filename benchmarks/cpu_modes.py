@@ -0,0 +1,83 @@
+import tempfile
+import time
+from pathlib import Path
+
+import click
+import numpy as np
+import torch
+
+from fastbowliq import keypoints, kinematics, tracking
+
+# === CPU inference modes vs fp32 ===
+# Tracks the same clip once per mode on the CPU and compares throughput and
+# the bowler's SMPL joints against the fp32 eager run.
+
+
+def run_mode(video, out_dir, mode, compile_model, threads, interop_threads):
+    """Track `video` in one CPU mode; returns (preds, frames tracked, seconds)."""
+    tracking.cpu_mode, tracking.cpu_compile = mode, compile_model
+    tracking.intra_op_threads, tracking.inter_op_threads = threads, interop_threads
+    model = tracking.load_model()
+
+    label = f"{mode}{'+compile' if compile_model else ''}"
+    pt_path = Path(out_dir) / f"{label}.pt"
+    t0 = time.perf_counter()
+    tracking.track_poses(video, pt_path, model=model, cache_root=Path(out_dir) / label)
+    seconds = time.perf_counter() - t0
+
+    preds = torch.load(pt_path, map_location="cpu")
+    return preds, int(torch.as_tensor(preds["frame_idx"]).max()) + 1, seconds
+
+
+def bowler_by_frame(preds, skeleton):
+    joints, frames, _ = keypoints.bowler_joints(preds, skeleton, engine="fk")
+    return dict(zip(frames.tolist(), joints))
+
+
+def joint_deltas(reference, candidate):
+    """Per-frame, per-joint distances (metres) over frames where both runs have the bowler."""
+    common = sorted(set(reference) & set(candidate))
+    if not common:
+        return np.empty((0, 24))
+    return np.linalg.norm(np.stack([reference[f] for f in common]) - np.stack([candidate[f] for f in common]), axis=-1)
+
+
+@click.command()
+@click.option("--input", "video", default=str(tracking.input_path), type=click.Path(exists=True), help="Reference clip.")
+@click.option("--frames", default=120, type=int, help="Frames to track per mode.")
+@click.option("--modes", default="int8,bf16", help="Comma-separated modes to compare against fp32.")
+@click.option("--compile", "compile_model", is_flag=True, help="Also torch.compile the fast modes.")
+@click.option("--threads", default=0, type=int, help="Intra-op CPU threads (0 = default).")
+@click.option("--interop-threads", default=0, type=int, help="Inter-op CPU threads (0 = default).")
+@click.option("--tolerance-mm", default=10.0, type=float, help="Max mean joint delta considered production-safe.")
+@click.option("--smpl", "smpl_path", default=kinematics.smpl_model_path, help="SMPL model folder.")
+def bench(video, frames, modes, compile_model, threads, interop_threads, tolerance_mm, smpl_path):
+    """Compare fps and bowler joint deltas of CPU inference modes against fp32."""
+    tracking.device, tracking.use_mps = torch.device("cpu"), False
+    tracking.num_frames, tracking.adaptive_sampling = frames, False
+    skeleton = kinematics.load_skeleton(smpl_path)
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        preds, n, seconds = run_mode(video, out_dir, "fp32", False, threads, interop_threads)
+        reference = bowler_by_frame(preds, skeleton)
+        print(f"📍 fp32: {n / seconds:.2f} fps ({n} frames, {seconds:.1f}s)")
+
+        for mode in [m.strip() for m in modes.split(",") if m.strip()]:
+            preds, n, seconds = run_mode(video, out_dir, mode, compile_model, threads, interop_threads)
+            deltas = joint_deltas(reference, bowler_by_frame(preds, skeleton)) * 1000
+            label = f"{mode}{'+compile' if compile_model else ''}"
+            print(f"\n📍 {label}: {n / seconds:.2f} fps ({n} frames, {seconds:.1f}s)")
+            if not len(deltas):
+                print("⚠️ No common bowler frames with fp32")
+                continue
+
+            per_joint = deltas.mean(axis=0)
+            for j in np.argsort(per_joint)[::-1][:5]:
+                print(f"   joint{j:<2} mean {per_joint[j]:6.2f} mm  max {deltas[:, j].max():6.2f} mm")
+            safe = per_joint.max() <= tolerance_mm
+            print(f"{'✅' if safe else '⚠️'} {label}: mean {deltas.mean():.2f} mm, worst joint {per_joint.max():.2f} mm, "
+                  f"max {deltas.max():.2f} mm over {len(deltas)} frames")
+
+
+if __name__ == "__main__":
+    bench()
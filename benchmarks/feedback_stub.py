@@ -0,0 +1,162 @@
+import hashlib
+import json
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import click
+import numpy as np
+import pandas as pd
+
+from fastbowliq import analysis, feedback
+
+# === Local stand-in for the Gemini generateContent endpoint ===
+# Answers POST .../<model>:generateContent with a canned Markdown report after
+# a fixed latency, and returns 429 on every Nth request so the retry path is
+# exercised. The bench command points feedback.py at it and runs a session's
+# worth of rows twice: cold (every unique prompt requested) and warm (all
+# served from the cache). Run from the repo root: python -m benchmarks.feedback_stub
+
+
+class StubState:
+    def __init__(self, latency, fail_every):
+        self.latency = latency
+        self.fail_every = fail_every
+        self.lock = threading.Lock()
+        self.received = 0   # every POST, including rejected ones
+        self.answered = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, code, body, headers=()):
+            data = json.dumps(body).encode()
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in headers:
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            if not self.path.endswith(":generateContent"):
+                return self._send(404, {"error": {"code": 404, "message": "not found"}})
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)))
+            prompt = request["contents"][0]["parts"][0]["text"]
+            with state.lock:
+                state.received += 1
+                reject = state.fail_every and state.received % state.fail_every == 0
+                state.in_flight += 1
+                state.max_in_flight = max(state.max_in_flight, state.in_flight)
+            try:
+                if reject:
+                    return self._send(429, {"error": {"code": 429, "message": "quota"}}, [("Retry-After", "0")])
+                time.sleep(state.latency)
+                metrics = "\n".join(f"| {line[2:]} | ok |" for line in prompt.splitlines() if line.startswith("- "))
+                text = (f"## Metric Feedback\n\n| Metric | Comment |\n|---|---|\n{metrics}\n\n"
+                        f"Stub report {hashlib.sha256(prompt.encode()).hexdigest()[:12]}\n")
+                with state.lock:
+                    state.answered += 1
+                self._send(200, {"candidates": [{"content": {"parts": [{"text": text}], "role": "model"}}]})
+            finally:
+                with state.lock:
+                    state.in_flight -= 1
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return Handler
+
+
+def start_stub(latency=0.2, fail_every=0, host="127.0.0.1", port=0):
+    """Serve the stub from a daemon thread; returns (server, state, base URL)."""
+    state = StubState(latency, fail_every)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state, f"http://{host}:{server.server_address[1]}/v1beta"
+
+
+def synthetic_session(path, rows, unique, seed=0):
+    """Session-style metrics CSV with `rows` deliveries drawn from `unique` distinct metric sets."""
+    rng = np.random.default_rng(seed)
+    base = pd.DataFrame({
+        "Frame_BFC": rng.integers(0, 100, unique), "Back_Knee_Angle_BFC": rng.uniform(140, 180, unique),
+        "Frame_FFC": rng.integers(100, 200, unique), "Stride_Length_m": rng.uniform(1.2, 2.0, unique),
+        "Alignment": rng.choice(["side-on", "front-on", "semi side-on", "mixed (side-on/front-on)"], unique),
+        "Max_Elbow_Angle": rng.uniform(0, 20, unique), "Hip_Shoulder_Separation": rng.uniform(10, 50, unique),
+        "Frame_Release": rng.integers(200, 300, unique), "Front_Knee_Angle_Release": rng.uniform(140, 180, unique),
+        "Delivery_Reach_m": rng.uniform(0.0, 1.0, unique), "Lateral_Flexion": rng.uniform(130, 175, unique),
+    })
+    base["Stride_Length_in"] = base["Stride_Length_m"] * 39.3701
+    base["Delivery_Reach_in"] = base["Delivery_Reach_m"] * 39.3701
+    table = base.iloc[rng.integers(0, unique, rows)][analysis.RESULT_COLUMNS].reset_index(drop=True)
+    table.insert(0, "Delivery", [f"delivery_{n:03d}" for n in range(1, rows + 1)])
+    table.to_csv(path, index=False)
+
+
+@click.group()
+def cli():
+    """Local Gemini stub server and feedback benchmark."""
+
+
+@cli.command()
+@click.option("--host", default="127.0.0.1")
+@click.option("--port", default=8766, type=int)
+@click.option("--latency", default=0.5, type=float, help="Seconds before each answer.")
+@click.option("--fail-every", default=0, type=int, help="Answer every Nth request with 429 (0 = never).")
+def serve(host, port, latency, fail_every):
+    """Run the stub in the foreground (use with feedback.py --base-url)."""
+    server, _, url = start_stub(latency, fail_every, host, port)
+    print(f"✅ Stub listening — python feedback.py --base-url {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+@cli.command()
+@click.option("--rows", default=200, type=int, help="Deliveries in the synthetic session.")
+@click.option("--unique", default=150, type=int, help="Distinct metric sets among them.")
+@click.option("--latency", default=0.5, type=float, help="Stub seconds per answer.")
+@click.option("--fail-every", default=10, type=int, help="Stub answers every Nth request with 429.")
+@click.option("--concurrency", default=feedback.max_concurrency, type=int)
+@click.option("--rpm", default=6000, type=int, help="Requests-per-minute limit for the run.")
+def bench(rows, unique, latency, fail_every, concurrency, rpm):
+    """Cold and warm feedback runs for a synthetic session against the stub."""
+    server, state, url = start_stub(latency, fail_every)
+    feedback.limiter = feedback.RateLimiter(rpm)
+    feedback.backoff_seconds = 0.05
+    with tempfile.TemporaryDirectory() as tmp:
+        feedback.cache_dir = str(Path(tmp) / "cache")
+        csv_path, report = Path(tmp) / "session_results.csv", Path(tmp) / "session_feedback.md"
+        synthetic_session(csv_path, rows, min(unique, rows))
+        runs = []
+        for label, force in (("cold", True), ("warm", False)):
+            # The warm run must miss the report manifest so it goes through the response cache
+            Path(f"{report}.manifest.json").unlink(missing_ok=True)
+            before = state.answered
+            t0 = time.perf_counter()
+            text = feedback.generate_feedback(csv_path, report, base_url=url, concurrency=concurrency, force=force)
+            runs.append((label, time.perf_counter() - t0, state.answered - before, text))
+    server.shutdown()
+
+    serial = runs[0][2] * latency  # one request at a time, no 429s
+    print()
+    for label, seconds, answered, _ in runs:
+        print(f"📍 {label:<5} {rows} rows  {seconds:7.2f}s  {answered:>4} answered by the stub")
+    print(f"📍 peak concurrency at the stub {state.max_in_flight}, 429s sent {state.received - state.answered}, "
+          f"serial estimate {serial:.1f}s")
+    if runs[0][3] != runs[1][3]:
+        raise SystemExit("❌ Warm report differs from the cold one")
+    if runs[1][2]:
+        raise SystemExit("❌ Warm run reached the API")
+    print("✅ Warm run served entirely from the cache, reports identical")
+
+
+if __name__ == "__main__":
+    cli()
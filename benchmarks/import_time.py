@@ -0,0 +1,98 @@
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+import click
+
+# === Import-time benchmark ===
+# Imports each module in a fresh interpreter and reports the median cold import
+# time and which heavy dependencies it dragged in.
+# Run from the repo root: python -m benchmarks.import_time
+
+modules = [
+    "fastbowliq",
+    "fastbowliq.metrics",
+    "fastbowliq.joint_store",
+    "fastbowliq.analysis",
+    "fastbowliq.report",
+    "fastbowliq.kinematics",
+    "fastbowliq.keypoints",
+    "fastbowliq.autosegment",
+    "fastbowliq.keyframes",
+    "fastbowliq.tracking_cache",
+    "fastbowliq.overlay",
+    "fastbowliq.session",
+    "fastbowliq.batch",
+    "fastbowliq.tracking",
+]
+heavy = ["torch", "cv2", "pandas", "smplx", "aitviewer", "google.genai"]
+
+# Modules that must stay light: (max milliseconds, dependencies that must not be loaded)
+budgets = {
+    "fastbowliq": (150, heavy),
+    "fastbowliq.metrics": (400, ["torch", "cv2", "pandas"]),
+    "fastbowliq.analysis": (1500, ["torch", "cv2"]),
+    "fastbowliq.report": (1500, ["torch", "cv2"]),
+    # torch / cv2 are imported by the functions that run models or video I/O;
+    # tracking.py is the exception, its device and model setup need torch at import
+    "fastbowliq.keypoints": (1500, ["torch", "cv2", "smplx"]),
+    "fastbowliq.autosegment": (1500, ["torch", "cv2", "smplx"]),
+    "fastbowliq.keyframes": (1500, ["torch", "cv2", "smplx"]),
+    "fastbowliq.tracking_cache": (150, ["torch", "cv2"]),
+    "fastbowliq.overlay": (1500, ["torch", "cv2"]),
+    "fastbowliq.session": (1500, ["torch", "cv2", "smplx"]),
+}
+
+PROBE = """
+import json, sys, time
+t = time.perf_counter()
+import {module}
+ms = (time.perf_counter() - t) * 1000
+print(json.dumps({{"ms": ms, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def time_import(module, runs):
+    """Median import time (ms) over fresh interpreters and the heavy modules it loaded."""
+    samples, loaded = [], []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", PROBE.format(module=module, heavy=heavy)],
+                             capture_output=True, text=True, cwd=Path(__file__).resolve().parent.parent)
+        if out.returncode:
+            raise RuntimeError(out.stderr.strip().splitlines()[-1])
+        result = json.loads(out.stdout)
+        samples.append(result["ms"])
+        loaded = result["loaded"]
+    return statistics.median(samples), loaded
+
+
+@click.command()
+@click.option("--runs", default=5, type=int, help="Fresh interpreters per module.")
+def bench(runs):
+    """Report cold import time per module and fail if a light module regresses."""
+    failures = []
+    for module in modules:
+        try:
+            ms, loaded = time_import(module, runs)
+        except RuntimeError as e:
+            print(f"⚠️ {module:<24} import failed: {e}")
+            continue
+        print(f"📍 {module:<24} {ms:8.1f} ms   loads: {', '.join(loaded) or '-'}")
+
+        if module in budgets:
+            limit, forbidden = budgets[module]
+            if ms > limit:
+                failures.append(f"{module} took {ms:.0f} ms (budget {limit} ms)")
+            failures += [f"{module} imports {dep}" for dep in loaded if dep in forbidden]
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+    print("✅ Import budgets met")
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,157 @@
+import concurrent.futures as cf
+import contextlib
+import io
+import json
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import click
+
+# === Stage benchmarks on synthetic sequences ===
+# Times the CPU stages on synthetic preds of increasing length, each case in
+# a fresh process. Peak RSS is reset just before the timed call (Linux
+# /proc/self/clear_refs), so it covers that call alone. Needs neither the
+# CoMotion weights nor the SMPL model (joints use the FK engine with a
+# synthetic skeleton). Run from the repo root: python -m benchmarks.stages
+
+CASES = ["fk", "bowler_selection", "keypoints", "metrics", "overlay"]
+default_sizes = "1000,10000,100000"
+overlay_size = (320, 180)  # Synthetic video resolution for the overlay case
+
+# Regression thresholds against a --baseline run
+max_slowdown = 0.25       # fps may drop by at most 25%
+max_memory_growth = 0.25  # peak RSS growth of the case may rise by at most 25%
+
+
+def rss_mb(field):
+    """VmRSS (current) or VmHWM (peak) of this process in MB, from /proc on Linux."""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+    raise KeyError(field)
+
+
+def reset_peak_rss():
+    """Restart VmHWM from the current RSS so the peak covers only what follows (Linux)."""
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+
+
+def run_case(case, num_frames, num_people, seed):
+    """Run one case in this process; returns its timing and memory record."""
+    import gc
+
+    import pandas as pd
+
+    from fastbowliq import analysis, keypoints, kinematics, metrics, overlay
+
+    from . import synthetic
+
+    skeleton = synthetic.synthetic_skeleton(seed)
+    preds = synthetic.synthetic_preds(num_frames, num_people, seed=seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        if case in ("metrics", "overlay"):
+            bowler = keypoints.subset_rows(preds, keypoints.track_rows(preds, 1))
+            joints, frames, _ = kinematics.extract_joints(skeleton, bowler)
+            joints = joints.astype(float)
+            rows = synthetic.synthetic_labels(frames)
+        if case == "overlay":
+            video, results = Path(tmp) / "in.mp4", Path(tmp) / "results.csv"
+            synthetic.synthetic_video(video, num_frames, *overlay_size)
+            with contextlib.redirect_stdout(io.StringIO()):
+                row = {}
+                for _, group in analysis.METRIC_GROUPS:
+                    row.update(group(joints, frames, rows))
+            pd.DataFrame([row])[analysis.RESULT_COLUMNS].to_csv(results, index=False)
+
+        gc.collect()
+        reset_peak_rss()
+        rss_before = rss_mb("VmRSS")
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            if case == "fk":
+                kinematics.extract_joints(skeleton, preds)
+            elif case == "bowler_selection":
+                keypoints.select_bowler_track(preds, skeleton)
+            elif case == "keypoints":
+                keypoints.bowler_joints(preds, skeleton, engine="fk")
+            elif case == "metrics":
+                series = metrics.metric_series(joints)
+                for _, group in analysis.METRIC_GROUPS:
+                    group(joints, frames, rows)
+                analysis.event_windows(series, frames, {e: int(frames[r[0]]) for e, r in rows.items()})
+            elif case == "overlay":
+                overlay.render_overlay(video, Path(tmp) / "out.mp4", results, force=True)
+        seconds = time.perf_counter() - t0
+        rss_after = rss_mb("VmHWM")
+
+    return {
+        "case": case, "frames": num_frames, "people": num_people, "rows": len(preds["frame_idx"]),
+        "seconds": round(seconds, 4), "fps": round(num_frames / seconds, 1),
+        "peak_rss_mb": round(rss_after, 1), "rss_growth_mb": round(rss_after - rss_before, 1),
+    }
+
+
+def isolated(case, num_frames, num_people, seed):
+    """run_case in a fresh spawned process."""
+    with cf.ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(run_case, case, num_frames, num_people, seed).result()
+
+
+def regressions(results, baseline):
+    """Messages for every case slower or hungrier than the baseline allows."""
+    previous = {(r["case"], r["frames"], r["people"]): r for r in baseline}
+    found = []
+    for r in results:
+        old = previous.get((r["case"], r["frames"], r["people"]))
+        if old is None:
+            continue
+        if r["fps"] < old["fps"] * (1 - max_slowdown):
+            found.append(f"{r['case']}@{r['frames']}: {r['fps']:.0f} fps vs baseline {old['fps']:.0f}")
+        # A few MB of allocator noise is not a regression
+        if r["rss_growth_mb"] > max(old["rss_growth_mb"] * (1 + max_memory_growth), old["rss_growth_mb"] + 16):
+            found.append(f"{r['case']}@{r['frames']}: +{r['rss_growth_mb']:.0f} MB vs baseline "
+                         f"+{old['rss_growth_mb']:.0f} MB")
+    return found
+
+
+@click.command()
+@click.option("--sizes", default=default_sizes, help="Comma-separated frame counts.")
+@click.option("--people", default=2, type=int, help="Tracked people per synthetic clip.")
+@click.option("--cases", default=",".join(CASES), help="Comma-separated cases to run.")
+@click.option("--seed", default=0, type=int)
+@click.option("--out", default="stage_benchmarks.json", help="Where to write the results JSON.")
+@click.option("--baseline", default=None, type=click.Path(exists=True), help="Earlier results JSON to compare against.")
+def bench(sizes, people, cases, seed, out, baseline):
+    """Benchmark the CPU stages on synthetic SMPL sequences."""
+    results = []
+    for case in [c.strip() for c in cases.split(",") if c.strip()]:
+        if case not in CASES:
+            raise click.BadParameter(f"unknown case '{case}' (choose from {', '.join(CASES)})")
+        for num_frames in [int(s) for s in sizes.split(",")]:
+            r = isolated(case, num_frames, people, seed)
+            results.append(r)
+            print(f"📍 {case:<17} {num_frames:>7} frames  {r['seconds']:8.3f}s  {r['fps']:>11.1f} fps  "
+                  f"peak {r['peak_rss_mb']:7.1f} MB  (+{r['rss_growth_mb']:.1f} MB)")
+
+    Path(out).parent.mkdir(parents=True, exist_ok=True)
+    with open(out, "w") as f:
+        json.dump({"python": sys.version.split()[0], "results": results}, f, indent=2)
+    print(f"✅ Results written to {out}")
+
+    if baseline:
+        with open(baseline) as f:
+            found = regressions(results, json.load(f)["results"])
+        for message in found:
+            print(f"❌ {message}")
+        if found:
+            sys.exit(1)
+        print("✅ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,92 @@
+import cv2
+import numpy as np
+import torch
+
+from fastbowliq.kinematics import Skeleton
+
+# === Synthetic SMPL sequences ===
+# Stand-ins for a CoMotion .pt and the SMPL model so the benchmarks run on a
+# CPU-only box without model weights. The shapes and dtypes match what
+# tracking.py saves; the motion is a plausible run-up, not a real delivery.
+
+# Approximate rest-pose joints of the neutral SMPL model (metres, pelvis at the origin)
+REST_JOINTS = [
+    [0.00, 0.00, 0.00], [0.06, -0.09, 0.00], [-0.06, -0.09, 0.00], [0.00, 0.11, -0.02],
+    [0.10, -0.47, 0.01], [-0.10, -0.47, 0.01], [0.00, 0.25, 0.01], [0.09, -0.87, -0.03],
+    [-0.09, -0.87, -0.03], [0.00, 0.31, 0.03], [0.12, -0.93, 0.09], [-0.12, -0.93, 0.09],
+    [0.00, 0.52, -0.01], [0.08, 0.43, 0.01], [-0.08, 0.43, 0.01], [0.00, 0.59, 0.05],
+    [0.18, 0.46, -0.01], [-0.18, 0.46, -0.01], [0.44, 0.44, -0.03], [-0.44, 0.44, -0.03],
+    [0.70, 0.45, -0.03], [-0.70, 0.45, -0.03], [0.79, 0.44, -0.04], [-0.79, 0.44, -0.04],
+]
+SMPL_PARENTS = [-1, 0, 0, 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 9, 9, 12, 13, 14, 16, 17, 18, 19, 20, 21]
+NUM_BETAS = 10
+
+
+def synthetic_skeleton(seed=0):
+    """Skeleton with the SMPL joint tree, approximate rest joints and random shape directions."""
+    rng = np.random.default_rng(seed)
+    return Skeleton(REST_JOINTS, rng.normal(0, 0.01, (24, 3, NUM_BETAS)), SMPL_PARENTS)
+
+
+def synthetic_preds(num_frames, num_people=2, fps=30, seed=0):
+    """CoMotion-style preds dict: person 0 runs in and bowls, the others stand around.
+
+    Rows are ordered by frame then track like tracking.py output. Bystanders
+    appear partway through the clip so tracks have uneven coverage.
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(num_frames) / fps
+    cycle = 2 * np.pi * 1.5 * t  # running stride frequency
+
+    columns = {k: [] for k in ("id", "pose", "trans", "betas", "frame_idx")}
+    for person in range(num_people):
+        start = 0 if person == 0 else int(rng.integers(0, max(num_frames // 4, 1)))
+        frames = np.arange(start, num_frames)
+        pose = rng.normal(0, 0.03, (len(frames), 24, 3))
+        trans = np.empty((len(frames), 3))
+        if person == 0:
+            c = cycle[frames]
+            pose[:, [1, 2], 0] += 0.6 * np.stack([np.sin(c), -np.sin(c)], axis=1)  # hips
+            pose[:, [4, 5], 0] += 0.8 * np.stack([1 - np.cos(c), 1 + np.cos(c)], axis=1)  # knees
+            pose[:, 17, 2] += 2.5 * np.sin(c / 3)  # bowling shoulder windmill
+            pose[:, 19, 1] += 0.2 * np.abs(np.sin(c / 3))
+            # Run-up towards the camera, repeated every 20 s of footage
+            run = (t[frames] % 20) / 20
+            trans[:] = np.stack([0.3 * np.sin(c / 6), 0.9 + 0.03 * np.sin(2 * c), 25 - 18 * run], axis=1)
+        else:
+            trans[:] = [rng.uniform(-4, 4), 0.9, rng.uniform(8, 20)]
+            trans += rng.normal(0, 0.01, trans.shape)
+
+        columns["id"].append(np.full(len(frames), person + 1))
+        columns["pose"].append(pose.reshape(len(frames), 72))
+        columns["trans"].append(trans)
+        columns["betas"].append(np.repeat(rng.normal(0, 1, (1, NUM_BETAS)), len(frames), axis=0))
+        columns["frame_idx"].append(frames)
+
+    frame_idx = np.concatenate(columns["frame_idx"])
+    order = np.lexsort((np.concatenate(columns["id"]), frame_idx))
+    preds = {k: torch.from_numpy(np.concatenate(v)[order]) for k, v in columns.items()}
+    preds["id"], preds["frame_idx"] = preds["id"].long(), preds["frame_idx"].long()
+    for k in ("pose", "trans", "betas"):
+        preds[k] = preds[k].float()
+    return preds
+
+
+def synthetic_labels(frames):
+    """Row indices of bfc/ffc/release events spread over a delivery, as analysis.py expects."""
+    n = len(frames)
+    return {
+        "bfc": np.arange(int(n * 0.60), int(n * 0.60) + 3),
+        "ffc": np.arange(int(n * 0.70), int(n * 0.70) + 3),
+        "release": np.arange(int(n * 0.80), int(n * 0.80) + 3),
+    }
+
+
+def synthetic_video(path, num_frames, width=320, height=180, fps=30):
+    """Write a moving-gradient mp4 of num_frames frames to path."""
+    out = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    base = np.tile(np.linspace(0, 255, width, dtype=np.uint8), (height, 1))
+    for i in range(num_frames):
+        frame = np.roll(base, i % width, axis=1)
+        out.write(cv2.merge([frame, np.flipud(frame), np.full_like(frame, i % 256)]))
+    out.release()
@@ -0,0 +1,65 @@
+"""FastBowlIQ: fast-bowling biomechanics from CoMotion SMPL tracks.
+
+Importing the package does no work: submodules and their heavy dependencies
+(torch, cv2, CoMotion) load on first attribute access, e.g.
+
+    from fastbowliq import analyze           # numpy + pandas only
+    from fastbowliq.metrics import metric_series
+"""
+import importlib
+
+# === Public API: name -> submodule ===
+_EXPORTS = {
+    "metric_series": "metrics",
+    "event_window": "metrics",
+    "classify_alignment": "metrics",
+    "JointStore": "joint_store",
+    "load_store": "joint_store",
+    "save_store": "joint_store",
+    "analyze": "analysis",
+    "load_skeleton": "kinematics",
+    "forward_kinematics": "kinematics",
+    "bowler_joints": "keypoints",
+    "extract_keypoints": "keypoints",
+    "detect_events": "autosegment",
+    "segment_file": "autosegment",
+    "label_video": "segment",
+    "FrameStore": "frame_store",
+    "track_poses": "tracking",
+    "load_model": "tracking",
+    "interpolate_preds": "keyframes",
+    "render_overlay": "overlay",
+    "render_pt": "visualize",
+    "render_skeleton": "visualize",
+    "render_parallel": "visualize",
+    "render_contact_sheet": "visualize",
+    "generate_feedback": "feedback",
+    "generate_report": "report",
+    "score_metrics": "report",
+    "BatchRunner": "batch",
+    "run_session": "session",
+    "JobQueue": "service",
+}
+
+_SUBMODULES = {
+    "analysis", "autosegment", "batch", "feedback", "fingerprint", "frame_store", "joint_store", "keyframes",
+    "keypoints", "kinematics", "metrics", "overlay", "pipeline", "report", "segment", "service", "session",
+    "telemetry", "tracking", "tracking_cache", "visualize",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS) | _SUBMODULES)
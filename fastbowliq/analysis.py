@@ -0,0 +1,152 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+from . import joint_store, metrics
+from . import telemetry
+from .fingerprint import Manifest, code_version, file_hash
+from .joint_store import load_store
+from .metrics import (
+    classify_alignment, delivery_reach, elbow_extension, estimate_model_height, event_window,
+    hip_shoulder_separation, knee_angle, lateral_flexion, metric_series, scale_distance, stride_length,
+)
+
+# === Main Analysis ===
+actual_height = 1.83  # meters
+event_half_window = 5  # frames either side of an event for min/max windows
+EVENTS = ["bfc", "ffc", "release"]
+EVENT_FRAME_COLUMNS = {"bfc": "Frame_BFC", "ffc": "Frame_FFC", "release": "Frame_Release"}
+
+def load_delivery(store_dir="phases/hardik"):
+    """(frames, 24, 3) joints, frame indices and phase labels of one delivery."""
+    store = load_store(store_dir)
+    return np.asarray(store.joints, dtype=float), store.frames, store.labels
+
+def event_windows(series, frames, events, half_window=event_half_window):
+    """Long table of min/max of every metric around each phase event frame."""
+    rows = []
+    for event, event_frame in events.items():
+        for name, values in series.items():
+            low, high = event_window(values, frames, event_frame, half_window)
+            rows.append({"Event": event, "Frame": event_frame, "Metric": name, "Min": low, "Max": high})
+    return pd.DataFrame(rows)
+
+# Each metric group reads only the joints of the phases it depends on, so a
+# changed label only recomputes the groups that use that phase.
+def bfc_metrics(joints, frames, rows):
+    bfc_knee = np.mean(knee_angle(joints[rows["bfc"]]))
+    print(f"📍 BFC — Back Knee Angle Avg: {bfc_knee:.2f}°")
+    return {"Frame_BFC": int(frames[rows["bfc"][0]]), "Back_Knee_Angle_BFC": bfc_knee}
+
+def ffc_metrics(joints, frames, rows):
+    ffc = joints[rows["ffc"][0]]
+    stride_m, stride_in = scale_distance(stride_length(ffc), estimate_model_height(ffc), actual_height)
+    alignment = classify_alignment(ffc)
+    print(f"📍 FFC — Stride Length: {stride_m:.2f} m / {stride_in:.2f} in")
+    print(f"📍 FFC — Alignment: {alignment}")
+    return {
+        "Frame_FFC": int(frames[rows["ffc"][0]]),
+        "Stride_Length_m": stride_m,
+        "Stride_Length_in": stride_in,
+        "Alignment": alignment,
+    }
+
+def arm_trunk_metrics(joints, frames, rows):
+    combined = joints[np.concatenate([rows["ffc"], rows["release"]])]
+    elbow_max = np.max(elbow_extension(combined))
+    hs_avg = np.mean(hip_shoulder_separation(combined))
+    print(f"📍 Max Elbow Angle: {elbow_max:.2f}° (Chucking check)")
+    print(f"📍 Hip-Shoulder Separation Avg: {hs_avg:.2f}°")
+    return {"Max_Elbow_Angle": elbow_max, "Hip_Shoulder_Separation": hs_avg}
+
+def release_metrics(joints, frames, rows):
+    release = joints[rows["release"][0]]
+    model_height = estimate_model_height(joints[rows["ffc"][0]])
+    front_knee_angle = knee_angle(release)
+    reach_m, reach_in = scale_distance(delivery_reach(release), model_height, actual_height)
+    flexion = lateral_flexion(release)
+    print(f"📍 Release — Front Knee Angle: {front_knee_angle:.2f}°")
+    print(f"📍 Release — Delivery Reach: {reach_m:.2f} m / {reach_in:.2f} in")
+    print(f"📍 Release — Lateral Flexion: {flexion:.2f}°")
+    return {
+        "Frame_Release": int(frames[rows["release"][0]]),
+        "Front_Knee_Angle_Release": front_knee_angle,
+        "Delivery_Reach_m": reach_m,
+        "Delivery_Reach_in": reach_in,
+        "Lateral_Flexion": flexion,
+    }
+
+METRIC_GROUPS = [
+    (("bfc",), bfc_metrics),
+    (("ffc",), ffc_metrics),
+    (("ffc", "release"), arm_trunk_metrics),
+    (("ffc", "release"), release_metrics),
+]
+RESULT_COLUMNS = [
+    "Frame_BFC", "Back_Knee_Angle_BFC", "Frame_FFC", "Stride_Length_m", "Stride_Length_in",
+    "Alignment", "Max_Elbow_Angle", "Hip_Shoulder_Separation", "Frame_Release",
+    "Front_Knee_Angle_Release", "Delivery_Reach_m", "Delivery_Reach_in", "Lateral_Flexion",
+]
+
+@telemetry.timed("analysis")
+def analyze(store_dir="phases/hardik", output_dir="final_output", force=False):
+    print("\n===== BIOMECHANICAL ANALYSIS (Joint Store) =====\n")
+
+    results_path = os.path.join(output_dir, "biomech_results.csv")
+    manifest = Manifest(os.path.join(output_dir, "biomech_results.manifest.json"))
+    inputs_fp = {
+        "joints": file_hash(os.path.join(store_dir, "joints.npy")),
+        "code": code_version(sys.modules[__name__], metrics, joint_store),
+        "config": {"actual_height": actual_height, "event_half_window": event_half_window},
+    }
+
+    span = telemetry.current()
+    mark = span.clock()
+    joints, frames, labels = load_delivery(store_dir)
+    mark = span.lap("load", mark, len(frames))
+    span.add(len(frames))
+    rows = {e: np.flatnonzero(labels == e) for e in EVENTS}
+    phase_frames = {e: frames[r].tolist() for e, r in rows.items()}
+
+    # --- Decide what to (re)compute from the previous run's fingerprints
+    previous = None
+    if not force and os.path.exists(results_path) and not manifest.changed("inputs", inputs_fp):
+        previous = pd.read_csv(results_path).iloc[0].to_dict()
+    old_frames = manifest.get("phases", {}) if previous else {}
+    changed = {e for e in EVENTS if old_frames.get(e) != phase_frames[e]}
+    if previous is not None and not changed:
+        print(f"⏭️ Inputs unchanged since last run — keeping {results_path}")
+        return pd.DataFrame([previous])[RESULT_COLUMNS]
+
+    results = dict(previous or {})
+    for phases, group in METRIC_GROUPS:
+        if previous is None or changed.intersection(phases):
+            results.update(group(joints, frames, rows))
+    mark = span.lap("metrics", mark, len(frames))
+    if previous is not None:
+        print(f"🔁 Recomputed metrics depending on: {', '.join(sorted(changed))}")
+
+    # === Save to CSV with frame numbers ===
+    df_out = pd.DataFrame([results])[RESULT_COLUMNS]
+    os.makedirs(output_dir, exist_ok=True)
+    df_out.to_csv(results_path, index=False)
+    print("\n✅ Saved biomechanical results with frame numbers to 'biomech_results.csv'")
+
+    # === Full-delivery curves and peaks around each event ===
+    mark = span.clock()
+    series = metric_series(joints)
+    curves = pd.DataFrame({"frame": frames, "label": labels, **series})
+    curves.to_csv(os.path.join(output_dir, "biomech_curves.csv"), index=False)
+    events = {e: int(results[col]) for e, col in EVENT_FRAME_COLUMNS.items()}
+    windows = event_windows(series, frames, events)
+    windows.to_csv(os.path.join(output_dir, "biomech_event_windows.csv"), index=False)
+    span.lap("curves", mark, len(frames))
+    print("✅ Saved per-frame curves and event windows to 'biomech_curves.csv' / 'biomech_event_windows.csv'")
+
+    manifest.save(inputs=inputs_fp, phases=phase_frames)
+    return df_out
+
+
+if __name__ == "__main__":
+    analyze()
@@ -0,0 +1,187 @@
+import csv
+import os
+import sys
+
+import click
+import numpy as np
+import pandas as pd
+
+from . import keypoints
+from . import kinematics
+from . import telemetry
+from .fingerprint import Manifest, code_version, file_hash
+
+# === CONFIG ===
+pt_path = "results/hardik.pt"          # CoMotion output
+output_csv = "segments/hardik.csv"     # Same schema as segment.py (frame,label)
+bowling_arm = "right"                  # Back foot is on the bowling-arm side
+smooth_window = 5                      # Frames for the moving average on heights
+settle_speed = 0.001                   # Max downward foot speed (m/frame) that counts as planted
+max_stride_frames = 90                 # Search window before release / front-foot lift
+
+# SMPL joint indices
+L_ANKLE, R_ANKLE, L_FOOT, R_FOOT = 7, 8, 10, 11
+L_SHOULDER, R_SHOULDER, L_WRIST, R_WRIST = 16, 17, 20, 21
+
+
+# === Kinematic signals ===
+def fit_ground_plane(joints, iterations=3, keep=70):
+    """Fit y = a*x + b*z + c to the lowest foot joint of every frame.
+
+    The camera is rarely level, so the ground is a tilted plane in camera
+    coordinates. Frames where both feet are off the floor are rejected by
+    refitting on the `keep` percent of points closest to the plane.
+    """
+    feet = joints[:, [L_ANKLE, R_ANKLE, L_FOOT, R_FOOT]]
+    lowest = feet[np.arange(len(joints)), feet[:, :, 1].argmax(axis=1)]  # y points down
+    A = np.c_[lowest[:, 0], lowest[:, 2], np.ones(len(lowest))]
+    mask = np.ones(len(lowest), dtype=bool)
+    for _ in range(iterations):
+        coef = np.linalg.lstsq(A[mask], lowest[mask, 1], rcond=None)[0]
+        residual = np.abs(lowest[:, 1] - A @ coef)
+        mask = residual <= np.percentile(residual, keep)
+    return coef
+
+def height_above_ground(points, plane):
+    a, b, c = plane
+    return (a * points[..., 0] - points[..., 1] + b * points[..., 2] + c) / np.sqrt(a * a + b * b + 1)
+
+def smooth(signal, window=smooth_window):
+    pad = window // 2
+    padded = np.pad(signal, (pad, window - 1 - pad), mode="edge")
+    return np.convolve(padded, np.ones(window) / window, mode="valid")
+
+def landing_index(height, start, stop, event="landing"):
+    """(swing apex, first planted frame after it) for a foot in [start, stop).
+
+    Planted = below the midpoint between the apex and the window floor and
+    no longer moving down faster than settle_speed.
+    """
+    if stop - start < 2:
+        raise ValueError(f"Cannot detect {event}: only {max(stop - start, 0)} frame(s) to search "
+                         f"(rows {start}..{stop}); the clip must start before the stride")
+    window = height[start:stop]
+    apex = int(np.argmax(window))
+    floor = window[apex:].min()
+    velocity = np.gradient(window)
+    mid = 0.5 * (window[apex] + floor)
+    planted = np.flatnonzero((window[apex:] <= mid) & (velocity[apex:] >= -settle_speed))
+    landing = int(planted[0]) if len(planted) else int(np.argmin(window[apex:]))
+    return start + apex, start + apex + landing
+
+
+# === Event detection ===
+def detect_events(joints, frames, bowling_arm=bowling_arm, max_stride_frames=max_stride_frames):
+    """Frame numbers of BFC, FFC and release for one bowler's joints (frames, 24, 3).
+
+    release — bowling wrist highest above its shoulder
+    ffc     — front foot planted after its final swing before release
+    bfc     — back foot planted after its last swing before the front foot lifts
+    """
+    if bowling_arm == "right":
+        back, front, wrist, shoulder = (R_ANKLE, R_FOOT), (L_ANKLE, L_FOOT), R_WRIST, R_SHOULDER
+    else:
+        back, front, wrist, shoulder = (L_ANKLE, L_FOOT), (R_ANKLE, R_FOOT), L_WRIST, L_SHOULDER
+
+    plane = fit_ground_plane(joints)
+    back_h = smooth(height_above_ground(joints[:, back], plane).min(axis=1))
+    front_h = smooth(height_above_ground(joints[:, front], plane).min(axis=1))
+    arm_h = smooth(height_above_ground(joints[:, wrist], plane) - height_above_ground(joints[:, shoulder], plane))
+
+    release = int(np.argmax(arm_h))
+    front_apex, ffc = landing_index(front_h, max(0, release - max_stride_frames), release, "FFC")
+    _, bfc = landing_index(back_h, max(0, front_apex - max_stride_frames), front_apex, "BFC")
+    return {"bfc": int(frames[bfc]), "ffc": int(frames[ffc]), "release": int(frames[release])}
+
+def events_to_labels(frames, events):
+    """(frame, label) rows in the segment.py convention: jump up to BFC, followthrough after release."""
+    rows = []
+    for frame in np.sort(frames):
+        frame = int(frame)
+        if frame < events["bfc"]:
+            rows.append((frame, "jump"))
+        elif frame in (events["bfc"], events["ffc"], events["release"]):
+            rows.append((frame, next(k for k, v in events.items() if v == frame)))
+        elif frame > events["release"]:
+            rows.append((frame, "followthrough"))
+    return rows
+
+def segment(data, skeleton, bowling_arm=bowling_arm):
+    joints, frames, _ = keypoints.bowler_joints(data, skeleton, engine="fk")
+    events = detect_events(joints.astype(np.float64), frames, bowling_arm)
+    return events, events_to_labels(frames, events)
+
+def write_segments(rows, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["frame", "label"])
+        writer.writerows(rows)
+
+
+@telemetry.timed("autosegment")
+def segment_file(pt_file=pt_path, output=output_csv, arm=bowling_arm, force=False):
+    """Auto-label pt_file into output unless its inputs are unchanged since the last run.
+
+    Skipping also protects manual corrections made to the CSV with segment.py.
+    """
+    import torch
+
+    manifest = Manifest(f"{output}.manifest.json")
+    inputs_fp = {
+        "pt": file_hash(pt_file),
+        "arm": arm,
+        "config": [smooth_window, settle_speed, max_stride_frames],
+        "code": code_version(sys.modules[__name__], kinematics, keypoints),
+    }
+    if os.path.exists(output) and not force and not manifest.changed("inputs", inputs_fp):
+        print(f"⏭️ Inputs unchanged since last run — keeping {output}")
+        return None
+
+    data = torch.load(pt_file, map_location="cpu")
+    events, rows = segment(data, kinematics.load_skeleton(), arm)
+    telemetry.current().add(len(data["frame_idx"]))
+    write_segments(rows, output)
+    manifest.save(inputs=inputs_fp)
+    return events
+
+
+# === Benchmark against hand labels ===
+def reference_events(label_csv):
+    df = pd.read_csv(label_csv)
+    return {e: int(df.loc[df["label"] == e, "frame"].iloc[0]) for e in ("bfc", "ffc", "release")}
+
+def benchmark(events, label_csv):
+    """Signed detection error in frames (auto - manual) per event."""
+    reference = reference_events(label_csv)
+    return {e: events[e] - reference[e] for e in reference}
+
+
+@click.command()
+@click.option("--pt", "pt_file", default=pt_path, help="CoMotion .pt output.")
+@click.option("--output", default=output_csv, help="Segment CSV to write.")
+@click.option("--arm", default=bowling_arm, type=click.Choice(["right", "left"]), help="Bowling arm.")
+@click.option("--benchmark", "reference_csv", default=None,
+              help="Hand-labelled CSV to score against instead of writing output.")
+@click.option("--force", is_flag=True, help="Re-detect even if inputs are unchanged.")
+def main(pt_file, output, arm, reference_csv, force):
+    import torch
+
+    if reference_csv:
+        data = torch.load(pt_file, map_location="cpu")
+        events, _ = segment(data, kinematics.load_skeleton(), arm)
+        print(f"📍 Detected — BFC: {events['bfc']}, FFC: {events['ffc']}, Release: {events['release']}")
+        errors = benchmark(events, reference_csv)
+        for event, err in errors.items():
+            print(f"📏 {event}: {err:+d} frames")
+        print(f"📏 Mean absolute error: {np.mean(np.abs(list(errors.values()))):.1f} frames")
+        return
+
+    events = segment_file(pt_file, output, arm, force)
+    if events:
+        print(f"📍 Detected — BFC: {events['bfc']}, FFC: {events['ffc']}, Release: {events['release']}")
+        print(f"📁 Labels saved to: {output} (review with segment.py)")
+
+
+if __name__ == "__main__":
+    main()
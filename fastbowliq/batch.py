@@ -0,0 +1,278 @@
+import concurrent.futures as cf
+import csv
+import json
+import logging
+import multiprocessing
+import time
+import traceback
+from collections import deque
+from pathlib import Path
+
+import click
+
+from . import telemetry
+
+# === Multi-delivery batch runner ===
+# Each delivery runs through the stages below as a small dependency graph.
+# "device" stages share one loaded model on a single thread behind a bounded
+# queue, "cpu" stages fan out over a process pool and "io" stages (network)
+# run on a thread pool.
+
+VIDEO_SUFFIXES = {".mp4", ".mov", ".avi", ".mkv"}
+
+STAGES = {
+    "track":     {"deps": (), "pool": "device"},
+    "segment":   {"deps": ("track",), "pool": "cpu"},
+    "keypoints": {"deps": ("segment",), "pool": "cpu"},
+    "analysis":  {"deps": ("keypoints",), "pool": "cpu"},
+    "render":    {"deps": ("track",), "pool": "device"},
+    "overlay":   {"deps": ("analysis", "render"), "pool": "cpu"},
+    "feedback":  {"deps": ("analysis",), "pool": "io"},
+}
+DEFAULT_STAGES = ("track", "segment", "keypoints", "analysis", "render", "overlay")
+
+
+# === Deliveries ===
+def delivery_paths(out_root, name):
+    root = Path(out_root) / name
+    return {
+        "root": str(root),
+        "pt": str(root / "results.pt"),
+        "segments": str(root / "segments.csv"),
+        "store": str(root / "phases"),
+        "results": str(root / "biomech_results.csv"),
+        "rendered": str(root / "rendered"),
+        "overlay": str(root / "overlayed.mp4"),
+        "feedback": str(root / "biomech_feedback.md"),
+    }
+
+
+def load_deliveries(source, out_root, arm="right"):
+    """Deliveries from a directory of videos or a manifest CSV (name,video[,arm])."""
+    source = Path(source)
+    if source.is_dir():
+        rows = [{"name": p.stem, "video": str(p), "arm": arm}
+                for p in sorted(source.iterdir()) if p.suffix.lower() in VIDEO_SUFFIXES]
+    else:
+        with open(source, newline="") as f:
+            rows = [{"name": r["name"], "video": r["video"], "arm": r.get("arm") or arm} for r in csv.DictReader(f)]
+    for row in rows:
+        row["paths"] = delivery_paths(out_root, row["name"])
+        Path(row["paths"]["root"]).mkdir(parents=True, exist_ok=True)
+    return rows
+
+
+# === Stage bodies (imports are local so worker processes only load what they run) ===
+_device_model = None
+
+
+def _tracking_model():
+    global _device_model
+    if _device_model is None:
+        from . import tracking
+
+        _device_model = tracking.load_model()
+    return _device_model
+
+
+def run_stage(stage, delivery):
+    """Run one stage for one delivery; returns busy seconds."""
+    t0 = time.perf_counter()
+    with telemetry.stage(f"batch.{stage}", delivery=delivery["name"]):
+        _run_stage(stage, delivery)
+    return time.perf_counter() - t0
+
+
+def _run_stage(stage, delivery):
+    paths = delivery["paths"]
+
+    if stage == "track":
+        from . import tracking
+
+        tracking.track_poses(delivery["video"], paths["pt"], model=_tracking_model())
+
+    elif stage == "segment":
+        from . import autosegment
+
+        autosegment.segment_file(paths["pt"], paths["segments"], delivery["arm"])
+
+    elif stage == "keypoints":
+        from . import keypoints
+
+        keypoints.extract_keypoints(paths["pt"], paths["segments"], paths["store"])
+
+    elif stage == "analysis":
+        from . import analysis
+
+        analysis.analyze(paths["store"], paths["root"])
+
+    elif stage == "render":
+        from . import visualize
+
+        if visualize.render(paths["pt"], paths["rendered"]) is None:
+            raise RuntimeError("Rendering failed (is aitviewer installed?)")
+
+    elif stage == "overlay":
+        from . import overlay
+
+        overlay.render_overlay(paths["rendered"] + ".mp4", paths["overlay"], paths["results"])
+
+    elif stage == "feedback":
+        from . import feedback
+
+        feedback.generate_feedback(paths["results"], paths["feedback"])
+
+    else:
+        raise ValueError(f"Unknown stage '{stage}'")
+
+
+# === Scheduler ===
+class BatchRunner:
+    """Runs the stage graph for every delivery, as soon as each stage's inputs exist."""
+
+    def __init__(self, deliveries, stages=DEFAULT_STAGES, workers=4, device_queue_depth=2):
+        unknown = [s for s in stages if s not in STAGES]
+        if unknown:
+            raise ValueError(f"Unknown stage(s) {', '.join(unknown)} (choose from {', '.join(STAGES)})")
+        self.deliveries = {d["name"]: d for d in deliveries}
+        self.stages = [s for s in STAGES if s in stages]
+        self.device_queue_depth = device_queue_depth
+        self.cpu_pool = cf.ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        self.io_pool = cf.ThreadPoolExecutor(max_workers=workers)
+        self.device_pool = cf.ThreadPoolExecutor(max_workers=1)
+        self.device_backlog = deque()
+        self.device_inflight = 0
+        self.status = {(n, s): "pending" for n in self.deliveries for s in self.stages}
+        self.seconds = {}
+        self.errors = {}
+
+    def _deps(self, stage):
+        return [d for d in STAGES[stage]["deps"] if d in self.stages]
+
+    def _ready(self):
+        for (name, stage), state in self.status.items():
+            if state != "pending":
+                continue
+            dep_states = [self.status[(name, d)] for d in self._deps(stage)]
+            if any(s in ("failed", "skipped") for s in dep_states):
+                self.status[(name, stage)] = "skipped"
+            elif all(s == "done" for s in dep_states):
+                yield name, stage
+
+    def _submit(self, name, stage, futures):
+        pool = STAGES[stage]["pool"]
+        self.status[(name, stage)] = "queued"
+        if pool == "device":
+            self.device_backlog.append((name, stage))
+            return
+        executor = self.cpu_pool if pool == "cpu" else self.io_pool
+        futures[executor.submit(run_stage, stage, self.deliveries[name])] = (name, stage)
+
+    def _drain_device_backlog(self, futures):
+        # Bounded device queue: only device_queue_depth jobs are handed to the model thread
+        while self.device_backlog and self.device_inflight < self.device_queue_depth:
+            name, stage = self.device_backlog.popleft()
+            self.device_inflight += 1
+            futures[self.device_pool.submit(run_stage, stage, self.deliveries[name])] = (name, stage)
+
+    def run(self):
+        wall_start = time.perf_counter()
+        futures = {}
+        try:
+            while True:
+                for name, stage in list(self._ready()):
+                    self._submit(name, stage, futures)
+                self._drain_device_backlog(futures)
+                if not futures:
+                    break
+
+                done, _ = cf.wait(futures, return_when=cf.FIRST_COMPLETED)
+                for future in done:
+                    name, stage = futures.pop(future)
+                    if STAGES[stage]["pool"] == "device":
+                        self.device_inflight -= 1
+                    try:
+                        self.seconds[(name, stage)] = future.result()
+                        self.status[(name, stage)] = "done"
+                        logging.info(f"{name}: {stage} done in {self.seconds[(name, stage)]:.1f}s")
+                    except Exception:
+                        self.status[(name, stage)] = "failed"
+                        self.errors[(name, stage)] = traceback.format_exc()
+                        logging.error(f"{name}: {stage} failed\n{self.errors[(name, stage)]}")
+        finally:
+            self.cpu_pool.shutdown()
+            self.io_pool.shutdown()
+            self.device_pool.shutdown()
+        return self.summary(time.perf_counter() - wall_start)
+
+    def summary(self, wall_seconds):
+        deliveries = {}
+        for name in self.deliveries:
+            deliveries[name] = {
+                stage: {
+                    "status": self.status[(name, stage)],
+                    "seconds": self.seconds.get((name, stage)),
+                    **({"error": self.errors[(name, stage)]} if (name, stage) in self.errors else {}),
+                }
+                for stage in self.stages
+            }
+
+        per_stage = {}
+        for stage in self.stages:
+            times = [t for (n, s), t in self.seconds.items() if s == stage]
+            per_stage[stage] = {
+                "done": len(times),
+                "total_seconds": sum(times),
+                "mean_seconds": sum(times) / len(times) if times else None,
+            }
+
+        completed = sum(all(self.status[(n, s)] == "done" for s in self.stages) for n in self.deliveries)
+        return {
+            "wall_seconds": wall_seconds,
+            "deliveries": len(self.deliveries),
+            "completed": completed,
+            "deliveries_per_hour": completed * 3600 / max(wall_seconds, 1e-9),
+            "stages": per_stage,
+            "per_delivery": deliveries,
+        }
+
+
+@click.command()
+@click.argument("source", type=click.Path(exists=True))
+@click.option("--out", "out_root", default="batch_output", help="Root folder for per-delivery outputs.")
+@click.option("--workers", default=4, type=int, help="Processes for CPU-bound stages.")
+@click.option("--device-queue", default=2, type=int, help="Max jobs queued on the inference device.")
+@click.option("--arm", default="right", type=click.Choice(["right", "left"]), help="Default bowling arm.")
+@click.option("--stages", default=",".join(DEFAULT_STAGES), help="Comma-separated stages to run.")
+@click.option("--feedback", is_flag=True, help="Also generate Gemini feedback per delivery.")
+def batch(source, out_root, workers, device_queue, arm, stages, feedback):
+    """Run the pipeline for every video in SOURCE (a folder or a name,video[,arm] manifest CSV)."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(funcName)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    stages = [s.strip() for s in stages.split(",") if s.strip()]
+    for stage in stages:
+        if stage not in STAGES:
+            raise click.BadParameter(f"unknown stage '{stage}' (choose from {', '.join(STAGES)})",
+                                     param_hint="--stages")
+    if feedback and "feedback" not in stages:
+        stages.append("feedback")
+
+    deliveries = load_deliveries(source, out_root, arm)
+    if not deliveries:
+        raise click.BadParameter(f"no videos found in {source}", param_hint="SOURCE")
+    logging.info(f"Running {len(deliveries)} deliveries through: {', '.join(stages)}")
+
+    summary = BatchRunner(deliveries, stages, workers, device_queue).run()
+    summary_path = Path(out_root) / "run_summary.json"
+    with open(summary_path, "w") as f:
+        json.dump(summary, f, indent=2)
+
+    print(f"✅ {summary['completed']}/{summary['deliveries']} deliveries completed "
+          f"in {summary['wall_seconds']:.1f}s — summary: {summary_path}")
+
+
+if __name__ == "__main__":
+    batch()
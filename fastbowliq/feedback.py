@@ -0,0 +1,278 @@
+import asyncio
+import concurrent.futures as cf
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+
+import click
+import pandas as pd
+
+from . import telemetry
+from .fingerprint import Manifest, code_version, file_hash, value_hash
+
+# === CONFIG ===
+CSV_PATH = "final_output/biomech_results.csv"
+MARKDOWN_PATH = "final_output/biomech_feedback.md"
+API_KEY = "****your api key****"  # <-- Replace with your actual Gemini API key
+MODEL_NAME = "models/gemini-1.5-flash-latest"
+engine = "gemini"  # "gemini", or "rules" for the offline report in report.py (no API key or network)
+# Gemini REST endpoint; point FASTBOWLIQ_FEEDBACK_URL at a local stub to test without the API
+API_BASE_URL = os.environ.get("FASTBOWLIQ_FEEDBACK_URL", "https://generativelanguage.googleapis.com/v1beta")
+
+# === Request scheduling ===
+# Rows are sent concurrently from one event loop; each blocking HTTP call runs
+# in a worker thread. The rate limit is shared by every call in the process,
+# so batch workers generating feedback side by side stay under it together.
+max_concurrency = 8        # Requests in flight per generate_many() call
+requests_per_minute = 60   # Process-wide cap on request starts (None = unlimited)
+max_retries = 5            # Retries on 429 / 5xx / network errors before giving up
+backoff_seconds = 2.0      # First retry delay; doubles per attempt, with jitter
+request_timeout = 120      # Seconds per HTTP request
+cache_dir = "results/feedback_cache"  # Responses keyed on a hash of model + rendered prompt
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+PROMPT_COLUMNS = [
+    "Back_Knee_Angle_BFC", "Stride_Length_m", "Stride_Length_in", "Alignment", "Max_Elbow_Angle",
+    "Hip_Shoulder_Separation", "Front_Knee_Angle_Release", "Delivery_Reach_m", "Lateral_Flexion",
+]
+
+
+def build_prompt(row):
+    return f"""
+You are a professional cricket biomechanics analyst.
+
+A bowler's performance has been measured and the following biomechanical metrics were recorded:
+
+- Back Knee Flexion at BFC: {row['Back_Knee_Angle_BFC']:.1f}°
+- Stride Length: {row['Stride_Length_m']:.2f} m ({row['Stride_Length_in']:.1f} in)
+- Alignment: {row['Alignment']}
+- Elbow Angle at Release: {row['Max_Elbow_Angle']:.1f}°
+- Hip-Shoulder Separation: {row['Hip_Shoulder_Separation']:.1f}°
+- Front Knee Angle at Release: {row['Front_Knee_Angle_Release']:.1f}°
+- Delivery Reach: {row['Delivery_Reach_m']:.3f} m
+- Lateral Flexion: {row['Lateral_Flexion']:.1f}°
+
+Provide detailed analysis with:
+1. Feedback on each metric (what's good, what needs improvement).
+2. Injury risk level for each aspect (Low/Medium/High) and why.
+3. Overall injury risk comment.
+4. Overall biomechanics efficiency score out of 10, with justification.
+
+Format it clearly using Markdown with tables and headings.
+
+Do **not** include any bowler name, date, or assumptions about location, match, or context.
+"""
+
+
+# === Rate limiting ===
+class RateLimiter:
+    """Spaces request starts at least 60 / per_minute seconds apart, across threads and event loops."""
+
+    def __init__(self, per_minute):
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def delay(self):
+        """Reserve the next start slot; returns the seconds to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+            return start - now
+
+
+limiter = RateLimiter(requests_per_minute)
+
+
+# === Response cache ===
+def prompt_key(prompt, model=MODEL_NAME):
+    return value_hash({"model": model, "prompt": prompt})
+
+
+def cached(key):
+    path = os.path.join(cache_dir, f"{key}.md")
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    return None
+
+
+def store(key, text):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"{key}.md")
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+# === Gemini REST client ===
+def post_generate(prompt, api_key, model=MODEL_NAME, base_url=None):
+    """One blocking generateContent call; returns the response text."""
+    url = f"{(base_url or API_BASE_URL).rstrip('/')}/{model}:generateContent"
+    body = json.dumps({"contents": [{"parts": [{"text": prompt}]}]}).encode()
+    request = urllib.request.Request(
+        url, data=body, method="POST",
+        headers={"Content-Type": "application/json", "x-goog-api-key": api_key},
+    )
+    with urllib.request.urlopen(request, timeout=request_timeout) as response:
+        reply = json.load(response)
+    candidates = reply.get("candidates") or []
+    if not candidates:
+        raise RuntimeError(f"No candidates in response: {reply.get('promptFeedback', reply)}")
+    return "".join(part.get("text", "") for part in candidates[0]["content"]["parts"])
+
+
+def retry_delay(attempt, error):
+    """Seconds to wait before retry `attempt`: the server's Retry-After if given, else jittered backoff."""
+    retry_after = getattr(error, "headers", None) and error.headers.get("Retry-After")
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return backoff_seconds * 2 ** attempt * random.uniform(0.5, 1.5)
+
+
+async def request_feedback(prompt, api_key=API_KEY, model=MODEL_NAME, base_url=None, semaphore=None,
+                           executor=None, read_cache=True, stats=None):
+    """Feedback text for one prompt, from the cache or the API (with rate limit and retries).
+
+    Fresh responses are always cached; read_cache=False only skips the lookup.
+    `stats` (a Counter) tallies cache_hits, requests and retries.
+    """
+    stats = Counter() if stats is None else stats
+    key = prompt_key(prompt, model)
+    if read_cache:
+        text = cached(key)
+        if text is not None:
+            stats["cache_hits"] += 1
+            return text
+
+    semaphore = semaphore or asyncio.Semaphore(max_concurrency)
+    for attempt in range(max_retries + 1):
+        try:
+            async with semaphore:
+                await asyncio.sleep(limiter.delay())
+                text = await asyncio.get_running_loop().run_in_executor(
+                    executor, post_generate, prompt, api_key, model, base_url)
+            break
+        except urllib.error.HTTPError as e:
+            if e.code not in RETRY_STATUS or attempt == max_retries:
+                raise RuntimeError(f"Gemini request failed with HTTP {e.code}: {e.read()[:500]!r}") from e
+            error = e
+        except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+            if attempt == max_retries:
+                raise RuntimeError(f"Gemini request failed after {max_retries} retries: {e}") from e
+            error = e
+        stats["retries"] += 1
+        await asyncio.sleep(retry_delay(attempt, error))
+
+    stats["requests"] += 1
+    store(key, text)
+    return text
+
+
+async def generate_many(prompts, api_key=API_KEY, model=MODEL_NAME, base_url=None, concurrency=None,
+                        read_cache=True, stats=None):
+    """Feedback texts for many prompts, in order; identical prompts are requested once."""
+    concurrency = concurrency or max_concurrency
+    semaphore = asyncio.Semaphore(concurrency)
+    unique = list(dict.fromkeys(prompts))
+    # Own pool: the loop's default executor may have fewer threads than requests in flight
+    with cf.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        texts = await asyncio.gather(*[
+            request_feedback(p, api_key, model, base_url, semaphore, executor, read_cache, stats) for p in unique
+        ])
+    by_prompt = dict(zip(unique, texts))
+    return [by_prompt[p] for p in prompts]
+
+
+def feedback_rows(df):
+    """(label, row) for every row with all prompt metrics present."""
+    rows = []
+    for i, row in df.iterrows():
+        if row[PROMPT_COLUMNS].isna().any():
+            print(f"⚠️ Skipping row {i}: missing metrics")
+            continue
+        label = row["Delivery"] if "Delivery" in row and pd.notna(row["Delivery"]) else f"Delivery {len(rows) + 1}"
+        rows.append((label, row))
+    return rows
+
+
+def format_report(sections):
+    """Markdown for [(label, text)]: one delivery as before, several as one section each."""
+    report = "# 🏏 Bowler Biomechanics Analysis\n\n"
+    if len(sections) == 1:
+        return report + sections[0][1]
+    return report + "\n\n".join(f"## {label}\n\n{text}" for label, text in sections)
+
+
+@telemetry.timed("feedback")
+def generate_feedback(csv_path=CSV_PATH, markdown_path=MARKDOWN_PATH, api_key=API_KEY, force=False,
+                      concurrency=None, base_url=None, engine=engine):
+    """Feedback for every metric row of csv_path, written to one Markdown report."""
+    if engine == "rules":
+        from . import report
+
+        return report.generate_report(csv_path, markdown_path, force)[0]
+
+    manifest = Manifest(f"{markdown_path}.manifest.json")
+    inputs_fp = {"results": file_hash(csv_path), "model": MODEL_NAME, "code": code_version(sys.modules[__name__])}
+    if os.path.exists(markdown_path) and not force and not manifest.changed("inputs", inputs_fp):
+        print(f"⏭️ Metrics unchanged since last run — keeping {markdown_path}")
+        with open(markdown_path, encoding="utf-8") as f:
+            return f.read()
+
+    # === Load biomechanical data ===
+    rows = feedback_rows(pd.read_csv(csv_path))
+    if not rows:
+        raise ValueError(f"No complete metric rows in {csv_path}")
+
+    # === Generate feedback ===
+    span, stats = telemetry.current(), Counter()
+    mark = span.clock()
+    texts = asyncio.run(generate_many(
+        [build_prompt(row) for _, row in rows], api_key, base_url=base_url, concurrency=concurrency,
+        read_cache=not force, stats=stats,
+    ))
+    span.lap("request", mark, frames=len(rows))
+    span.set(rows=len(rows), **stats)
+    print(f"📍 {len(rows)} rows: {stats['requests']} requests, {stats['cache_hits']} cached, "
+          f"{stats['retries']} retries")
+    report = format_report([(label, text) for (label, _), text in zip(rows, texts)])
+
+    # === Output to terminal ===
+    print("\n🎯 Biomechanical Feedback:\n")
+    print(report)
+
+    # === Save as Markdown ===
+    with open(markdown_path, "w", encoding="utf-8") as f:
+        f.write(report)
+
+    manifest.save(inputs=inputs_fp)
+    print(f"\n✅ Feedback saved to Markdown file: {markdown_path}")
+    return report
+
+
+@click.command()
+@click.option("--csv", "csv_path", default=CSV_PATH, type=click.Path(exists=True),
+              help="Metrics CSV: one delivery, or a session table with one row per delivery.")
+@click.option("--out", "markdown_path", default=MARKDOWN_PATH, help="Markdown report to write.")
+@click.option("--concurrency", default=max_concurrency, type=int, help="Requests in flight at once.")
+@click.option("--base-url", default=None, help="Override the Gemini endpoint (e.g. a local stub server).")
+@click.option("--engine", "engine_name", default=engine, type=click.Choice(["gemini", "rules"]),
+              help="Gemini, or the offline rule-based report.")
+@click.option("--force", is_flag=True, help="Ignore the manifest and the response cache.")
+def feedback(csv_path, markdown_path, concurrency, base_url, engine_name, force):
+    """Generate feedback for every delivery in a metrics CSV."""
+    generate_feedback(csv_path, markdown_path, force=force, concurrency=concurrency, base_url=base_url,
+                      engine=engine_name)
+
+
+if __name__ == "__main__":
+    feedback()
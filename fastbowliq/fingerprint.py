@@ -0,0 +1,62 @@
+import hashlib
+import json
+import os
+
+# === Stage fingerprints ===
+# Every stage writes a small JSON manifest next to its output recording what
+# produced it: content hashes of its inputs, the config values it used and a
+# hash of its own source code. On the next run the stage compares the
+# manifest part by part and skips, or redoes only the affected work.
+
+
+def file_hash(path, block_size=1 << 20):
+    """SHA-256 of a file, or of every file (sorted by name) inside a directory."""
+    digest = hashlib.sha256()
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if name.endswith(".manifest.json") or name == "manifest.json":
+                continue
+            digest.update(name.encode())
+            digest.update(file_hash(os.path.join(path, name)).encode())
+        return digest.hexdigest()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def code_version(*modules):
+    """Hash of the source of the given modules (the code half of a fingerprint)."""
+    digest = hashlib.sha256()
+    for module in modules:
+        digest.update(file_hash(module.__file__).encode())
+    return digest.hexdigest()
+
+
+def value_hash(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class Manifest:
+    """Named fingerprint parts for one stage output, persisted as JSON."""
+
+    def __init__(self, path):
+        self.path = path
+        self.parts = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.parts = json.load(f)
+
+    def changed(self, name, value):
+        """True if `value` differs from what the last run recorded under `name`."""
+        return self.parts.get(name) != value
+
+    def get(self, name, default=None):
+        return self.parts.get(name, default)
+
+    def save(self, **parts):
+        self.parts = parts
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(parts, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
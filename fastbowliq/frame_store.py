@@ -0,0 +1,169 @@
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .fingerprint import file_hash, value_hash
+
+# === Decode-once frame store ===
+# results/frames/<key>/
+#   frames.npy  every frame, downscaled to long_side, as one (N, H, W, 3) uint8 array
+#   meta.json   frame count, fps and sizes, written once the video is fully decoded
+# A video is decoded once, sequentially, in a background thread; frames are
+# served from the memory-mapped array as soon as the decoder has passed them,
+# so frame N is a constant-time lookup. The key covers the video content and
+# long_side, so the labeler and preview renders share one cache.
+
+cache_root = "results/frames"
+preview_long_side = 960  # Long side of cached frames (None = native resolution)
+lru_frames = 128         # Decoded frames kept in memory per store
+
+
+class FrameStore:
+    """Random access to the frames of one video through a decode-once cache."""
+
+    def __init__(self, video_path, long_side=preview_long_side, cache_root=cache_root, lru_frames=lru_frames):
+        self.video_path = str(video_path)
+        self.long_side = long_side
+        key = value_hash({"video": file_hash(self.video_path), "long_side": long_side})[:32]
+        self.directory = os.path.join(cache_root, key)
+        self.lru = OrderedDict()
+        self.lru_frames = lru_frames
+        self._cond = threading.Condition()
+        self._error = None
+
+        if os.path.exists(os.path.join(self.directory, "meta.json")):
+            with open(os.path.join(self.directory, "meta.json")) as f:
+                self._set_meta(json.load(f))
+            self.array = np.load(os.path.join(self.directory, "frames.npy"), mmap_mode="r")
+            self.decoded = self.count
+            self._thread = None
+        else:
+            self._start_build()
+
+    def _set_meta(self, meta):
+        self.meta = meta
+        self.count, self.fps = meta["count"], meta["fps"]
+        self.size, self.source_size = tuple(meta["size"]), tuple(meta["source_size"])
+
+    def _start_build(self):
+        import cv2
+
+        cap = cv2.VideoCapture(self.video_path)
+        if not cap.isOpened():
+            raise FileNotFoundError(f"Cannot open {self.video_path}")
+        source_size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        scale = min(1.0, self.long_side / max(source_size)) if self.long_side else 1.0
+        size = (round(source_size[0] * scale), round(source_size[1] * scale))
+        count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        if count <= 0:  # container without a frame count: count by demuxing once
+            count = 0
+            while cap.grab():
+                count += 1
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        self._set_meta({
+            "count": count, "fps": cap.get(cv2.CAP_PROP_FPS),
+            "size": size, "source_size": source_size, "long_side": self.long_side,
+        })
+
+        # Built under a private name and renamed into place once complete
+        self._partial = f"{self.directory}.{os.getpid()}.partial"
+        os.makedirs(self._partial, exist_ok=True)
+        self.array = np.lib.format.open_memmap(
+            os.path.join(self._partial, "frames.npy"), mode="w+", dtype=np.uint8,
+            shape=(self.count, size[1], size[0], 3),
+        )
+        self.decoded = 0
+        self._thread = threading.Thread(target=self._build, args=(cap,), daemon=True)
+        self._thread.start()
+
+    def _build(self, cap):
+        import cv2
+
+        try:
+            for n in range(self.count):
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if frame.shape[1::-1] != self.size:
+                    frame = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+                self.array[n] = frame
+                with self._cond:
+                    self.decoded = n + 1
+                    self._cond.notify_all()
+            cap.release()
+
+            # The header frame count can overshoot; keep only what was decoded
+            with self._cond:
+                self.count = self.meta["count"] = self.decoded
+            self.array.flush()
+            if self.decoded < self.array.shape[0]:
+                np.save(os.path.join(self._partial, "frames_trimmed.npy"), self.array[:self.decoded])
+                os.replace(os.path.join(self._partial, "frames_trimmed.npy"), os.path.join(self._partial, "frames.npy"))
+            with open(os.path.join(self._partial, "meta.json"), "w") as f:
+                json.dump(self.meta, f)
+            if os.path.exists(self.directory):  # another process finished first
+                shutil.rmtree(self._partial, ignore_errors=True)
+            else:
+                os.replace(self._partial, self.directory)
+        except Exception as e:
+            self._error = e
+        finally:
+            with self._cond:
+                self._thread = None
+                self._cond.notify_all()
+
+    @property
+    def ready(self):
+        """True once the whole video is decoded into the cache."""
+        return self._thread is None and self._error is None
+
+    def wait(self):
+        """Block until the cache is complete."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._thread is None)
+        if self._error:
+            raise self._error
+        return self
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, n):
+        """Frame n (BGR, uint8, read-only); waits only if the decoder has not reached it yet."""
+        if n < 0:
+            n += len(self)
+        if n in self.lru:
+            self.lru.move_to_end(n)
+            return self.lru[n]
+        with self._cond:
+            self._cond.wait_for(lambda: self.decoded > n or self._thread is None)
+        if self._error:
+            raise self._error
+        if not 0 <= n < self.decoded:
+            raise IndexError(f"frame {n} out of range (video has {self.decoded} frames)")
+
+        frame = np.array(self.array[n])
+        frame.flags.writeable = False  # shared through the LRU
+        self.lru[n] = frame
+        if len(self.lru) > self.lru_frames:
+            self.lru.popitem(last=False)
+        return frame
+
+    def frames(self, start=0, stop=None):
+        """Read-only views of frames start..stop-1 in order (bypasses the LRU)."""
+        n = start
+        while stop is None or n < stop:
+            with self._cond:
+                self._cond.wait_for(lambda: self.decoded > n or self._thread is None)
+            if self._error:
+                raise self._error
+            if n >= self.decoded:
+                return
+            frame = self.array[n]
+            frame.flags.writeable = False  # the cache array itself is writable while it is built
+            yield frame
+            n += 1
@@ -0,0 +1,104 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# === Columnar joint store ===
+# One directory per delivery:
+#   joints.npy  float32 (frames, 24, 3), memory-mappable
+#   index.csv   frame,label — one row per joints row, sorted by frame
+# Frames without a phase label carry an empty label.
+
+PHASES = ["jump", "bfc", "ffc", "release", "followthrough"]
+JOINT_COLUMNS = [f"joint{j}_{axis}" for j in range(24) for axis in "xyz"]
+
+
+class JointStore:
+    """Joints of one delivery plus the frame index and phase label of every row."""
+
+    def __init__(self, joints, frames, labels):
+        self.joints = joints
+        self.frames = np.asarray(frames, dtype=np.int64)
+        self.labels = np.asarray(labels, dtype=object)
+
+    def __len__(self):
+        return len(self.frames)
+
+    def phase_slice(self, phase):
+        """Rows of a phase: a slice when contiguous, else the row indices.
+
+        Detected phases are contiguous because rows are sorted by frame; hand
+        labels can skip frames inside a phase, which falls back to indexing.
+        """
+        rows = np.flatnonzero(self.labels == phase)
+        if len(rows) == 0:
+            return slice(0, 0)
+        if rows[-1] - rows[0] + 1 != len(rows):
+            return rows
+        return slice(int(rows[0]), int(rows[-1]) + 1)
+
+    def phase(self, phase):
+        """(joints, frames) of one phase."""
+        sl = self.phase_slice(phase)
+        return self.joints[sl], self.frames[sl]
+
+    def frame_range(self, first, last):
+        """(joints, frames) for first <= frame <= last."""
+        lo, hi = np.searchsorted(self.frames, [first, last + 1])
+        return self.joints[lo:hi], self.frames[lo:hi]
+
+
+def save_store(store_dir, joints, frames, labels):
+    os.makedirs(store_dir, exist_ok=True)
+    frames = np.asarray(frames, dtype=np.int64)
+    order = np.argsort(frames, kind="stable")
+
+    np.save(os.path.join(store_dir, "joints.npy"), np.asarray(joints, dtype=np.float32)[order])
+    index = pd.DataFrame({"frame": frames[order], "label": np.asarray(labels, dtype=object)[order]})
+    index.to_csv(os.path.join(store_dir, "index.csv"), index=False)
+    print(f"[SAVED] joint store: {len(index)} frames → {store_dir}")
+
+
+def load_store(store_dir, mmap=True):
+    joints = np.load(os.path.join(store_dir, "joints.npy"), mmap_mode="r" if mmap else None)
+    index = pd.read_csv(os.path.join(store_dir, "index.csv"), keep_default_na=False)
+    return JointStore(joints, index["frame"].to_numpy(), index["label"].to_numpy(dtype=object))
+
+
+def relabel_store(store_dir, label_map):
+    """Rewrite only the phase labels of an existing store from a frame → label map."""
+    path = os.path.join(store_dir, "index.csv")
+    index = pd.read_csv(path, keep_default_na=False)
+    index["label"] = [label_map.get(f, "") for f in index["frame"]]
+    index.to_csv(path, index=False)
+
+
+def from_phase_csvs(phase_dir):
+    """Build a JointStore from legacy phases/{jump,bfc,...}.csv wide CSVs."""
+    joints, frames, labels = [], [], []
+    for phase in PHASES:
+        path = os.path.join(phase_dir, f"{phase}.csv")
+        if not os.path.exists(path):
+            continue
+        df = pd.read_csv(path)
+        if df.empty:
+            continue
+        joints.append(df[JOINT_COLUMNS].to_numpy(dtype=np.float32).reshape(-1, 24, 3))
+        frames.append(df["frame"].to_numpy(dtype=np.int64))
+        labels.append(np.full(len(df), phase, dtype=object))
+
+    frames = np.concatenate(frames)
+    order = np.argsort(frames, kind="stable")
+    return JointStore(np.concatenate(joints)[order], frames[order], np.concatenate(labels)[order])
+
+
+def convert_phase_csvs(phase_dir, store_dir):
+    """Convert legacy per-phase CSVs into a store: python joint_store.py phases phases/hardik"""
+    store = from_phase_csvs(phase_dir)
+    save_store(store_dir, store.joints, store.frames, store.labels)
+
+
+if __name__ == "__main__":
+    import sys
+
+    convert_phase_csvs(sys.argv[1], sys.argv[2])
@@ -0,0 +1,231 @@
+from collections import deque
+
+import click
+import numpy as np
+
+from . import kinematics
+
+# === Adaptive keyframe sampling ===
+# CoMotion runs every `sparse_step` frames while the bowler runs in or follows
+# through, and on every frame once the body moves clearly faster than its
+# run-up rhythm (bound, delivery stride, release). Skipped frames are filled
+# by interpolating SMPL parameters between neighbouring keyframes.
+
+sparse_step = 4            # Inference stride outside the delivery window
+dense_speed_ratio = 1.8    # Pose speed over the run-up baseline that opens the dense window
+dense_hold_frames = 45     # Dense frames kept after the last fast keyframe
+baseline_keyframes = 8     # Sparse keyframes in the running pose-speed baseline
+
+
+class KeyframeSampler:
+    """Online decision of which frames get inference, from the tracked poses seen so far."""
+
+    def __init__(self, sparse_step=sparse_step, speed_ratio=dense_speed_ratio,
+                 hold_frames=dense_hold_frames, baseline=baseline_keyframes):
+        self.sparse_step = sparse_step
+        self.speed_ratio = speed_ratio
+        self.hold_frames = hold_frames
+        self.baseline = deque(maxlen=baseline)
+        self.last = {}           # track id -> (frame, pose) of its latest keyframe
+        self.last_frame = None
+        self.dense_until = -1
+
+    def is_dense(self, frame):
+        return frame <= self.dense_until
+
+    def wants(self, frame):
+        """Run inference on this frame?"""
+        if self.last_frame is None or self.is_dense(frame):
+            return True
+        return frame - self.last_frame >= self.sparse_step
+
+    def speed(self, frame, ids, pose):
+        """Fastest mean joint rotation (rad/frame) of any track since its previous keyframe."""
+        speeds = [
+            np.linalg.norm((p - self.last[i][1]).reshape(24, 3), axis=1).mean() / (frame - self.last[i][0])
+            for i, p in zip(ids, pose) if i in self.last and frame > self.last[i][0]
+        ]
+        return max(speeds, default=None)
+
+    def is_fast(self, speed):
+        return (speed is not None and len(self.baseline) == self.baseline.maxlen
+                and speed > self.speed_ratio * np.median(self.baseline))
+
+    def open_window(self, frame):
+        self.dense_until = max(self.dense_until, frame + self.hold_frames)
+
+    def record(self, frame, ids, pose):
+        """Add a keyframe's tracks; fast keyframes extend the dense window."""
+        speed = self.speed(frame, ids, pose)
+        if self.is_fast(speed):
+            self.open_window(frame)
+        elif speed is not None and not self.is_dense(frame):
+            self.baseline.append(speed)
+        for i, p in zip(ids, pose):
+            self.last[i] = (frame, p)
+        self.last_frame = frame
+
+
+def track_arrays(track):
+    """(ids, pose) numpy arrays for the live tracks of one tracker output."""
+    ids = track.id.detach().reshape(-1).long().cpu().numpy()
+    pose = track.pose.detach().reshape(len(ids), -1).float().cpu().numpy()
+    valid = ids >= 0
+    return ids[valid], pose[valid]
+
+
+# === Rotation-aware interpolation ===
+def axis_angle_to_quat(aa):
+    angle = np.linalg.norm(aa, axis=-1, keepdims=True)
+    axis = aa / np.maximum(angle, 1e-12)
+    return np.concatenate([np.cos(angle / 2), axis * np.sin(angle / 2)], axis=-1)
+
+def quat_to_axis_angle(q):
+    q = q * np.where(q[..., :1] < 0, -1.0, 1.0)
+    sin_half = np.linalg.norm(q[..., 1:], axis=-1, keepdims=True)
+    angle = 2 * np.arctan2(sin_half, q[..., :1])
+    return q[..., 1:] * angle / np.maximum(sin_half, 1e-12)
+
+def slerp(q0, q1, alpha):
+    """Shortest-path spherical interpolation of unit quaternions [..., 4]; alpha broadcasts."""
+    dot = (q0 * q1).sum(axis=-1, keepdims=True)
+    q1 = np.where(dot < 0, -q1, q1)
+    dot = np.abs(dot).clip(max=1.0)
+    theta = np.arccos(dot)
+    sin_theta = np.sin(theta)
+    near = sin_theta < 1e-6
+    w0 = np.where(near, 1 - alpha, np.sin((1 - alpha) * theta) / np.where(near, 1, sin_theta))
+    w1 = np.where(near, alpha, np.sin(alpha * theta) / np.where(near, 1, sin_theta))
+    q = w0 * q0 + w1 * q1
+    return q / np.linalg.norm(q, axis=-1, keepdims=True)
+
+
+def interpolate_preds(preds, keyframes):
+    """Fill skipped frames of a keyframe-tracked preds dict.
+
+    preds["frame_idx"] indexes `keyframes` (the video frame numbers that got
+    inference, in order). Returned preds carry video frame numbers in
+    frame_idx, with every frame between two consecutive keyframes of a track
+    filled: pose by per-joint slerp, trans and betas linearly. Tracks are
+    never bridged across a keyframe they were missing from, nor extrapolated.
+    """
+    import torch
+
+    keyframes = np.asarray(keyframes)
+    cols = {k: torch.as_tensor(v).numpy() for k, v in preds.items()}
+    key_idx = cols["frame_idx"].astype(np.int64)
+    frames = keyframes[key_idx]
+
+    order = np.lexsort((key_idx, cols["id"]))
+    same_track = cols["id"][order][1:] == cols["id"][order][:-1]
+    adjacent = key_idx[order][1:] - key_idx[order][:-1] == 1
+    gaps = frames[order][1:] - frames[order][:-1]
+    pairs = np.flatnonzero(same_track & adjacent & (gaps > 1))
+    start, stop = order[pairs], order[pairs + 1]
+
+    # One new row per skipped frame of every bridged pair
+    counts = gaps[pairs] - 1
+    src = np.repeat(np.arange(len(pairs)), counts)
+    offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + 1
+    a, b = start[src], stop[src]
+    alpha = (offset / (frames[b] - frames[a]))[:, None]
+
+    pose_a = cols["pose"][a].reshape(len(a), -1, 3).astype(np.float64)
+    pose_b = cols["pose"][b].reshape(len(b), -1, 3).astype(np.float64)
+    pose = quat_to_axis_angle(slerp(axis_angle_to_quat(pose_a), axis_angle_to_quat(pose_b), alpha[..., None]))
+
+    filled = {
+        "id": cols["id"][a],
+        "pose": pose.reshape(len(a), -1),
+        "trans": (1 - alpha) * cols["trans"][a] + alpha * cols["trans"][b],
+        "betas": (1 - alpha) * cols["betas"][a] + alpha * cols["betas"][b],
+        "frame_idx": frames[a] + offset,
+    }
+    cols["frame_idx"] = frames
+
+    merged = {k: np.concatenate([cols[k], filled[k].astype(cols[k].dtype)]) for k in filled}
+    rows = np.lexsort((merged["id"], merged["frame_idx"]))
+    return {k: torch.from_numpy(np.ascontiguousarray(v[rows])) for k, v in merged.items()}
+
+
+# === Offline evaluation against dense tracking ===
+def replay_keyframes(preds, sampler):
+    """Video frames a KeyframeSampler would have run on, replayed over dense preds.
+
+    Mirrors tracking.py: a sparse keyframe that opens the dense window also
+    backfills the frames skipped since the previous keyframe.
+    """
+    import torch
+
+    frame_idx = torch.as_tensor(preds["frame_idx"]).numpy()
+    ids = torch.as_tensor(preds["id"]).numpy()
+    pose = torch.as_tensor(preds["pose"]).float().numpy()
+    rows_by_frame = {f: np.flatnonzero(frame_idx == f) for f in np.unique(frame_idx)}
+
+    keyframes, pending = [], []
+    for frame in range(int(frame_idx.max()) + 1):
+        if not sampler.wants(frame):
+            pending.append(frame)
+            continue
+        rows = rows_by_frame.get(frame, np.array([], dtype=np.int64))
+        if pending and sampler.is_fast(sampler.speed(frame, ids[rows], pose[rows])):
+            sampler.open_window(frame)
+            for f in pending:
+                r = rows_by_frame.get(f, np.array([], dtype=np.int64))
+                sampler.record(f, ids[r], pose[r])
+                keyframes.append(f)
+        sampler.record(frame, ids[rows], pose[rows])
+        keyframes.append(frame)
+        pending = []
+    return np.array(keyframes)
+
+def sparse_preds(preds, keyframes):
+    """Dense preds restricted to keyframes, with frame_idx re-indexed into `keyframes`."""
+    import torch
+
+    frame_idx = torch.as_tensor(preds["frame_idx"]).numpy()
+    rows = np.flatnonzero(np.isin(frame_idx, keyframes))
+    sparse = {k: torch.as_tensor(v)[rows] for k, v in preds.items()}
+    sparse["frame_idx"] = torch.from_numpy(np.searchsorted(keyframes, frame_idx[rows]))
+    return sparse
+
+def joint_error(skeleton, dense, filled):
+    """Per-row joint error (metres, mean over joints) of filled vs dense, on rows both contain."""
+    import torch
+
+    def keyed(p):
+        return {(int(f), int(i)): r for r, (f, i) in enumerate(zip(p["frame_idx"].tolist(), p["id"].tolist()))}
+    a, b = keyed(dense), keyed(filled)
+    common = sorted(set(a) & set(b))
+    ra, rb = [a[k] for k in common], [b[k] for k in common]
+    ja, _, _ = kinematics.extract_joints(skeleton, {k: torch.as_tensor(v)[ra] for k, v in dense.items()})
+    jb, _, _ = kinematics.extract_joints(skeleton, {k: torch.as_tensor(v)[rb] for k, v in filled.items()})
+    return np.array([k[0] for k in common]), np.linalg.norm(ja - jb, axis=-1).mean(axis=1)
+
+
+@click.command()
+@click.option("--pt", "pt_file", default="results/hardik.pt", help="Densely tracked CoMotion .pt to evaluate against.")
+@click.option("--step", default=sparse_step, type=int, help="Sparse inference stride.")
+@click.option("--ratio", default=dense_speed_ratio, type=float, help="Speed ratio that opens the dense window.")
+@click.option("--hold", default=dense_hold_frames, type=int, help="Dense frames after the last fast keyframe.")
+@click.option("--smpl", "smpl_path", default=kinematics.smpl_model_path, help="SMPL model folder.")
+def main(pt_file, step, ratio, hold, smpl_path):
+    """Report inference savings and joint error of adaptive sampling on a dense track."""
+    import torch
+
+    dense = torch.load(pt_file, map_location="cpu")
+    keyframes = replay_keyframes(dense, KeyframeSampler(step, ratio, hold))
+    filled = interpolate_preds(sparse_preds(dense, keyframes), keyframes)
+
+    num_frames = int(torch.as_tensor(dense["frame_idx"]).max()) + 1
+    frames, err = joint_error(kinematics.load_skeleton(smpl_path), dense, filled)
+    skipped = ~np.isin(frames, keyframes)
+    print(f"📍 Inference on {len(keyframes)}/{num_frames} frames ({100 * (1 - len(keyframes) / num_frames):.1f}% saved)")
+    print(f"📍 Rows: {len(dense['frame_idx'])} dense, {len(filled['frame_idx'])} after interpolation")
+    if skipped.any():
+        e = err[skipped] * 1000
+        print(f"📏 Interpolated joint error: mean {e.mean():.1f} mm, p95 {np.percentile(e, 95):.1f} mm, max {e.max():.1f} mm")
+
+
+if __name__ == "__main__":
+    main()
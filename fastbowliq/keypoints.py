@@ -0,0 +1,212 @@
+import functools
+import os
+import sys
+
+import pandas as pd
+import numpy as np
+
+from . import joint_store
+from . import kinematics
+from . import telemetry
+from .fingerprint import Manifest, code_version, file_hash, value_hash
+from .joint_store import relabel_store, save_store
+
+# === Input files ===
+pt_path = "results/hardik.pt"          # CoMotion output
+csv_path = "segments/hardik.csv"       # Phase segments
+store_dir = "phases/hardik"        # Output joint store (joints.npy + index.csv)
+
+# === SMPL Model for extracting joints ===
+smpl_model_path = "src/comotion_demo/data/smpl"  # Folder containing SMPL_NEUTRAL.pkl
+chunk_size = 512  # Detection rows per batched SMPL forward pass
+joint_engine = "fk"  # "fk" = joints-only kinematics (kinematics.py), "smpl" = full smplx forward
+
+# === Bowler identification ===
+bowler_weights = {"coverage": 1.0, "displacement": 1.0, "size": 1.0, "stride": 1.0}
+stride_candidates = 3  # Best-scoring tracks that get a joints pass for the stride check
+
+PRED_KEYS = ("id", "pose", "trans", "betas", "frame_idx")
+L_ANKLE, R_ANKLE = 7, 8
+
+
+def extract_joints(smpl, data, chunk_size=chunk_size):
+    """Run every detection row of a CoMotion .pt through SMPL in batches.
+
+    Returns a (N, 24, 3) float32 joints array together with the matching
+    frame_idx and id arrays, one entry per detection row.
+    """
+    import torch
+
+    pose = torch.as_tensor(data["pose"]).float()
+    betas = torch.as_tensor(data["betas"]).float()
+    trans = torch.as_tensor(data["trans"]).float()
+    frame_idx = torch.as_tensor(data["frame_idx"]).numpy()
+    ids = torch.as_tensor(data["id"]).numpy() if "id" in data else np.zeros(len(frame_idx), dtype=np.int64)
+
+    num_rows = pose.shape[0]
+    joints = np.empty((num_rows, 24, 3), dtype=np.float32)
+    span = telemetry.current()
+    with torch.no_grad():
+        for start in range(0, num_rows, chunk_size):
+            stop = min(start + chunk_size, num_rows)
+            mark = span.clock()
+            smpl_output = smpl(
+                betas=betas[start:stop],
+                body_pose=pose[start:stop, 3:],
+                global_orient=pose[start:stop, :3],
+                transl=trans[start:stop]
+            )
+            joints[start:stop] = smpl_output.joints[:, :24].numpy()
+            span.lap("smpl_forward", mark, stop - start)
+
+    return joints, frame_idx, ids
+
+
+# === Bowler identification ===
+def track_stats(data):
+    """Whole-track statistics per tracker id, computed from trans alone (no SMPL pass).
+
+    coverage     — fraction of video frames the track is present in
+    displacement — horizontal extent of the track's path in metres (the run-up)
+    size         — median inverse depth, proportional to apparent image height
+    """
+    import torch
+
+    trans = torch.as_tensor(data["trans"]).double().numpy()
+    frame_idx = torch.as_tensor(data["frame_idx"]).numpy()
+    ids = torch.as_tensor(data["id"]).numpy() if "id" in data else np.zeros(len(frame_idx), dtype=np.int64)
+    num_frames = len(np.unique(frame_idx))
+
+    stats = {}
+    for track_id in np.unique(ids):
+        t = trans[ids == track_id]
+        stats[int(track_id)] = {
+            "coverage": len(np.unique(frame_idx[ids == track_id])) / num_frames,
+            "displacement": float(np.linalg.norm(np.ptp(t[:, [0, 2]], axis=0))),
+            "size": float(np.median(1.0 / np.maximum(t[:, 2], 1e-3))),
+        }
+    return stats
+
+
+def stride_signature(joints):
+    """Widest horizontal ankle separation (metres) over a track — the delivery stride."""
+    gap = joints[:, L_ANKLE] - joints[:, R_ANKLE]
+    return float(np.linalg.norm(gap[:, [0, 2]], axis=1).max())
+
+
+def track_rows(data, track_id):
+    """Row indices of one track, sorted by frame with one row per frame."""
+    import torch
+
+    frame_idx = torch.as_tensor(data["frame_idx"]).numpy()
+    ids = torch.as_tensor(data["id"]).numpy() if "id" in data else np.zeros(len(frame_idx), dtype=np.int64)
+    rows = np.flatnonzero(ids == track_id)
+    rows = rows[np.argsort(frame_idx[rows], kind="stable")]
+    _, first = np.unique(frame_idx[rows], return_index=True)
+    return rows[first]
+
+
+def subset_rows(data, rows):
+    """Copy of a .pt dict restricted to the given detection rows."""
+    import torch
+
+    index = torch.as_tensor(rows, dtype=torch.long)
+    return {k: torch.as_tensor(v)[index] for k, v in data.items() if k in PRED_KEYS}
+
+
+def select_bowler_track(data, skeleton):
+    """Pick the bowler's track id from whole-track statistics.
+
+    Every track is scored on coverage, run-up displacement and apparent
+    size, each normalised by the best track. Only the top stride_candidates
+    tracks are run through forward kinematics to add the delivery-stride
+    signature, so bystanders never get a joints pass.
+    Returns (track_id, stats per track).
+    """
+    stats = track_stats(data)
+    best = {k: max(s[k] for s in stats.values()) or 1.0 for k in ("coverage", "displacement", "size")}
+    for s in stats.values():
+        s["score"] = sum(bowler_weights[k] * s[k] / best[k] for k in best)
+
+    candidates = sorted(stats, key=lambda i: stats[i]["score"], reverse=True)[:stride_candidates]
+    if len(candidates) > 1:
+        for track_id in candidates:
+            joints, _, _ = kinematics.extract_joints(skeleton, subset_rows(data, track_rows(data, track_id)))
+            stats[track_id]["stride"] = stride_signature(joints)
+        best_stride = max(stats[i]["stride"] for i in candidates) or 1.0
+        for track_id in candidates:
+            stats[track_id]["score"] += bowler_weights["stride"] * stats[track_id]["stride"] / best_stride
+
+    track_id = max(candidates, key=lambda i: stats[i]["score"])
+    return track_id, stats
+
+
+def bowler_joints(data, skeleton, engine=joint_engine):
+    """Joints (F, 24, 3) and frame numbers of the selected bowler track only."""
+    track_id, _ = select_bowler_track(data, skeleton)
+    bowler_data = subset_rows(data, track_rows(data, track_id))
+    if engine == "fk":
+        joints, frames, _ = kinematics.extract_joints(skeleton, bowler_data)
+    else:
+        joints, frames, _ = extract_joints(load_smpl(), bowler_data, chunk_size)
+    return joints, frames, track_id
+
+
+@functools.lru_cache(maxsize=None)
+def load_smpl(model_path=smpl_model_path):
+    """SMPL body model, loaded once per process."""
+    from smplx import SMPL
+
+    return SMPL(model_path=model_path, gender='neutral', batch_size=1)
+
+
+@telemetry.timed("keypoints")
+def extract_keypoints(pt_path=pt_path, csv_path=csv_path, store_dir=store_dir, force=False):
+    """Write the bowler's joints for every frame of pt_path to a joint store.
+
+    Joints do not depend on the phase labels, so when only csv_path changed
+    since the last run the store is relabelled instead of re-extracted.
+    """
+    import torch
+
+    manifest = Manifest(os.path.join(store_dir, "manifest.json"))
+    joints_fp = value_hash({
+        "pt": file_hash(pt_path),
+        "engine": joint_engine,
+        "chunk_size": chunk_size,
+        "bowler": [bowler_weights, stride_candidates],
+        "smpl": smpl_model_path,
+        "code": code_version(sys.modules[__name__], kinematics, joint_store),
+    })
+    labels_fp = file_hash(csv_path)
+    store_ready = os.path.exists(os.path.join(store_dir, "joints.npy"))
+
+    # === Load frame-wise labels ===
+    label_df = pd.read_csv(csv_path)
+    label_map = dict(zip(label_df["frame"], label_df["label"]))
+
+    if store_ready and not force and not manifest.changed("joints", joints_fp):
+        if not manifest.changed("labels", labels_fp):
+            print(f"⏭️ Inputs unchanged since last run — keeping {store_dir}")
+        else:
+            relabel_store(store_dir, label_map)
+            manifest.save(joints=joints_fp, labels=labels_fp)
+            print(f"🔁 Labels changed — relabelled {store_dir} without re-extracting joints")
+        return
+
+    # === Load pose data ===
+    data = torch.load(pt_path, map_location="cpu")
+
+    # === Pick the bowler's track, then extract joints for that track only
+    joints, bowler_frames, track_id = bowler_joints(data, kinematics.load_skeleton(smpl_model_path))
+    print(f"🏏 Bowler track id: {track_id} ({len(bowler_frames)} frames)")
+    telemetry.current().add(len(bowler_frames))
+    labels = np.array([label_map.get(f, "") for f in bowler_frames], dtype=object)
+
+    # === Save every bowler frame with its phase label
+    save_store(store_dir, joints, bowler_frames, labels)
+    manifest.save(joints=joints_fp, labels=labels_fp)
+
+
+if __name__ == "__main__":
+    extract_keypoints()
@@ -0,0 +1,155 @@
+import functools
+import time
+
+import numpy as np
+
+from . import telemetry
+
+# === Joints-only SMPL forward kinematics ===
+# Only the 24 skeleton joints are needed downstream, so the mesh
+# (blend shapes + skinning of 6890 vertices) is never built: the rest-pose
+# skeleton is regressed once per unique betas vector and the rigid chain is
+# evaluated for all frames at once.
+
+smpl_model_path = "src/comotion_demo/data/smpl"  # Folder containing SMPL_NEUTRAL.pkl
+parity_tolerance = 1e-4  # Max joint error (model units) of FK vs smplx for the parity check
+
+
+class Skeleton:
+    """Rest-pose joint regressor of an SMPL model, reduced to the 24 joints."""
+
+    def __init__(self, j_template, j_shapedirs, parents):
+        self.j_template = np.asarray(j_template, dtype=np.float64)    # [24, 3]
+        self.j_shapedirs = np.asarray(j_shapedirs, dtype=np.float64)  # [24, 3, num_betas]
+        self.parents = np.asarray(parents, dtype=np.int64)            # [24], root = -1
+
+    @classmethod
+    def from_smpl(cls, smpl):
+        """Fold the J_regressor into the template and shape directions of an smplx SMPL model."""
+        J_regressor = smpl.J_regressor.detach().cpu().double().numpy()
+        v_template = smpl.v_template.detach().cpu().double().numpy()
+        shapedirs = smpl.shapedirs.detach().cpu().double().numpy()
+        parents = smpl.parents.detach().cpu().numpy().copy()
+        parents[0] = -1
+        return cls(
+            J_regressor @ v_template,
+            np.einsum("jv,vcb->jcb", J_regressor, shapedirs),
+            parents,
+        )
+
+    @property
+    def num_betas(self):
+        return self.j_shapedirs.shape[-1]
+
+    def rest_joints(self, betas):
+        """Rest-pose joints [B, 24, 3] for betas [B, num_betas]."""
+        betas = np.asarray(betas, dtype=np.float64)[:, :self.num_betas]
+        return self.j_template + np.einsum("jcb,nb->njc", self.j_shapedirs, betas)
+
+
+@functools.lru_cache(maxsize=None)
+def load_skeleton(model_path=smpl_model_path):
+    """Skeleton of the neutral SMPL model, built once per process."""
+    from smplx import SMPL
+
+    return Skeleton.from_smpl(SMPL(model_path=model_path, gender='neutral', batch_size=1))
+
+
+def rodrigues(rot_vecs):
+    """Axis-angle [..., 3] to rotation matrices [..., 3, 3] (same epsilon as smplx)."""
+    angle = np.linalg.norm(rot_vecs + 1e-8, axis=-1, keepdims=True)
+    rx, ry, rz = np.moveaxis(rot_vecs / angle, -1, 0)
+    sin = np.sin(angle)[..., None]
+    cos = np.cos(angle)[..., None]
+
+    zeros = np.zeros_like(rx)
+    K = np.stack([zeros, -rz, ry, rz, zeros, -rx, -ry, rx, zeros], axis=-1)
+    K = K.reshape(rot_vecs.shape[:-1] + (3, 3))
+    return np.eye(3) + sin * K + (1 - cos) * (K @ K)
+
+
+def forward_kinematics(skeleton, pose, betas, trans):
+    """Posed joints [N, 24, 3] from SMPL pose [N, 72], betas [N, B] and trans [N, 3]."""
+    pose = np.asarray(pose, dtype=np.float64)
+    trans = np.asarray(trans, dtype=np.float64)
+    num_rows = pose.shape[0]
+
+    # Rest skeleton once per unique shape, gathered back to rows
+    unique_betas, inverse = np.unique(np.asarray(betas), axis=0, return_inverse=True)
+    rest = skeleton.rest_joints(unique_betas)[inverse.reshape(-1)]
+
+    rot_mats = rodrigues(pose.reshape(num_rows, 24, 3))
+    parents = skeleton.parents
+
+    global_rot = np.empty_like(rot_mats)
+    posed = np.empty_like(rest)
+    global_rot[:, 0] = rot_mats[:, 0]
+    posed[:, 0] = rest[:, 0]
+    for j in range(1, 24):
+        p = parents[j]
+        offset = rest[:, j] - rest[:, p]
+        global_rot[:, j] = global_rot[:, p] @ rot_mats[:, j]
+        posed[:, j] = posed[:, p] + np.einsum("nij,nj->ni", global_rot[:, p], offset)
+
+    return posed + trans[:, None]
+
+
+def extract_joints(skeleton, data, chunk_size=4096):
+    """Joints-only counterpart of keypoints.extract_joints for a CoMotion .pt dict."""
+    import torch
+
+    pose = torch.as_tensor(data["pose"]).float().numpy()
+    betas = torch.as_tensor(data["betas"]).float().numpy()
+    trans = torch.as_tensor(data["trans"]).float().numpy()
+    frame_idx = torch.as_tensor(data["frame_idx"]).numpy()
+    ids = torch.as_tensor(data["id"]).numpy() if "id" in data else np.zeros(len(frame_idx), dtype=np.int64)
+
+    num_rows = pose.shape[0]
+    joints = np.empty((num_rows, 24, 3), dtype=np.float32)
+    span = telemetry.current()
+    for start in range(0, num_rows, chunk_size):
+        stop = min(start + chunk_size, num_rows)
+        mark = span.clock()
+        joints[start:stop] = forward_kinematics(
+            skeleton, pose[start:stop], betas[start:stop], trans[start:stop]
+        )
+        span.lap("smpl_forward", mark, stop - start)
+
+    return joints, frame_idx, ids
+
+
+def check_parity(smpl, data, chunk_size=512):
+    """Compare joints-only FK against the full smplx forward pass.
+
+    Returns (max abs joint error in model units, smplx seconds, fk seconds).
+    """
+    from . import keypoints
+
+    t0 = time.perf_counter()
+    reference, _, _ = keypoints.extract_joints(smpl, data, chunk_size)
+    t1 = time.perf_counter()
+    joints, _, _ = extract_joints(Skeleton.from_smpl(smpl), data)
+    t2 = time.perf_counter()
+    return float(np.abs(joints - reference).max()), t1 - t0, t2 - t1
+
+
+def main():
+    """Parity check of joints-only FK against smplx on the sample delivery."""
+    import torch
+    from smplx import SMPL
+
+    pt_path = "results/hardik.pt"
+    smpl = SMPL(model_path=smpl_model_path, gender='neutral', batch_size=1)
+    data = torch.load(pt_path, map_location="cpu")
+
+    max_err, smpl_sec, fk_sec = check_parity(smpl, data)
+    print(f"📍 Rows: {len(data['frame_idx'])}")
+    print(f"📍 Max joint error vs smplx: {max_err:.2e}")
+    print(f"📍 smplx: {smpl_sec:.3f}s, joints-only FK: {fk_sec:.3f}s ({smpl_sec / max(fk_sec, 1e-9):.1f}x)")
+    if not max_err < parity_tolerance:
+        raise SystemExit(f"❌ Joints-only FK diverged from smplx output ({max_err:.2e} >= {parity_tolerance:.0e})")
+    print("✅ Parity check passed")
+
+
+if __name__ == "__main__":
+    main()
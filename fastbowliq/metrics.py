@@ -0,0 +1,121 @@
+import numpy as np
+
+# === Biomechanical metrics ===
+# Pure NumPy angle and distance math on SMPL joints. Nothing here imports
+# torch, pandas or the model code, so it loads in milliseconds.
+
+# === Joint indices (SMPL) ===
+PELVIS, L_HIP, R_HIP = 0, 1, 2
+L_KNEE = 4
+L_ANKLE, R_ANKLE = 7, 8
+SPINE3, L_FOOT = 9, 10
+L_COLLAR, R_COLLAR, HEAD = 13, 14, 15
+L_SHOULDER, R_SHOULDER = 16, 17
+R_ELBOW, R_WRIST, R_HAND = 19, 21, 23
+
+# All metric functions below take joints shaped (..., 24, 3), so the same
+# code handles one frame, a whole delivery or a batch of deliveries.
+
+
+# === Utility Functions ===
+def _norm(v):
+    return np.linalg.norm(v, axis=-1)
+
+def _dot(a, b):
+    return np.sum(a * b, axis=-1)
+
+def angle_between(j1, j2, j3):
+    a = j1 - j2
+    b = j3 - j2
+    cos_theta = _dot(a, b) / (_norm(a) * _norm(b) + 1e-8)
+    angle = np.arccos(np.clip(cos_theta, -1.0, 1.0))
+    return np.degrees(angle)
+
+def knee_angle(joints):
+    return angle_between(joints[..., L_HIP, :], joints[..., L_KNEE, :], joints[..., L_ANKLE, :])
+
+def elbow_extension(joints):
+    """Deviation of the bowling arm from a straight elbow (chucking check)."""
+    angle = angle_between(joints[..., R_SHOULDER, :], joints[..., R_ELBOW, :], joints[..., R_WRIST, :])
+    return np.abs(angle - 180)
+
+def hip_shoulder_separation(joints):
+    shoulder_vec = joints[..., R_COLLAR, :] - joints[..., L_COLLAR, :]
+    hip_vec = joints[..., R_HIP, :] - joints[..., L_HIP, :]
+    unit_shoulder = shoulder_vec / (_norm(shoulder_vec)[..., None] + 1e-8)
+    unit_hip = hip_vec / (_norm(hip_vec)[..., None] + 1e-8)
+    dot = _dot(unit_shoulder, unit_hip)
+    angle = np.arccos(np.clip(dot, -1.0, 1.0))
+    return np.degrees(angle)
+
+def stride_length(joints):
+    return _norm(joints[..., R_ANKLE, :] - joints[..., L_ANKLE, :])
+
+def delivery_reach(joints):
+    """Raw z-distance between bowling hand and front toe (model units)."""
+    return np.abs(joints[..., R_HAND, 2] - joints[..., L_FOOT, 2])
+
+def estimate_model_height(joints):
+    return _norm(joints[..., HEAD, :] - joints[..., L_ANKLE, :]) + 0.1
+
+def scale_distance(model_distance, model_height, actual_height):
+    scale_factor = actual_height / (model_height + 1e-8)
+    meters = model_distance * scale_factor
+    inches = meters * 39.3701
+    return meters, inches
+
+def lateral_flexion(joints):
+    vec = joints[..., SPINE3, :] - joints[..., PELVIS, :]
+    angle = np.arctan2(vec[..., 0], vec[..., 1])
+    return np.degrees(angle)
+
+def alignment_angles(joints):
+    """Angles (deg) of the hip and shoulder lines against the bowling direction."""
+    delivery_vec = np.array([0, 0, 1])  # Z-axis is bowling direction
+    hip_vec = joints[..., L_HIP, :] - joints[..., R_HIP, :]
+    shoulder_vec = joints[..., L_SHOULDER, :] - joints[..., R_SHOULDER, :]
+
+    hip_angle = np.degrees(np.arccos(np.clip(_dot(hip_vec, delivery_vec) / (_norm(hip_vec) + 1e-8), -1.0, 1.0)))
+    shoulder_angle = np.degrees(np.arccos(np.clip(_dot(shoulder_vec, delivery_vec) / (_norm(shoulder_vec) + 1e-8), -1.0, 1.0)))
+    return hip_angle, shoulder_angle
+
+def classify_alignment(joints):
+    """Alignment label for a single frame of joints (24, 3)."""
+    hip_angle, shoulder_angle = alignment_angles(joints)
+
+    def classify(angle):
+        if 70 <= angle <= 110:
+            return "side-on"
+        elif angle <= 30 or angle >= 150:
+            return "front-on"
+        else:
+            return "semi side-on"
+
+    hip_label = classify(hip_angle)
+    shoulder_label = classify(shoulder_angle)
+    return hip_label if hip_label == shoulder_label else f"mixed ({hip_label}/{shoulder_label})"
+
+
+# === Vectorized Metric Engine ===
+def metric_series(joints):
+    """Every per-frame metric for joints (..., frames, 24, 3) in one pass.
+
+    Both the back knee (at BFC) and the front knee (at release) read the
+    same knee_angle series; the phase decides which frame is reported.
+    """
+    return {
+        "knee_angle": knee_angle(joints),
+        "elbow_extension": elbow_extension(joints),
+        "hip_shoulder_separation": hip_shoulder_separation(joints),
+        "lateral_flexion": lateral_flexion(joints),
+        "stride_raw": stride_length(joints),
+        "reach_raw": delivery_reach(joints),
+        "model_height": estimate_model_height(joints),
+    }
+
+def event_window(series, frames, event_frame, half_window=5):
+    """(min, max) of a per-frame series within +/- half_window frames of an event."""
+    mask = np.abs(frames - event_frame) <= half_window
+    if not mask.any():
+        return np.nan, np.nan
+    return float(np.min(series[mask])), float(np.max(series[mask]))
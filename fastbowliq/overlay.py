@@ -0,0 +1,225 @@
+import os
+import queue
+import sys
+import threading
+import pandas as pd
+import numpy as np
+
+from . import pipeline
+from . import telemetry
+from .fingerprint import Manifest, code_version, file_hash
+from .frame_store import FrameStore
+
+# ===== CONFIG =====
+input_video_path = "rendered/hardik.mp4"
+output_video_path = "final_output/hardik_overlayed.mp4"
+csv_path = "final_output/biomech_results.csv"
+
+font = 0  # cv2.FONT_HERSHEY_SIMPLEX
+font_scale = 0.8
+font_color = (0, 0, 255)  # Red text
+line_thickness = 2
+line_spacing = 30  # Vertical spacing between text lines
+preview_long_side = None  # e.g. 960: render a quick preview from the frame store cache shared with segment.py
+queue_depth = 8  # Frames buffered between the decode, blend and encode threads
+
+
+def build_annotations(row):
+    """Phase frame → text lines for one row of biomech_results.csv."""
+    biomech_analysis = {
+        "bfc": {
+            "frame": int(row["Frame_BFC"]),
+            "lines": [
+                f"Back Knee Flexion: {row['Back_Knee_Angle_BFC']:.1f} deg"
+            ]
+        },
+        "ffc": {
+            "frame": int(row["Frame_FFC"]),
+            "lines": [
+                f"Stride Length: {row['Stride_Length_m']:.2f} m ({row['Stride_Length_in']:.1f} in)",
+                f"Alignment: {row['Alignment']}"
+            ]
+        },
+        "release": {
+            "frame": int(row["Frame_Release"]),
+            "lines": [
+                f"Elbow Angle: {row['Max_Elbow_Angle']:.1f} deg",
+                f"Hip-Shoulder Separation: {row['Hip_Shoulder_Separation']:.1f} deg",
+                f"Front Knee Angle: {row['Front_Knee_Angle_Release']:.1f} deg",
+                f"Delivery Reach: {row['Delivery_Reach_m']:.2f} m",
+                f"Lateral Flexion: {row['Lateral_Flexion']:.1f} deg"
+            ]
+        }
+    }
+
+    # Map frame index to lines
+    return {v["frame"]: v["lines"] for v in biomech_analysis.values()}
+
+
+# === Text layer ===
+def safe_text_position(x, y, w, h, frame_width, frame_height):
+    x = max(0, min(x, frame_width - w - 10))
+    y = max(h + 10, min(y, frame_height - 10))
+    return x, y
+
+
+def text_layer(lines, frame_width, frame_height):
+    """Render the accumulated lines once into an alpha mask cropped to their bounding box.
+
+    Returns (region, keep, color): the frame slice the text covers, 1 - alpha
+    and the alpha-premultiplied text colour, or None when nothing is drawn.
+    """
+    import cv2
+
+    mask = np.zeros((frame_height, frame_width), dtype=np.uint8)
+    for j, text in enumerate(lines):
+        text_size = cv2.getTextSize(text, font, font_scale, line_thickness)[0]
+        x, y = safe_text_position(50, 50 + j * line_spacing, *text_size, frame_width, frame_height)
+        cv2.putText(mask, text, (x, y), font, font_scale, 255, line_thickness, cv2.LINE_AA)
+
+    ys, xs = np.nonzero(mask)
+    if not len(ys):
+        return None
+    region = (slice(ys.min(), ys.max() + 1), slice(xs.min(), xs.max() + 1))
+    alpha = mask[region].astype(np.float32)[..., None] / 255
+    return region, 1 - alpha, alpha * np.array(font_color, dtype=np.float32) + 0.5
+
+
+def blend(frame, layer):
+    """Alpha-blended copy of a frame with a text layer (only inside the text's bounding box).
+
+    The input is never written: frames may be views of the shared frame store.
+    """
+    if layer is None:
+        return frame
+    region, keep, color = layer
+    out = frame.copy()
+    out[region] = (frame[region] * keep + color).astype(np.uint8)
+    return out
+
+
+# === Pipeline stages ===
+def _timed_frames(frames, span):
+    """Pass frames through, charging the time spent decoding each one to "decode"."""
+    mark = span.clock()
+    for frame in frames:
+        span.lap("decode", mark)
+        yield frame
+        mark = span.clock()
+
+
+def _encode_worker(writer, in_queue, span, errors):
+    """Write blended frames; after a failure keep draining so the blend stage never blocks."""
+    while True:
+        item = in_queue.get()
+        if item is pipeline.DONE:
+            break
+        if errors:
+            continue
+        frame, repeat = item
+        try:
+            mark = span.clock()
+            for _ in range(repeat):
+                writer.write(frame)
+            span.lap("encode", mark, repeat)
+        except Exception as e:
+            errors.append(e)
+    writer.release()
+
+
+def read_frames(cap):
+    """Frames of an opened cv2.VideoCapture, released once exhausted."""
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        yield frame
+    cap.release()
+
+
+@telemetry.timed("overlay")
+def render_overlay(input_video_path=input_video_path, output_video_path=output_video_path, csv_path=csv_path,
+                   force=False, frame_offset=0, preview_long_side=preview_long_side):
+    """Burn the metrics of csv_path into the video; frame_offset is the source frame of the video's first frame."""
+    import cv2
+
+    manifest = Manifest(f"{output_video_path}.manifest.json")
+    inputs_fp = {
+        "video": file_hash(input_video_path),
+        "results": file_hash(csv_path),
+        "style": [font, font_scale, list(font_color), line_thickness, line_spacing],
+        "frame_offset": frame_offset,
+        "preview_long_side": preview_long_side,
+        "code": code_version(sys.modules[__name__]),
+    }
+    if os.path.exists(output_video_path) and not force and not manifest.changed("inputs", inputs_fp):
+        print(f"⏭️ Inputs unchanged since last run — keeping {output_video_path}")
+        return
+
+    # Read CSV
+    df = pd.read_csv(csv_path)
+    overlay_frames = {f - frame_offset: lines for f, lines in build_annotations(df.iloc[0]).items()}
+
+    span = telemetry.current()
+    span.set(video=str(input_video_path))
+
+    # Open video (a preview reads the downscaled frames of the shared frame store)
+    if preview_long_side:
+        store = FrameStore(input_video_path, preview_long_side)
+        fps, (frame_width, frame_height) = store.fps, store.size
+        frames = store.frames()
+    else:
+        cap = cv2.VideoCapture(str(input_video_path))
+        if not cap.isOpened():
+            raise FileNotFoundError(f"Cannot open {input_video_path}")
+
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        frame_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        frames = read_frames(cap)
+    print(f"ℹ️ FPS: {fps}, Resolution: {frame_width}x{frame_height}")
+
+    # Prepare writer
+    out = cv2.VideoWriter(
+        str(output_video_path),
+        cv2.VideoWriter_fourcc(*"mp4v"),
+        fps,
+        (frame_width, frame_height)
+    )
+
+    # Decode → blend → encode run concurrently, linked by bounded queues
+    decoded = pipeline.background(_timed_frames(frames, span), queue_depth)
+    blended = queue.Queue(maxsize=queue_depth)
+    encode_errors = []
+    encoder = threading.Thread(target=_encode_worker, args=(out, blended, span, encode_errors), daemon=True)
+    encoder.start()
+
+    all_lines_so_far = []
+    layer = None
+    try:
+        for frame_idx, frame in enumerate(decoded):
+            mark = span.clock()
+            repeat = 1
+            if frame_idx in overlay_frames:
+                # The text only changes here, so it is rendered once for the frames that follow
+                print(f"📌 Annotating phase at frame {frame_idx}")
+                all_lines_so_far.extend(overlay_frames[frame_idx])
+                layer = text_layer(all_lines_so_far, frame_width, frame_height)
+                repeat = int(fps)  # hold the phase frame for a second
+            frame = blend(frame, layer)
+            span.lap("blend", mark)
+            blended.put((frame, repeat))
+            span.add()
+    finally:
+        decoded.close()  # stops and joins the decoder, also after a blend error
+        blended.put(pipeline.DONE)  # the encoder keeps draining, so this never blocks for long
+        encoder.join()
+
+    if encode_errors:
+        raise encode_errors[0]
+    manifest.save(inputs=inputs_fp)
+    print(f"✅ Done! Overlay video saved to: {output_video_path}")
+
+
+if __name__ == "__main__":
+    render_overlay()
@@ -0,0 +1,60 @@
+import queue
+import threading
+import time
+
+# === Bounded-queue stage helpers ===
+# Shared by the threaded stages of tracking.py and overlay.py. Every blocking
+# put polls a stop event, so when the other side of a queue fails (and sets
+# the event) a thread never stays stuck on a full queue and joins cleanly.
+
+DONE = object()      # end-of-stream marker
+poll_seconds = 0.1   # how often a blocked put re-checks its stop event
+
+
+def put(q, item, stop):
+    """Put item on a bounded queue unless stop is set first; returns False if it was."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=poll_seconds)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def produce(items, out_queue, stop):
+    """Thread target: feed items into out_queue, then DONE or the exception raised while iterating."""
+    try:
+        for item in items:
+            if not put(out_queue, item, stop):
+                return
+        put(out_queue, DONE, stop)
+    except Exception as e:
+        put(out_queue, e, stop)
+
+
+def background(items, depth, on_wait=None):
+    """Iterate items with a producer thread running up to `depth` items ahead.
+
+    on_wait(seconds) is called with the time spent blocked on every get.
+    Closing the generator stops and joins the producer, even mid-stream, so
+    callers should close it (or use contextlib.closing) when they fail.
+    """
+    out_queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    worker = threading.Thread(target=produce, args=(items, out_queue, stop), daemon=True)
+    worker.start()
+    try:
+        while True:
+            t0 = time.perf_counter()
+            item = out_queue.get()
+            if on_wait:
+                on_wait(time.perf_counter() - t0)
+            if item is DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        worker.join()
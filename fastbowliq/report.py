@@ -0,0 +1,319 @@
+import os
+import sys
+
+import click
+import numpy as np
+import pandas as pd
+
+from . import telemetry
+from .feedback import CSV_PATH, MARKDOWN_PATH, PROMPT_COLUMNS, format_report
+from .fingerprint import Manifest, code_version, file_hash, value_hash
+
+# === Offline rule-based report ===
+# Scores every metric row against the bands below and writes the same
+# Markdown report feedback.py gets from Gemini, with no network. All rows are
+# scored at once with NumPy, so a session table of thousands of deliveries
+# takes milliseconds. The bands are coaching heuristics, not medical advice:
+# tune them to your own staff's standards.
+
+RISK_LEVELS = ["Low", "Medium", "High"]
+
+# Numeric metrics: bands are (upper bound, risk, feedback, reasoning), checked in
+# ascending order with the upper bound exclusive; `optimal` is (low, high) in
+# `unit` and `tolerance` is how far outside it the efficiency points fall to zero.
+RULES = {
+    "Back_Knee_Angle_BFC": {
+        "name": "Back Knee Flexion at BFC", "format": "{value:.1f}°",
+        "optimal": (140, 170), "unit": "°", "tolerance": 30,
+        "bands": [
+            (120, "High", "Back knee collapses at back foot contact; work on a firmer back leg landing.",
+             "Deep flexion under full body load stresses the knee and bleeds run-up momentum."),
+            (140, "Medium", "Back knee flexes more than ideal; aim to land on a slightly firmer leg.",
+             "Extra flexion raises knee load and slows the transfer into the front foot."),
+            (np.inf, "Low", "Back leg is well braced at back foot contact.",
+             "A firm back leg carries momentum forward with modest joint load."),
+        ],
+    },
+    "Stride_Length_m": {
+        "name": "Stride Length", "format": "{value:.2f} m ({Stride_Length_in:.1f} in)",
+        "optimal": (1.3, 1.9), "unit": " m", "tolerance": 0.5,
+        "bands": [
+            (1.1, "Low", "Stride is short; lengthening it slightly would add pace.",
+             "A short stride limits pace but places little extra load on the body."),
+            (1.9, "Low", "Stride length is in a good range for pace and balance.",
+             "A moderate stride balances momentum against ground reaction forces."),
+            (2.1, "Medium", "Stride is on the long side; check the front foot still lands under control.",
+             "Longer strides raise braking forces through the front leg and groin."),
+            (np.inf, "High", "Over-striding; shorten the stride to keep the body stacked over the front leg.",
+             "Over-striding is linked to groin, hamstring and front-knee strains."),
+        ],
+    },
+    "Max_Elbow_Angle": {
+        "name": "Elbow Angle at Release", "format": "{value:.1f}°",
+        "optimal": (0, 10), "unit": "°", "tolerance": 10,
+        "bands": [
+            (10, "Low", "Bowling arm is close to straight through release.",
+             "Little elbow extension keeps the action legal and the joint unloaded."),
+            (15, "Medium", "Elbow extension is near the 15° legal limit; monitor it across spells.",
+             "Repeated extension near the limit stresses the elbow and risks the action being reported."),
+            (np.inf, "High", "Elbow extension exceeds the 15° legal limit; the action needs remodelling.",
+             "Extension past 15° is illegal and loads the elbow's medial structures."),
+        ],
+    },
+    "Hip_Shoulder_Separation": {
+        "name": "Hip-Shoulder Separation", "format": "{value:.1f}°",
+        "optimal": (20, 40), "unit": "°", "tolerance": 20,
+        "bands": [
+            (15, "Low", "Little hip-shoulder separation; more trunk counter-rotation would add pace.",
+             "Low separation limits elastic energy but places little load on the spine."),
+            (40, "Low", "Hip-shoulder separation is in a good range for power.",
+             "Moderate separation stores energy without excessive spinal twist."),
+            (50, "Medium", "Separation is large; keep hips and shoulders better matched.",
+             "Large separation increases torsion through the lumbar spine."),
+            (np.inf, "High", "Excessive hip-shoulder separation; reduce shoulder counter-rotation.",
+             "Extreme counter-rotation is a key risk factor for lumbar stress injuries."),
+        ],
+    },
+    "Front_Knee_Angle_Release": {
+        "name": "Front Knee Angle at Release", "format": "{value:.1f}°",
+        "optimal": (150, 180), "unit": "°", "tolerance": 40,
+        "bands": [
+            (120, "High", "Front knee collapses at release; strengthen the front-leg brace.",
+             "A collapsing front leg absorbs the run-up energy in the knee and lower back."),
+            (140, "Medium", "Front knee flexes noticeably; a firmer front leg would add pace.",
+             "Moderate flexion loses pace and shifts load onto the knee extensors."),
+            (np.inf, "Low", "Front leg is braced well through release.",
+             "A braced front leg converts run-up momentum into pace efficiently."),
+        ],
+    },
+    "Delivery_Reach_m": {
+        "name": "Delivery Reach", "format": "{value:.3f} m",
+        "optimal": (0.4, 1.2), "unit": " m", "tolerance": 0.4,
+        "bands": [
+            (0.15, "Medium", "Very short reach; the bowling hand releases barely ahead of the front foot.",
+             "Releasing early often comes with a compensating lean that loads the back and shoulder."),
+            (np.inf, "Low", "Release point is well out in front of the front foot.",
+             "Good reach lets the trunk flex forward rather than sideways."),
+        ],
+    },
+    "Lateral_Flexion": {
+        "name": "Lateral Flexion", "format": "{raw:.1f}° ({value:.1f}° from vertical)",
+        "optimal": (0, 25), "unit": "°", "tolerance": 20,
+        "bands": [
+            (20, "Low", "Trunk stays fairly upright through delivery.",
+             "Modest side bend keeps load on the lumbar spine low."),
+            (35, "Medium", "Noticeable side bend of the trunk; work on core control.",
+             "Side flexion adds asymmetric load on the lower back."),
+            (np.inf, "High", "Excessive lateral flexion; the trunk falls away at release.",
+             "Large side bend combined with rotation is linked to lumbar stress fractures."),
+        ],
+    },
+}
+
+# Alignment label (prefix) -> (risk, efficiency points, feedback, reasoning)
+ALIGNMENT_RULES = {
+    "side-on": ("Low", 1.0, "Consistent side-on action.",
+                "Hips and shoulders stay matched, keeping spinal twist low."),
+    "front-on": ("Low", 1.0, "Consistent front-on action.",
+                 "Hips and shoulders stay matched, keeping spinal twist low."),
+    "semi side-on": ("Medium", 0.7, "Semi side-on; commit to a clearer side-on or front-on position.",
+                     "An in-between position can drift into a mixed action under fatigue."),
+    "mixed": ("High", 0.3, "Mixed action: hips and shoulders point in different directions.",
+              "Mixed actions are the strongest known risk factor for lumbar stress fractures."),
+}
+
+# Table order of the report, as in the README
+REPORT_ORDER = [
+    "Back_Knee_Angle_BFC", "Stride_Length_m", "Alignment", "Max_Elbow_Angle", "Hip_Shoulder_Separation",
+    "Front_Knee_Angle_Release", "Delivery_Reach_m", "Lateral_Flexion",
+]
+
+# Overall risk: High if any metric is High or at least this many are Medium
+medium_count_for_high = 3
+
+
+def lean_from_vertical(lateral_flexion):
+    """Trunk lean (deg) from lateral_flexion's atan2 angle, whichever way the camera's y axis points."""
+    angle = np.abs(np.asarray(lateral_flexion, dtype=float))
+    return np.minimum(angle, 180 - angle)
+
+
+def metric_values(df):
+    """Numeric values the bands are checked against, one array per rule."""
+    values = {column: df[column].to_numpy(dtype=float) for column in RULES}
+    values["Lateral_Flexion"] = lean_from_vertical(values["Lateral_Flexion"])
+    return values
+
+
+def metric_bands(df):
+    """Index into RULES[column]["bands"] for every row and numeric metric (-1 where missing)."""
+    bands = {}
+    for column, values in metric_values(df).items():
+        bounds = [b[0] for b in RULES[column]["bands"]]
+        band = np.searchsorted(bounds, values, side="right").clip(max=len(bounds) - 1)
+        bands[column] = np.where(np.isnan(values), -1, band)
+    return bands
+
+
+def score_metrics(df, bands=None):
+    """Risk level of every metric, overall risk and efficiency score (0-10) for every row.
+
+    Missing metrics get no risk and are left out of the score's average.
+    """
+    bands = metric_bands(df) if bands is None else bands
+    out = pd.DataFrame({"Delivery": df["Delivery"]} if "Delivery" in df else {}, index=df.index)
+    points = []
+    for column, values in metric_values(df).items():
+        rule = RULES[column]
+        risks = np.array([b[1] for b in rule["bands"]] + [None], dtype=object)
+        out[f"{column}_Risk"] = risks[bands[column]]  # -1 picks the trailing None
+        low, high = rule["optimal"]
+        distance = np.maximum(low - values, 0) + np.maximum(values - high, 0)
+        points.append(np.clip(1 - distance / rule["tolerance"], 0, 1))
+
+    key = [alignment_key(label) for label in df["Alignment"]]
+    out["Alignment_Risk"] = [ALIGNMENT_RULES[k][0] if k else None for k in key]
+    points.append(np.array([ALIGNMENT_RULES[k][1] if k else np.nan for k in key], dtype=float))
+
+    risks = out[[c for c in out.columns if c.endswith("_Risk")]]
+    high = (risks == "High").sum(axis=1)
+    medium = (risks == "Medium").sum(axis=1)
+    points = np.stack(points, axis=1)
+    measured = (~np.isnan(points)).sum(axis=1)
+    out["Overall_Risk"] = np.select([measured == 0, (high > 0) | (medium >= medium_count_for_high), medium > 0],
+                                    [None, "High", "Medium"], "Low")
+    out["Efficiency_Score"] = np.round(10 * np.nansum(points, axis=1) / np.where(measured, measured, np.nan), 1)
+    return out
+
+
+def alignment_key(label):
+    """ALIGNMENT_RULES key of an alignment label, e.g. "mixed (side-on/front-on)" -> "mixed" (None if unknown)."""
+    label = str(label).strip().lower()
+    return next((k for k in ("semi side-on", "side-on", "front-on", "mixed") if label.startswith(k)), None)
+
+
+def delivery_report(row, scores, bands):
+    """Markdown body for one delivery, in the section layout of the Gemini reports."""
+    lines = [
+        "## Biomechanical Analysis of Bowler's Performance\n",
+        "Rule-based assessment of each metric against its optimal range, with injury risk and an "
+        "overall efficiency score.\n",
+        "### 1. Metric-Specific Feedback and Injury Risk\n",
+        "| Metric | Value | Optimal Range | Feedback | Injury Risk Level | Reasoning |",
+        "|--------|-------|---------------|----------|-------------------|-----------|",
+    ]
+    concerns, strengths = [], []
+    for column in REPORT_ORDER:
+        if column == "Alignment":
+            lines.append(alignment_line(row, scores, concerns, strengths))
+            continue
+        rule = RULES[column]
+        band = int(bands[column])
+        if band < 0:
+            lines.append(f"| {rule['name']} | n/a | {optimal_text(rule)} | Not measured. | - | - |")
+            continue
+        _, risk, feedback_text, reason = rule["bands"][band]
+        value = lean_from_vertical(row[column]) if column == "Lateral_Flexion" else row[column]
+        shown = rule["format"].format(value=value, raw=row[column], **row)
+        lines.append(f"| {rule['name']} | {shown} | {optimal_text(rule)} | {feedback_text} | {risk} | {reason} |")
+        (concerns if risk != "Low" else strengths).append((risk, rule["name"]))
+
+    overall = scores["Overall_Risk"]
+    high = [name for risk, name in concerns if risk == "High"]
+    medium = [name for risk, name in concerns if risk == "Medium"]
+    comment = f"The overall injury risk is assessed as **{overall}**."
+    if high:
+        comment += f" High-risk areas: {', '.join(high)}; these need attention before increasing workload."
+    if medium:
+        comment += f" Areas to monitor: {', '.join(medium)}."
+    if not concerns:
+        comment += " Every measured metric is within its low-risk band."
+
+    score = scores["Efficiency_Score"]
+    good = ", ".join(name for _, name in strengths) or "none of the measured metrics"
+    lines += [
+        "\n### 2. Overall Injury Risk Comment\n",
+        comment,
+        "\n### 3. Overall Biomechanics Efficiency Score\n",
+        f"**Score: {score:g}/10**\n",
+        f"**Justification:** The score averages how close each metric is to its optimal range. "
+        f"Low-risk, efficient aspects: {good}."
+        + (f" Points are lost on {', '.join(high + medium)}." if concerns else ""),
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def alignment_line(row, scores, concerns, strengths):
+    risk = scores["Alignment_Risk"]
+    key = alignment_key(row["Alignment"])
+    if key is None:
+        return f"| Alignment | {row['Alignment']} | side-on or front-on | Unrecognised label. | - | - |"
+    _, _, feedback_text, reason = ALIGNMENT_RULES[key]
+    (concerns if risk != "Low" else strengths).append((risk, "Alignment"))
+    return f"| Alignment | {row['Alignment']} | side-on or front-on | {feedback_text} | {risk} | {reason} |"
+
+
+def optimal_text(rule):
+    low, high = rule["optimal"]
+    return f"{low:g}–{high:g}{rule['unit']}"
+
+
+@telemetry.timed("report")
+def generate_report(csv_path=CSV_PATH, markdown_path=MARKDOWN_PATH, force=False):
+    """Rule-based Markdown report for every metric row of csv_path; returns (report, scores).
+
+    Unlike the Gemini engine, a row with only some metrics is still reported:
+    its missing metrics get "n/a" cells. Rows with no metrics at all are skipped.
+    """
+    manifest = Manifest(f"{markdown_path}.manifest.json")
+    inputs_fp = {
+        "results": file_hash(csv_path), "engine": "rules", "code": code_version(sys.modules[__name__]),
+        "config": value_hash({"rules": RULES, "alignment": ALIGNMENT_RULES, "medium": medium_count_for_high}),
+    }
+    df = pd.read_csv(csv_path)
+    bands = metric_bands(df)
+    scores = score_metrics(df, bands)
+    if os.path.exists(markdown_path) and not force and not manifest.changed("inputs", inputs_fp):
+        print(f"⏭️ Metrics unchanged since last run — keeping {markdown_path}")
+        with open(markdown_path, encoding="utf-8") as f:
+            return f.read(), scores
+
+    span = telemetry.current()
+    mark = span.clock()
+    scored = np.flatnonzero(df[PROMPT_COLUMNS].notna().any(axis=1).to_numpy())  # at least one metric measured
+    rows, score_rows = df.iloc[scored].to_dict("records"), scores.iloc[scored].to_dict("records")
+    labels = df["Delivery"].to_numpy() if "Delivery" in df else [f"Delivery {n}" for n in range(1, len(df) + 1)]
+    sections = [
+        (labels[i], delivery_report(row, score_row, {column: band[i] for column, band in bands.items()}))
+        for i, row, score_row in zip(scored, rows, score_rows)
+    ]
+    if not sections:
+        raise ValueError(f"No metric rows in {csv_path}")
+    report = format_report(sections)
+    span.lap("report", mark, frames=len(sections))
+    span.set(rows=len(sections))
+
+    with open(markdown_path, "w", encoding="utf-8") as f:
+        f.write(report)
+    manifest.save(inputs=inputs_fp)
+    counts = scores["Overall_Risk"].iloc[scored].value_counts()
+    print(f"✅ Rule-based report for {len(sections)} deliveries saved to {markdown_path} "
+          f"({', '.join(f'{counts.get(r, 0)} {r}' for r in RISK_LEVELS)} risk)")
+    return report, scores
+
+
+@click.command()
+@click.option("--csv", "csv_path", default=CSV_PATH, type=click.Path(exists=True),
+              help="Metrics CSV: one delivery, or a session table with one row per delivery.")
+@click.option("--out", "markdown_path", default=MARKDOWN_PATH, help="Markdown report to write.")
+@click.option("--scores", "scores_path", default=None, help="Also write per-delivery risk levels and scores to this CSV.")
+@click.option("--force", is_flag=True, help="Rewrite the report even if the metrics are unchanged.")
+def report(csv_path, markdown_path, scores_path, force):
+    """Write an offline, rule-based biomechanics report for a metrics CSV."""
+    _, scores = generate_report(csv_path, markdown_path, force)
+    if scores_path:
+        scores.to_csv(scores_path, index=False)
+
+
+if __name__ == "__main__":
+    report()
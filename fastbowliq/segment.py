@@ -0,0 +1,135 @@
+import csv
+import os
+
+from .frame_store import FrameStore
+
+# === CONFIG ===
+video_path = "sample/hardik.mp4"
+output_csv = "segments/hardik.csv"
+review_mode = False  # True: start from the labels already in output_csv (e.g. from autosegment.py) and correct them
+
+# === Labels and key mapping ===
+labels = ["jump", "bfc", "ffc", "release", "followthrough"]
+label_keys = {ord(str(i + 1)): labels[i] for i in range(len(labels) - 1)}  # 1–4
+single_frame_labels = {"bfc", "ffc", "release"}
+step_keys = {ord('b'): -1, ord('['): -10, ord(']'): 10}  # Scrub without labeling
+
+
+def screen_size():
+    """(width, height) of the primary screen."""
+    import tkinter as tk
+
+    root = tk.Tk()
+    width, height = root.winfo_screenwidth(), root.winfo_screenheight()
+    root.destroy()
+    return width, height
+
+
+def label_video(video_path=video_path, output_csv=output_csv, review_mode=review_mode):
+    """Step through video_path frame by frame and write phase labels to output_csv."""
+    import cv2
+
+    os.makedirs(os.path.dirname(output_csv), exist_ok=True)
+    screen_width, screen_height = screen_size()
+    frame_labels = {}
+
+    if review_mode and os.path.exists(output_csv):
+        with open(output_csv, newline="") as f:
+            frame_labels = {int(r["frame"]): r["label"] for r in csv.DictReader(f)}
+        print(f"🔁 Reviewing {len(frame_labels)} existing labels from {output_csv}")
+
+    print("\n========== Labeling Instructions ==========")
+    for i, label in enumerate(labels[:-1]):
+        print(f" Press {i + 1} → label '{label}'")
+    print(" After 'release', all remaining frames will be labeled as 'followthrough'")
+    print(" Press SPACE to move to next frame without labeling")
+    print(" Press 'b' to step back one frame, '[' / ']' to jump 10 frames back / forward")
+    if review_mode:
+        print(" Press 'x' to clear the label on this frame (SPACE keeps it)")
+    print(" Press 'q' to quit early\n")
+
+    # === Video processing ===
+    # Frames come from the decode-once cache, so stepping back or jumping is instant
+    store = FrameStore(video_path)
+    total_frames = len(store)
+    frame_id = 0
+
+    # Size the window to fit the screen once; the window scales the cached frames
+    w, h = store.size
+    scale = min((screen_width - 100) / w, (screen_height - 100) / h)  # leave margin
+    cv2.namedWindow("Manual Labeler", cv2.WINDOW_NORMAL)
+    cv2.resizeWindow("Manual Labeler", int(w * scale), int(h * scale))
+
+    while frame_id < total_frames:
+        try:
+            frame_disp = store[frame_id].copy()
+        except IndexError:  # header frame count overshot the decodable frames
+            break
+        cv2.putText(frame_disp, f"Frame: {frame_id}", (20, 35),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 255), 2)
+        if frame_id in frame_labels:
+            cv2.putText(frame_disp, f"Label: {frame_labels[frame_id]}", (20, 70),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+        cv2.imshow("Manual Labeler", frame_disp)
+
+        key = cv2.waitKey(0)
+
+        if key == ord('q'):
+            print("❌ Quit manually.")
+            break
+
+        elif key in label_keys:
+            current_label = label_keys[key]
+
+            if current_label in single_frame_labels:
+                previous = [fid for fid, lab in frame_labels.items() if lab == current_label]
+                if not previous or review_mode:
+                    for fid in previous:
+                        del frame_labels[fid]
+                    frame_labels[frame_id] = current_label
+                    print(f"✅ Recorded: {current_label} at frame {frame_id}")
+                else:
+                    print(f"⚠️ {current_label} already recorded")
+
+                if current_label == "release":
+                    for fid in [fid for fid, lab in frame_labels.items() if lab == "followthrough"]:
+                        del frame_labels[fid]
+                    for fid in range(frame_id + 1, total_frames):
+                        frame_labels[fid] = "followthrough"
+                    print(f"🟩 Auto-labeled followthrough from frame {frame_id + 1}")
+                    break
+
+            else:
+                frame_labels[frame_id] = current_label
+                print(f"✅ Recorded: {current_label} at frame {frame_id}")
+
+            frame_id += 1
+
+        elif key == 32:  # Space bar
+            frame_id += 1
+
+        elif key in step_keys:
+            frame_id = min(max(frame_id + step_keys[key], 0), total_frames - 1)
+
+        elif review_mode and key == ord('x'):
+            if frame_labels.pop(frame_id, None):
+                print(f"🧹 Cleared label at frame {frame_id}")
+            frame_id += 1
+
+        else:
+            print("⏭️ Invalid key — use 1–4, SPACE to skip, b/[/] to scrub, or 'q' to quit")
+
+    cv2.destroyAllWindows()
+
+    # === Save CSV ===
+    with open(output_csv, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["frame", "label"])
+        writer.writerows(sorted(frame_labels.items()))
+
+    print(f"\n📁 Labels saved to: {output_csv}")
+    return frame_labels
+
+
+if __name__ == "__main__":
+    label_video()
@@ -0,0 +1,217 @@
+import json
+import logging
+import queue
+import threading
+import time
+import traceback
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import click
+import pandas as pd
+
+from . import batch
+
+# === Local analysis service ===
+# Keeps CoMotion and the SMPL skeleton loaded in one long-running process and
+# runs track -> segment -> keypoints -> analysis for queued videos.
+#
+#   POST /jobs                  {"video": "path/on/server.mp4", "arm": "right"}
+#   POST /jobs?name=clip.mp4    raw video bytes as the body (upload)
+#   GET  /jobs                  all jobs
+#   GET  /jobs/<id>             status of one job, with its metrics once done
+
+JOB_STAGES = ("track", "segment", "keypoints", "analysis")
+MAX_UPLOAD_BYTES = 2 << 30
+ARMS = ("right", "left")
+
+
+class JobQueue:
+    """Jobs in memory plus worker threads that run them.
+
+    CoMotion keeps its tracker state on the model, so the track stage holds
+    a lock around the single resident model; the CPU stages of other jobs
+    keep running meanwhile.
+    """
+
+    def __init__(self, out_root, workers=2):
+        self.out_root = Path(out_root)
+        self.jobs = {}
+        self.pending = queue.Queue()
+        self.lock = threading.Lock()
+        self.device_lock = threading.Lock()
+        self.threads = [threading.Thread(target=self._worker, daemon=True) for _ in range(workers)]
+
+    def warm_up(self):
+        """Load the tracking model and the SMPL skeleton before accepting jobs."""
+        from . import kinematics
+
+        t0 = time.perf_counter()
+        batch._tracking_model()
+        kinematics.load_skeleton()
+        logging.info(f"Models loaded in {time.perf_counter() - t0:.1f}s")
+
+    def start(self):
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, video, arm="right"):
+        job_id = uuid.uuid4().hex[:12]
+        delivery = {"name": job_id, "video": str(video), "arm": arm, "paths": batch.delivery_paths(self.out_root, job_id)}
+        Path(delivery["paths"]["root"]).mkdir(parents=True, exist_ok=True)
+        with self.lock:
+            self.jobs[job_id] = {
+                "id": job_id, "video": str(video), "arm": arm, "status": "queued", "stage": None,
+                "submitted": time.time(), "started": None, "finished": None, "seconds": {},
+                "error": None, "results": None, "delivery": delivery,
+            }
+        self.pending.put(job_id)
+        logging.info(f"Queued {job_id}: {video}")
+        return self.status(job_id)
+
+    def upload_path(self, name):
+        suffix = Path(name).suffix.lower() if name else ""
+        uploads = self.out_root / "uploads"
+        uploads.mkdir(parents=True, exist_ok=True)
+        return uploads / f"{uuid.uuid4().hex[:12]}{suffix if suffix in batch.VIDEO_SUFFIXES else '.mp4'}"
+
+    def status(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            view = {k: v for k, v in job.items() if k != "delivery"}
+            view["queue_position"] = (sum(1 for j in self.jobs.values() if j["status"] == "queued"
+                                          and j["submitted"] < job["submitted"])
+                                      if job["status"] == "queued" else None)
+            return view
+
+    def all_status(self):
+        with self.lock:
+            ids = list(self.jobs)
+        return [self.status(i) for i in ids]
+
+    def _update(self, job_id, **fields):
+        with self.lock:
+            self.jobs[job_id].update(fields)
+
+    def _worker(self):
+        while True:
+            job_id = self.pending.get()
+            delivery = self.jobs[job_id]["delivery"]
+            self._update(job_id, status="running", started=time.time())
+            try:
+                for stage in JOB_STAGES:
+                    self._update(job_id, stage=stage)
+                    if stage == "track":
+                        with self.device_lock:
+                            seconds = batch.run_stage(stage, delivery)
+                    else:
+                        seconds = batch.run_stage(stage, delivery)
+                    with self.lock:
+                        self.jobs[job_id]["seconds"][stage] = seconds
+                results = pd.read_csv(delivery["paths"]["results"]).iloc[0].to_dict()
+                self._update(job_id, status="done", stage=None, finished=time.time(), results=results)
+                logging.info(f"Finished {job_id}")
+            except Exception:
+                self._update(job_id, status="failed", finished=time.time(), error=traceback.format_exc())
+                logging.error(f"Job {job_id} failed\n{traceback.format_exc()}")
+
+
+def make_handler(jobs):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, code, body):
+            data = json.dumps(body, default=str, indent=2).encode()
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            parts = [p for p in urlparse(self.path).path.split("/") if p]
+            if parts == ["jobs"]:
+                return self._send(200, jobs.all_status())
+            if len(parts) == 2 and parts[0] == "jobs":
+                job = jobs.status(parts[1])
+                return self._send(200, job) if job else self._send(404, {"error": "unknown job"})
+            self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            if url.path.rstrip("/") != "/jobs":
+                return self._send(404, {"error": "not found"})
+            length = int(self.headers.get("Content-Length") or 0)
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+            if self.headers.get("Content-Type", "").startswith("application/json"):
+                try:
+                    request = json.loads(self.rfile.read(length) or b"{}")
+                except json.JSONDecodeError as e:
+                    return self._send(400, {"error": f"invalid JSON: {e}"})
+                if not isinstance(request, dict):
+                    return self._send(400, {"error": "expected a JSON object"})
+                video, arm = request.get("video"), request.get("arm", "right")
+                if arm not in ARMS:
+                    return self._send(400, {"error": f"arm must be one of {', '.join(ARMS)}, got {arm!r}"})
+                if not isinstance(video, str) or not Path(video).is_file():
+                    return self._send(400, {"error": f"video not found: {video}"})
+                return self._send(202, jobs.submit(video, arm))
+
+            # Anything else is an upload of the video bytes
+            arm = query.get("arm", "right")
+            if arm not in ARMS:
+                return self._send(400, {"error": f"arm must be one of {', '.join(ARMS)}, got {arm!r}"})
+            if not 0 < length <= MAX_UPLOAD_BYTES:
+                return self._send(400, {"error": "empty or oversized upload"})
+            path = jobs.upload_path(query.get("name"))
+            remaining = length
+            with open(path, "wb") as f:
+                while remaining:
+                    block = self.rfile.read(min(remaining, 1 << 20))
+                    if not block:
+                        break
+                    f.write(block)
+                    remaining -= len(block)
+            if remaining:
+                path.unlink()
+                return self._send(400, {"error": "upload truncated"})
+            self._send(202, jobs.submit(path, arm))
+
+        def log_message(self, fmt, *args):
+            logging.debug(fmt % args)
+
+    return Handler
+
+
+@click.command()
+@click.option("--host", default="127.0.0.1", help="Interface to listen on.")
+@click.option("--port", default=8765, type=int, help="Port to listen on.")
+@click.option("--workers", default=2, type=int, help="Jobs processed concurrently.")
+@click.option("--out", "out_root", default="service_output", help="Root folder for per-job outputs.")
+@click.option("--no-warm", is_flag=True, help="Load models on the first job instead of at startup.")
+def serve(host, port, workers, out_root, no_warm):
+    """Serve the tracking -> analysis pipeline over HTTP with warm models."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(funcName)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    jobs = JobQueue(out_root, workers)
+    if not no_warm:
+        jobs.warm_up()
+    jobs.start()
+    server = ThreadingHTTPServer((host, port), make_handler(jobs))
+    print(f"✅ Listening on http://{host}:{port} ({workers} workers) — POST /jobs to submit")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    serve()
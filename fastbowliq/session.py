@@ -0,0 +1,195 @@
+import concurrent.futures as cf
+import logging
+import multiprocessing
+import traceback
+from pathlib import Path
+
+import click
+import numpy as np
+import pandas as pd
+
+from . import autosegment
+from . import keypoints
+from . import kinematics
+from .batch import delivery_paths
+
+# === Net-session mode ===
+# One long recording with many deliveries from several bowlers. Every track
+# is scanned for releases (bowling wrist well above its shoulder after a
+# run-up); each release becomes a window of frames that goes through the
+# normal per-delivery pipeline on its own, in a process pool.
+
+release_height = 0.35      # Min wrist-above-shoulder height (m) for a release
+min_runup = 1.5            # Min horizontal travel (m) of the bowler before release
+runup_frames = 120         # Frames before release searched for the run-up
+pre_release_frames = 2 * autosegment.max_stride_frames  # BFC can be up to two stride windows before release
+post_release_frames = 45   # Follow-through frames kept after release
+min_gap_frames = 150       # Two releases of one track closer than this are the same delivery
+
+
+# === Delivery windows ===
+def arm_height(joints, plane, arm):
+    wrist, shoulder = (autosegment.R_WRIST, autosegment.R_SHOULDER) if arm == "right" else \
+        (autosegment.L_WRIST, autosegment.L_SHOULDER)
+    return autosegment.smooth(
+        autosegment.height_above_ground(joints[:, wrist], plane)
+        - autosegment.height_above_ground(joints[:, shoulder], plane)
+    )
+
+def release_peaks(signal, threshold=release_height, min_gap=min_gap_frames):
+    """Indices of the highest samples above threshold, at least min_gap apart (greedy suppression)."""
+    peaks = []
+    for i in np.argsort(signal)[::-1]:
+        if signal[i] < threshold:
+            break
+        if all(abs(i - p) >= min_gap for p in peaks):
+            peaks.append(int(i))
+    return sorted(peaks)
+
+def detect_windows(data, skeleton, arm="auto"):
+    """Delivery windows of every track in a session's preds.
+
+    Returns dicts with track_id, arm, release and the [start, end] frame
+    range, sorted by release frame.
+    """
+    import torch
+
+    windows = []
+    for track_id in np.unique(torch.as_tensor(data["id"]).numpy()):
+        rows = keypoints.track_rows(data, track_id)
+        if len(rows) < autosegment.smooth_window:
+            continue
+        joints, frames, _ = kinematics.extract_joints(skeleton, keypoints.subset_rows(data, rows))
+        joints = joints.astype(np.float64)
+        plane = autosegment.fit_ground_plane(joints)
+        trans = torch.as_tensor(data["trans"]).numpy()[rows]
+
+        arms = ["right", "left"] if arm == "auto" else [arm]
+        heights = {a: arm_height(joints, plane, a) for a in arms}
+        candidates = [(i, a) for a in arms for i in release_peaks(heights[a], release_height, min_gap_frames)]
+        # A bowler's non-bowling arm can also go up: keep the higher arm where peaks collide
+        candidates.sort(key=lambda c: heights[c[1]][c[0]], reverse=True)
+        kept = []
+        for i, a in candidates:
+            if any(abs(frames[i] - frames[j]) < min_gap_frames for j, _ in kept):
+                continue
+            before = (frames >= frames[i] - runup_frames) & (frames <= frames[i])
+            travel = np.linalg.norm(np.ptp(trans[before][:, [0, 2]], axis=0))
+            if travel >= min_runup:
+                kept.append((i, a))
+
+        for i, a in kept:
+            windows.append({
+                "track_id": int(track_id),
+                "arm": a,
+                "release": int(frames[i]),
+                "start": int(max(frames[0], frames[i] - pre_release_frames)),
+                "end": int(min(frames[-1], frames[i] + post_release_frames)),
+            })
+    return sorted(windows, key=lambda w: w["release"])
+
+def window_preds(data, window):
+    """The window's track and frames as a standalone preds dict (session frame numbers kept)."""
+    import torch
+
+    rows = keypoints.track_rows(data, window["track_id"])
+    frames = torch.as_tensor(data["frame_idx"]).numpy()[rows]
+    rows = rows[(frames >= window["start"]) & (frames <= window["end"])]
+    return keypoints.subset_rows(data, rows)
+
+def cut_clip(video, start, end, output):
+    """Copy source frames [start, end] of video into its own clip."""
+    import cv2
+
+    cap = cv2.VideoCapture(str(video))
+    if not cap.isOpened():
+        raise FileNotFoundError(f"Cannot open {video}")
+    cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+    size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    out = cv2.VideoWriter(str(output), cv2.VideoWriter_fourcc(*"mp4v"), cap.get(cv2.CAP_PROP_FPS), size)
+    for _ in range(end - start + 1):
+        ret, frame = cap.read()
+        if not ret:
+            break
+        out.write(frame)
+    cap.release()
+    out.release()
+
+
+# === Per-delivery pipeline (runs in a worker process) ===
+def process_window(window, paths, video=None):
+    """Segment, extract, analyse and (with a video) overlay one delivery window."""
+    from . import analysis
+    from . import overlay
+
+    autosegment.segment_file(paths["pt"], paths["segments"], window["arm"])
+    keypoints.extract_keypoints(paths["pt"], paths["segments"], paths["store"])
+    row = analysis.analyze(paths["store"], paths["root"]).iloc[0].to_dict()
+    if video:
+        clip = str(Path(paths["root"]) / "clip.mp4")
+        cut_clip(video, window["start"], window["end"], clip)
+        overlay.render_overlay(clip, paths["overlay"], paths["results"], frame_offset=window["start"])
+    return row
+
+
+def run_session(pt_file, out_root, video=None, arm="auto", workers=4):
+    """Split a session into delivery windows and analyse them concurrently; returns the session table."""
+    import torch
+
+    data = torch.load(pt_file, map_location="cpu")
+    windows = detect_windows(data, kinematics.load_skeleton(), arm)
+    logging.info(f"Found {len(windows)} deliveries in {pt_file}")
+
+    rows, futures = [], {}
+    with cf.ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        for n, window in enumerate(windows, start=1):
+            name = f"delivery_{n:03d}"
+            paths = delivery_paths(out_root, name)
+            Path(paths["root"]).mkdir(parents=True, exist_ok=True)
+            torch.save(window_preds(data, window), paths["pt"])
+            futures[pool.submit(process_window, window, paths, video)] = (name, window)
+
+        for future in cf.as_completed(futures):
+            name, window = futures[future]
+            row = {"Delivery": name, "Track_ID": window["track_id"], "Arm": window["arm"],
+                   "Start_Frame": window["start"], "End_Frame": window["end"]}
+            try:
+                row.update(future.result())
+                row["Status"] = "done"
+                logging.info(f"{name}: track {window['track_id']}, frames {window['start']}-{window['end']}")
+            except Exception:
+                row["Status"] = "failed"
+                logging.error(f"{name} failed\n{traceback.format_exc()}")
+            rows.append(row)
+
+    table = pd.DataFrame(rows).sort_values("Start_Frame", kind="stable") if rows else pd.DataFrame()
+    Path(out_root).mkdir(parents=True, exist_ok=True)
+    table.to_csv(Path(out_root) / "session_results.csv", index=False)
+    return table
+
+
+@click.command()
+@click.argument("pt_file", type=click.Path(exists=True))
+@click.option("--video", default=None, type=click.Path(exists=True), help="Session video, for per-delivery overlay clips.")
+@click.option("--out", "out_root", default="session_output", help="Folder for per-delivery outputs.")
+@click.option("--arm", default="auto", type=click.Choice(["auto", "right", "left"]), help="Bowling arm.")
+@click.option("--workers", default=4, type=int, help="Deliveries processed in parallel.")
+@click.option("--feedback", is_flag=True, help="Also generate Gemini feedback for every delivery (one report).")
+def session(pt_file, video, out_root, arm, workers, feedback):
+    """Analyse every delivery in the tracked output of a long nets session."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(funcName)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    table = run_session(pt_file, out_root, video, arm, workers)
+    done = int((table["Status"] == "done").sum()) if len(table) else 0
+    print(f"✅ {done}/{len(table)} deliveries analysed — table: {Path(out_root) / 'session_results.csv'}")
+    if feedback and done:
+        from . import feedback as feedback_stage
+
+        feedback_stage.generate_feedback(Path(out_root) / "session_results.csv", Path(out_root) / "session_feedback.md")
+
+
+if __name__ == "__main__":
+    session()
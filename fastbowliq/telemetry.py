@@ -0,0 +1,225 @@
+import cProfile
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# === Stage telemetry ===
+# Every instrumented stage appends one JSON line (wall/CPU seconds, peak RSS,
+# frames and frames/sec) to FASTBOWLIQ_TELEMETRY, followed by one line per
+# sub-step (decode, inference, SMPL forward, metrics, encode, ...). With
+# FASTBOWLIQ_PROFILE set, each top-level stage also runs under cProfile and
+# dumps a .prof file there (pstats format: snakeviz, pstats, flameprof). Each
+# record carries its pid, so a `py-spy record --pid` capture can be aligned
+# with the stages.
+# Both are read from the environment so process-pool workers inherit them;
+# when neither is set every hook returns immediately.
+telemetry_path = os.environ.get("FASTBOWLIQ_TELEMETRY") or None
+profile_dir = os.environ.get("FASTBOWLIQ_PROFILE") or None
+
+_write_lock = threading.Lock()
+_local = threading.local()
+_profile_seq = 0
+
+
+def configure(path=None, profile=None):
+    """Turn telemetry (JSONL path) and cProfile dumps (directory) on or off for this process and its children."""
+    global telemetry_path, profile_dir
+    telemetry_path, profile_dir = path or None, profile or None
+    for var, value in (("FASTBOWLIQ_TELEMETRY", telemetry_path), ("FASTBOWLIQ_PROFILE", profile_dir)):
+        if value:
+            os.environ[var] = str(value)
+        else:
+            os.environ.pop(var, None)
+
+
+def enabled():
+    return telemetry_path is not None or profile_dir is not None
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far (MB), or None where unsupported."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def write(record):
+    if telemetry_path is None:
+        return
+    line = json.dumps(record, default=str) + "\n"
+    with _write_lock, open(telemetry_path, "a") as f:
+        f.write(line)
+
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+class Span:
+    """One running stage: collects frames and sub-step timings until it ends."""
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = dict(fields)
+        self.frames = 0
+        self.steps = defaultdict(lambda: [0.0, 0.0, 0])  # name -> [wall, cpu, frames]
+        self.profiler = None
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    def add(self, frames=1):
+        self.frames += frames
+
+    def step(self, name, seconds, frames=0, cpu_seconds=0.0):
+        """Account already-measured time to a sub-step."""
+        totals = self.steps[name]
+        totals[0] += seconds
+        totals[1] += cpu_seconds
+        totals[2] += frames
+
+    def clock(self):
+        return time.perf_counter(), time.thread_time()
+
+    def lap(self, name, since, frames=1):
+        """Charge the time since `since` (from clock() or a previous lap) to a sub-step; returns a new mark."""
+        now = self.clock()
+        self.step(name, now[0] - since[0], frames, now[1] - since[1])
+        return now
+
+    def __enter__(self):
+        stack = _stack()
+        self.parent = stack[-1].name if stack else None
+        if profile_dir and not stack:
+            self.profiler = cProfile.Profile()
+            try:
+                self.profiler.enable()
+            except ValueError:  # another profiler is active (e.g. a stage in a sibling thread)
+                self.profiler = None
+        stack.append(self)
+        self.started = time.time()
+        self.wall0, self.cpu0 = time.perf_counter(), time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global _profile_seq
+        wall, cpu = time.perf_counter() - self.wall0, time.process_time() - self.cpu0
+        _stack().pop()
+        record = {
+            "ts": round(self.started, 3), "stage": self.name, "parent": self.parent, "pid": os.getpid(),
+            "wall_s": round(wall, 4), "cpu_s": round(cpu, 4), "peak_rss_mb": peak_rss_mb(),
+            "frames": self.frames, "fps": round(self.frames / wall, 2) if self.frames and wall > 0 else None,
+            "ok": exc_type is None, **self.fields,
+        }
+        if self.profiler:
+            self.profiler.disable()
+            os.makedirs(profile_dir, exist_ok=True)
+            _profile_seq += 1
+            record["profile"] = os.path.join(profile_dir, f"{self.name}-{os.getpid()}-{_profile_seq}.prof")
+            self.profiler.dump_stats(record["profile"])
+        write(record)
+        for name, (seconds, cpu_seconds, frames) in self.steps.items():
+            write({
+                "ts": round(self.started, 3), "stage": f"{self.name}.{name}", "parent": self.name,
+                "pid": os.getpid(), "wall_s": round(seconds, 4), "cpu_s": round(cpu_seconds, 4) or None,
+                "frames": frames, "fps": round(frames / seconds, 2) if frames and seconds > 0 else None,
+                **self.fields,
+            })
+        return False
+
+
+class _NullSpan:
+    """Stand-in returned while telemetry is off: every hook is a no-op."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **fields):
+        pass
+
+    def add(self, frames=1):
+        pass
+
+    def step(self, name, seconds, frames=0, cpu_seconds=0.0):
+        pass
+
+    def clock(self):
+        return None
+
+    def lap(self, name, since, frames=1):
+        return None
+
+
+NULL_SPAN = _NullSpan()
+
+
+def stage(name, **fields):
+    """Context manager recording one stage: `with telemetry.stage("overlay", video=path) as span:`."""
+    return Span(name, fields) if enabled() else NULL_SPAN
+
+
+def current():
+    """The innermost running span on this thread (a no-op span when there is none)."""
+    stack = _stack() if enabled() else None
+    return stack[-1] if stack else NULL_SPAN
+
+
+def timed(name):
+    """Decorator form of stage(); the function can reach its span through current()."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled():
+                return fn(*args, **kwargs)
+            with Span(name, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# === Summary of a telemetry file ===
+def summarize(path):
+    """Per-stage totals of a telemetry JSONL file: runs, wall/CPU seconds, frames, fps and worst peak RSS."""
+    totals = {}
+    with open(path) as f:
+        for line in f:
+            record = json.loads(line)
+            t = totals.setdefault(record["stage"], {"runs": 0, "wall_s": 0.0, "cpu_s": 0.0, "frames": 0,
+                                                    "peak_rss_mb": None})
+            t["runs"] += 1
+            t["wall_s"] += record["wall_s"]
+            t["cpu_s"] += record.get("cpu_s") or 0.0
+            t["frames"] += record.get("frames") or 0
+            if record.get("peak_rss_mb") is not None:
+                t["peak_rss_mb"] = max(t["peak_rss_mb"] or 0.0, record["peak_rss_mb"])
+    for t in totals.values():
+        t["fps"] = t["frames"] / t["wall_s"] if t["frames"] and t["wall_s"] > 0 else None
+    return totals
+
+
+def main():
+    """Print a per-stage summary: python -m fastbowliq.telemetry telemetry.jsonl"""
+    for name, t in sorted(summarize(sys.argv[1]).items()):
+        fps = f"{t['fps']:9.2f} fps" if t["fps"] else " " * 13
+        rss = f"{t['peak_rss_mb']:8.0f} MB" if t["peak_rss_mb"] is not None else ""
+        print(f"📍 {name:<28} x{t['runs']:<4} {t['wall_s']:9.2f}s wall {t['cpu_s']:9.2f}s cpu "
+              f"{t['frames']:8d} frames {fps} {rss}")
+
+
+if __name__ == "__main__":
+    main()
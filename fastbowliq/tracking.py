@@ -0,0 +1,597 @@
+import contextlib
+import copy
+import json
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import click
+import numpy as np
+import torch
+import torch.nn.functional as F
+from torch import nn
+from tqdm import tqdm
+
+from src.comotion_demo.models import comotion
+from src.comotion_demo.utils import dataloading
+from src.comotion_demo.utils import track as track_utils
+
+from . import keyframes
+from . import pipeline
+from . import telemetry
+from . import tracking_cache
+
+# ====== HARDCODED CONFIG ======
+input_path = Path("sample/hardik.mp4")             # path to input video
+output_dir = Path("results/")                 # output directory
+start_frame = 0
+num_frames = 1_000_000_000
+frameskip = 1
+device = torch.device("cuda:0" if torch.cuda.is_available() else "cpu")
+use_mps = torch.mps.is_available()
+pipelined = True          # overlap decode, inference and device-to-host copies on separate threads
+prefetch_depth = 8        # decoded frames buffered ahead of inference
+writeback_depth = 8       # inference outputs buffered ahead of the writer
+stream_chunk_frames = 1024  # >0: clean up and flush tracks to disk every N frames (constant memory)
+model_tag = "comotion-v1"   # bump when weights change; part of the cache key
+resume = True               # continue from the last checkpointed chunk of an interrupted run
+roi_mode = False            # crop around the bowler's track and infer at a fixed working resolution
+roi_long_side = 1280        # working resolution long side (frames are never upsampled past native)
+roi_margin = 0.25           # extra box size on each side, as a fraction of the projected height
+roi_height_prior = 1.9      # metres; sizes the projected bounding box from the track depth
+roi_warmup_frames = 15      # full-frame frames used to pick the track to follow (largest run-up)
+adaptive_sampling = False   # sparse inference outside the delivery window, interpolated (keyframes.py)
+
+# CPU performance mode (only applies when device is the CPU; compare modes with benchmarks/cpu_modes.py)
+cpu_mode = "fp32"           # "fp32", "int8" (dynamic-quantized Linear layers) or "bf16" (autocast)
+cpu_compile = False         # torch.compile the model's forward
+intra_op_threads = 0        # torch.set_num_threads; 0 = torch default
+inter_op_threads = 0        # torch.set_num_interop_threads; 0 = torch default
+CPU_MODES = ("fp32", "int8", "bf16")
+
+cache_path = output_dir / f"{input_path.stem}.pt"
+cache_root = output_dir / "cache"
+
+
+class StageTimer:
+    """Accumulated busy seconds and item counts per pipeline stage (thread-safe)."""
+
+    def __init__(self):
+        self.seconds = defaultdict(float)
+        self.counts = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def add(self, stage, seconds, count=1):
+        with self._lock:
+            self.seconds[stage] += seconds
+            self.counts[stage] += count
+
+    def report(self, wall_seconds, span=telemetry.NULL_SPAN):
+        frames = max(self.counts.values(), default=0)
+        span.add(frames)
+        logging.info(f"Tracked {frames} frames in {wall_seconds:.1f}s ({frames / max(wall_seconds, 1e-9):.2f} fps)")
+        for stage, seconds in self.seconds.items():
+            fps = self.counts[stage] / max(seconds, 1e-9)
+            logging.info(f"  {stage:<10} {seconds:8.2f}s busy  {fps:8.2f} fps")
+            span.step(stage, seconds, self.counts[stage])
+
+
+def _timed_frames(frames, timer):
+    """Pass frames through, charging the time spent producing each one to "decode"."""
+    t0 = time.perf_counter()
+    for item in frames:
+        timer.add("decode", time.perf_counter() - t0)
+        yield item
+        t0 = time.perf_counter()
+
+
+def _writeback_worker(in_queue, sink, failed, errors):
+    """Hand inference outputs to the sink off the inference thread.
+
+    A failure (cleanup, flush, store append) is kept in `errors` and `failed`
+    is set, so the inference thread raises it instead of blocking on a full queue.
+    """
+    try:
+        while True:
+            item = in_queue.get()
+            if item is pipeline.DONE:
+                return
+            sink.add(*item)
+    except Exception as e:
+        errors.append(e)
+        failed.set()
+
+
+class BowlerRoi:
+    """Per-frame crop around the bowler's track, resized to a fixed working resolution.
+
+    The box comes from the previous frame's tracks: the followed track's
+    root is projected with the full-frame K and sized by roi_height_prior.
+    Cropping and resizing only change the intrinsics, so K is scaled and
+    shifted to match and every output stays in the original camera frame.
+    Without a followed track the whole frame is letterboxed to the same
+    working resolution, which keeps the resolution passed to init_tracks valid.
+    """
+
+    def __init__(self, long_side=roi_long_side, margin=roi_margin, height_prior=roi_height_prior,
+                 warmup_frames=roi_warmup_frames):
+        self.long_side = long_side
+        self.margin = margin
+        self.height_prior = height_prior
+        self.warmup_frames = warmup_frames
+        self.work_res = None
+        self.track_id = None
+        self.box = None      # (x0, y0, x1, y1) in full-frame pixels
+        self.seen = {}       # track id -> (first trans, last trans) while choosing a track
+        self.warmup = 0
+        self.roi_frames = 0
+        self.full_frames = 0
+
+    def crop(self, image, K):
+        """(image, K) cropped to the current box at the working resolution."""
+        h, w = image.shape[-2:]
+        if self.work_res is None:
+            scale = min(1.0, self.long_side / max(h, w))
+            self.work_res = (int(round(h * scale)), int(round(w * scale)))
+        out_h, out_w = self.work_res
+
+        x0, y0, x1, y1 = self.box if self.box is not None else (0, 0, w, h)
+        if self.box is not None:
+            self.roi_frames += 1
+        else:
+            self.full_frames += 1
+
+        # Grow to the working aspect ratio, never smaller than the working size
+        box_w = max(x1 - x0, (y1 - y0) * out_w / out_h, out_w)
+        box_h = box_w * out_h / out_w
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        x0, y0 = cx - box_w / 2, cy - box_h / 2
+        # Slide the box back inside the frame where it fits
+        if box_w <= w:
+            x0 = min(max(x0, 0), w - box_w)
+        if box_h <= h:
+            y0 = min(max(y0, 0), h - box_h)
+        x0, y0 = int(np.floor(x0)), int(np.floor(y0))
+        scale = out_w / box_w
+
+        # Resize only the part of the box inside the frame; the rest stays black
+        ix0, iy0 = max(x0, 0), max(y0, 0)
+        ix1, iy1 = min(int(np.ceil(x0 + box_w)), w), min(int(np.ceil(y0 + box_h)), h)
+        ox0, oy0 = round((ix0 - x0) * scale), round((iy0 - y0) * scale)
+        ox1, oy1 = min(round((ix1 - x0) * scale), out_w), min(round((iy1 - y0) * scale), out_h)
+
+        region = image[..., iy0:iy1, ix0:ix1]
+        flat = region.reshape(-1, *region.shape[-3:]).float()
+        resized = F.interpolate(flat, size=(oy1 - oy0, ox1 - ox0), mode="bilinear",
+                                align_corners=False, antialias=True)
+        if not image.dtype.is_floating_point:
+            resized = resized.round().clamp(0, 255)
+        out = torch.zeros(*image.shape[:-2], out_h, out_w, dtype=image.dtype, device=image.device)
+        out[..., oy0:oy1, ox0:ox1] = resized.reshape(*region.shape[:-2], oy1 - oy0, ox1 - ox0).to(image.dtype)
+
+        K_roi = K.clone()
+        K_roi[..., :2, :] = K[..., :2, :] * scale
+        K_roi[..., 0, 2] -= x0 * scale
+        K_roi[..., 1, 2] -= y0 * scale
+        return out, K_roi
+
+    def update(self, track, K, image_res):
+        """Move the box to where the followed track is, choosing one after the warm-up."""
+        ids = track.id.detach().reshape(-1).long().cpu().numpy()
+        trans = track.trans.detach().reshape(-1, 3).float().cpu().numpy()
+        valid = np.isfinite(trans).all(axis=1) & (trans[:, 2] > 0.1) & (ids >= 0)
+        current = {int(i): t for i, t in zip(ids[valid], trans[valid])}
+
+        if self.track_id is None:
+            for i, t in current.items():
+                self.seen[i] = (self.seen.get(i, (t, t))[0], t)
+            self.warmup += 1
+            if self.warmup < self.warmup_frames or not current:
+                return
+            # The bowler is the visible track that has run furthest (the run-up)
+            run_up = {i: np.linalg.norm((self.seen[i][1] - self.seen[i][0])[[0, 2]]) for i in current}
+            self.track_id = max(run_up, key=run_up.get)
+            logging.info(f"ROI following track {self.track_id}")
+
+        box = self._project(current.get(self.track_id), K, image_res)
+        if box is None:
+            logging.info(f"ROI lost track {self.track_id}, back to full frame")
+            self.track_id, self.box, self.seen, self.warmup = None, None, {}, 0
+            return
+        self.box = box
+
+    def _project(self, trans, K, image_res):
+        if trans is None:
+            return None
+        K = K.detach().reshape(-1, *K.shape[-2:])[0].double().cpu().numpy()
+        x, y, z = trans
+        u = K[0, 0] * x / z + K[0, 2]
+        v = K[1, 1] * y / z + K[1, 2]
+        half = 0.5 * (1 + 2 * self.margin) * K[1, 1] * self.height_prior / z
+        h, w = image_res
+        if u + half <= 0 or v + half <= 0 or u - half >= w or v - half >= h:
+            return None
+        return (u - half, v - half, u + half, v + half)
+
+
+def cleanup_to_preds(detections, tracks, K, smpl_decoder, frame_offset=0):
+    """Run CoMotion track cleanup over per-frame outputs and gather the kept rows.
+
+    Returns the `preds` dict (id, pose, trans, betas, frame_idx) or None when
+    no track survives. frame_offset shifts frame_idx for streamed chunks.
+    """
+    detections = {k: [d[k] for d in detections] for k in detections[0].keys()}
+    tracks = torch.stack(tracks, 1)
+    tracks = {k: getattr(tracks, k) for k in ["id", "pose", "trans", "betas"]}
+
+    track_ref = track_utils.cleanup_tracks(
+        {"detections": detections, "tracks": tracks},
+        K,
+        smpl_decoder,
+        min_matched_frames=1,
+    )
+    if not track_ref:
+        return None
+
+    frame_idxs, track_idxs = track_utils.convert_to_idxs(
+        track_ref, tracks["id"][0].squeeze(-1).long()
+    )
+    preds = {k: v[0, frame_idxs, track_idxs] for k, v in tracks.items()}
+    # bf16 autocast outputs are stored as fp32 (numpy has no bfloat16)
+    preds = {k: v.float() if v.is_floating_point() else v for k, v in preds.items()}
+    preds["id"] = preds["id"].squeeze(-1).long()
+    preds["frame_idx"] = frame_idxs + frame_offset
+    return preds
+
+
+class PredsStore:
+    """Append-only on-disk columns for `preds`, reopened as memory-mapped tensors."""
+
+    keys = ["id", "pose", "trans", "betas", "frame_idx"]
+
+    def __init__(self, directory, rows=0, layout=None):
+        """Open a new store, or reopen one at `rows` rows (dropping anything written after)."""
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.layout = dict(layout or {})
+        self.rows = rows
+        if rows:
+            for k, (dtype, shape) in self.layout.items():
+                with open(self.directory / f"{k}.bin", "r+b") as f:
+                    f.truncate(rows * np.dtype(dtype).itemsize * int(np.prod(shape)))
+            self.files = {k: open(self.directory / f"{k}.bin", "ab") for k in self.keys}
+        else:
+            self.files = {k: open(self.directory / f"{k}.bin", "wb") for k in self.keys}
+
+    def sync(self):
+        for f in self.files.values():
+            f.flush()
+            os.fsync(f.fileno())
+
+    def append(self, preds):
+        for k in self.keys:
+            arr = preds[k].detach().cpu().numpy()
+            self.layout.setdefault(k, (arr.dtype.str, list(arr.shape[1:])))
+            self.files[k].write(np.ascontiguousarray(arr).tobytes())
+        self.rows += len(preds["frame_idx"])
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+        with open(self.directory / "layout.json", "w") as f:
+            json.dump({"rows": self.rows, "layout": self.layout}, f)
+        return load_preds_store(self.directory)
+
+
+def load_preds_store(directory):
+    directory = Path(directory)
+    with open(directory / "layout.json") as f:
+        meta = json.load(f)
+    if meta["rows"] == 0:
+        return None
+    preds = {}
+    for k, (dtype, shape) in meta["layout"].items():
+        # Copy-on-write: in-place edits by consumers never reach the cached files
+        arr = np.memmap(directory / f"{k}.bin", dtype=np.dtype(dtype), mode="c", shape=(meta["rows"], *shape))
+        preds[k] = torch.from_numpy(arr)
+    return preds
+
+
+class TrackSink:
+    """Collects per-frame tracker outputs on the host.
+
+    With chunk_frames > 0 every chunk is cleaned up and appended to a
+    PredsStore as soon as it is full, so memory stays bounded by the chunk
+    size instead of the video length. Cleanup then only sees matches within
+    a chunk; with min_matched_frames=1 that keeps the same rows except for
+    tracks whose only matched frames fall in a different chunk.
+
+    When a chunk arrives together with a tracker snapshot, a checkpoint is
+    written to cache_dir after the flush so an interrupted run can resume.
+    """
+
+    def __init__(self, model, timer, chunk_frames=0, cache_dir=None, checkpoint=None):
+        self.model = model
+        self.timer = timer
+        self.chunk_frames = chunk_frames
+        self.cache_dir = cache_dir
+        self.detections, self.tracks = [], []
+        self.K = None
+        self.frames_done = checkpoint["frames_done"] if checkpoint else 0
+        self.store = None
+        if chunk_frames > 0:
+            rows, layout = (checkpoint["store_rows"], checkpoint["store_layout"]) if checkpoint else (0, None)
+            self.store = PredsStore(Path(cache_dir) / "chunks", rows, layout)
+        self.smpl_decoder = copy.deepcopy(model.smpl_decoder).cpu() if self.store else None
+
+    def add(self, detection, track, K, tracker_state=None):
+        t0 = time.perf_counter()
+        self.detections.append({k: v.cpu() for k, v in detection.items()})
+        self.tracks.append(track.cpu())
+        self.K = K
+        self.timer.add("writeback", time.perf_counter() - t0)
+        if self.store and len(self.tracks) >= self.chunk_frames:
+            self._flush(tracker_state)
+
+    def _flush(self, tracker_state=None):
+        t0 = time.perf_counter()
+        preds = cleanup_to_preds(self.detections, self.tracks, self.K, self.smpl_decoder, self.frames_done)
+        if preds is not None:
+            self.store.append(preds)
+        self.frames_done += len(self.tracks)
+        if tracker_state is not None:
+            self.store.sync()
+            tracking_cache.save_checkpoint(
+                self.cache_dir, tracker_state, self.frames_done, self.store.rows, self.store.layout, self.chunk_frames
+            )
+        self.timer.add("flush", time.perf_counter() - t0, len(self.tracks))
+        self.detections, self.tracks = [], []
+
+    def finish(self):
+        if self.store:
+            if self.tracks:
+                self._flush()
+            return self.store.close()
+        if not self.tracks:
+            return None
+        return cleanup_to_preds(self.detections, self.tracks, self.K, self.model.smpl_decoder.cpu())
+
+
+def prefetched(frames, depth, timer):
+    """Iterate `frames` with decoding running on a background thread."""
+    return pipeline.background(_timed_frames(frames, timer), depth, lambda seconds: timer.add("wait", seconds))
+
+
+def set_cpu_threads(intra, inter):
+    if intra > 0:
+        torch.set_num_threads(intra)
+    if inter > 0:
+        try:
+            torch.set_num_interop_threads(inter)
+        except RuntimeError:
+            # Only settable before the first inter-op parallel work in the process
+            logging.warning(f"Inter-op threads already fixed at {torch.get_num_interop_threads()}")
+
+
+def optimize_for_cpu(model, mode, compile_model=False):
+    """Apply the CPU performance mode to an eval-mode model.
+
+    int8 swaps every nn.Linear for a dynamically quantized one (weights int8,
+    activations quantized per batch); bf16 is applied as autocast around the
+    forward call (see inference_context). Compilation happens in place so
+    the tracker attributes stay on the same module object.
+    """
+    if mode not in CPU_MODES:
+        raise ValueError(f"Unknown cpu_mode '{mode}', expected one of {CPU_MODES}")
+    if mode == "int8":
+        model = torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+    if compile_model:
+        model.compile()
+    return model
+
+
+def inference_context(mode):
+    if device.type == "cpu" and mode == "bf16":
+        return torch.autocast("cpu", dtype=torch.bfloat16)
+    return contextlib.nullcontext()
+
+
+def load_model():
+    model = comotion.CoMotion(use_coreml=use_mps)
+    model = model.to(device).eval()
+    if device.type == "cpu" and not use_mps:
+        set_cpu_threads(intra_op_threads, inter_op_threads)
+        model = optimize_for_cpu(model, cpu_mode, cpu_compile)
+    return model
+
+
+@telemetry.timed("track")
+def track_poses(input_path, cache_path, model=None, cache_root=cache_root):
+    """Track every person in input_path and save the preds dict to cache_path.
+
+    Pass a loaded `model` to reuse it across videos; it is re-initialised
+    per video by init_tracks.
+    """
+    input_path, cache_path = Path(input_path), Path(cache_path)
+    version = tracking_cache.model_version(comotion, model_tag)
+    if roi_mode:
+        version += f"|roi:{roi_long_side}:{roi_margin}:{roi_height_prior}:{roi_warmup_frames}"
+    if device.type == "cpu" and not use_mps and (cpu_mode != "fp32" or cpu_compile):
+        version += f"|cpu:{cpu_mode}:{cpu_compile}"
+    if stream_chunk_frames > 0:
+        # Cleanup only matches tracks within a chunk, so the chunk size can change the kept rows
+        version += f"|chunk:{stream_chunk_frames}"
+    if adaptive_sampling:
+        version += (f"|keyframes:{keyframes.sparse_step}:{keyframes.dense_speed_ratio}:"
+                    f"{keyframes.dense_hold_frames}:{keyframes.baseline_keyframes}")
+    key = tracking_cache.cache_key(input_path, start_frame, num_frames, frameskip, version)
+    span = telemetry.current()
+    span.set(video=str(input_path), cache_hit=(cache_root / key / "preds.pt").exists())
+    cache_dir = cache_root / key
+    done_path = cache_dir / "preds.pt"
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    if done_path.exists():
+        shutil.copyfile(done_path, cache_path)
+        print(f"✅ Cache hit ({key}), copied tracking result to: {cache_path}")
+        return
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    if model is None:
+        model = load_model()
+
+    # Adaptive runs emit fewer outputs than frames decoded, so they do not checkpoint
+    checkpointing = stream_chunk_frames > 0 and not adaptive_sampling
+    checkpoint = tracking_cache.load_checkpoint(cache_dir, stream_chunk_frames) if resume and checkpointing else None
+    frames_done = checkpoint["frames_done"] if checkpoint else 0
+    if checkpoint:
+        logging.info(f"Resuming {key} after {frames_done} tracked frames")
+
+    timer = StageTimer()
+    wall_start = time.perf_counter()
+    sink = TrackSink(model, timer, stream_chunk_frames, cache_dir, checkpoint)
+    roi = BowlerRoi() if roi_mode else None
+    sampler = keyframes.KeyframeSampler() if adaptive_sampling else None
+    keyframe_list = []   # video frame of every emitted tracker output (adaptive sampling)
+    pending = []         # frames skipped since the previous keyframe, kept for a backfill
+
+    # The decoder restarts right after the checkpointed frames
+    frames = dataloading.yield_image_and_K(
+        input_path,
+        start_frame + frames_done * frameskip,
+        num_frames - frames_done * frameskip,
+        frameskip,
+    )
+    if pipelined:
+        frames = prefetched(frames, prefetch_depth, timer)
+        writeback_queue = queue.Queue(maxsize=writeback_depth)
+        writer_failed, writer_errors = threading.Event(), []
+        writer = threading.Thread(target=_writeback_worker, args=(writeback_queue, sink, writer_failed, writer_errors),
+                                  daemon=True)
+        writer.start()
+
+    initialized = False
+
+    def infer(image, K):
+        nonlocal initialized
+        # Outputs stay in full-frame camera coordinates, so cleanup uses the full-frame K
+        full_K, full_res = K, image.shape[-2:]
+        if roi:
+            t0 = time.perf_counter()
+            image, K = roi.crop(image, K)
+            timer.add("roi", time.perf_counter() - t0)
+
+        if not initialized:
+            image_res = image.shape[-2:]
+            model.init_tracks(image_res)
+            if checkpoint:
+                tracking_cache.restore_tracker(model, checkpoint["tracker"], device)
+            initialized = True
+
+        t0 = time.perf_counter()
+        with torch.no_grad(), inference_context(cpu_mode):
+            detection, track = model(image, K, use_mps=use_mps)
+        timer.add("inference", time.perf_counter() - t0)
+        if roi:
+            roi.update(track, full_K, full_res)
+        return detection, track, full_K
+
+    def emit(frame_num, detection, track, K, tracker_state=None):
+        keyframe_list.append(frame_num)
+        if pipelined:
+            if not pipeline.put(writeback_queue, (detection, track, K, tracker_state), writer_failed):
+                raise writer_errors[0]
+        else:
+            sink.add(detection, track, K, tracker_state)
+
+    try:
+        for frame_num, (image, K) in enumerate(tqdm(frames, desc="Running CoMotion"), start=frames_done):
+            if not sampler:
+                detection, track, full_K = infer(image, K)
+
+                # Snapshot tracker state on the inference thread at every chunk boundary
+                tracker_state = None
+                if stream_chunk_frames > 0 and (frame_num + 1) % stream_chunk_frames == 0:
+                    tracker_state = tracking_cache.snapshot_tracker(model)
+                emit(frame_num, detection, track, full_K, tracker_state)
+                continue
+
+            if not sampler.wants(frame_num):
+                pending.append((frame_num, image, K))
+                continue
+
+            # A sparse keyframe that turns out fast rewinds the tracker and backfills the skipped frames
+            before = tracking_cache.snapshot_tracker(model) if pending and initialized else None
+            detection, track, full_K = infer(image, K)
+            ids, pose = keyframes.track_arrays(track)
+            if before is not None and sampler.is_fast(sampler.speed(frame_num, ids, pose)):
+                tracking_cache.restore_tracker(model, before, device)
+                sampler.open_window(frame_num)
+                for f, skipped_image, skipped_K in pending + [(frame_num, image, K)]:
+                    detection, track, full_K = infer(skipped_image, skipped_K)
+                    sampler.record(f, *keyframes.track_arrays(track))
+                    emit(f, detection, track, full_K)
+            else:
+                sampler.record(frame_num, ids, pose)
+                emit(frame_num, detection, track, full_K)
+            pending = []
+
+        # Close the clip on a keyframe so the tail is interpolated rather than dropped
+        if pending:
+            frame_num, image, K = pending[-1]
+            detection, track, full_K = infer(image, K)
+            sampler.record(frame_num, *keyframes.track_arrays(track))
+            emit(frame_num, detection, track, full_K)
+    finally:
+        if pipelined:
+            frames.close()  # stops the decoder thread, also when inference fails
+            pipeline.put(writeback_queue, pipeline.DONE, writer_failed)
+            writer.join()
+    if pipelined and writer_errors:
+        raise writer_errors[0]
+
+    preds = sink.finish()
+    timer.report(time.perf_counter() - wall_start, span)
+    if roi and roi.work_res:
+        logging.info(f"ROI: {roi.roi_frames} cropped frames, {roi.full_frames} full frames "
+                     f"at {roi.work_res[1]}x{roi.work_res[0]}")
+    if sampler and keyframe_list:
+        total = keyframe_list[-1] + 1 - frames_done
+        logging.info(f"Adaptive sampling: inference on {len(keyframe_list)}/{total} frames "
+                     f"({100 * (1 - len(keyframe_list) / total):.1f}% saved)")
+        if preds is not None:
+            preds = keyframes.interpolate_preds(preds, keyframe_list)
+
+    if preds is not None:
+        torch.save(preds, done_path)
+        tracking_cache.clear_checkpoint(cache_dir)
+        shutil.copyfile(done_path, cache_path)
+        print(f"✅ Saved .pt file to: {cache_path}")
+
+
+@click.command()
+@click.option("--input", "video", default=str(input_path), type=click.Path(exists=True), help="Input video.")
+@click.option("--output", default=None, help="Output .pt (default: results/<video name>.pt).")
+@click.option("--cpu-mode", "mode", default=cpu_mode, type=click.Choice(CPU_MODES), help="CPU inference precision.")
+@click.option("--compile", "compile_model", is_flag=True, default=cpu_compile, help="torch.compile the model (CPU).")
+@click.option("--threads", default=intra_op_threads, type=int, help="Intra-op CPU threads (0 = default).")
+@click.option("--interop-threads", default=inter_op_threads, type=int, help="Inter-op CPU threads (0 = default).")
+def main(video, output, mode, compile_model, threads, interop_threads):
+    """Track every person in a video with CoMotion."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(funcName)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    global cpu_mode, cpu_compile, intra_op_threads, inter_op_threads
+    cpu_mode, cpu_compile, intra_op_threads, inter_op_threads = mode, compile_model, threads, interop_threads
+    output = Path(output) if output else output_dir / f"{Path(video).stem}.pt"
+    track_poses(video, output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+
+# === Content-addressed, resumable tracking cache ===
+# results/cache/<key>/
+#   chunks/        PredsStore columns streamed by tracking.py
+#   checkpoint.pt  tracker state + store position after the last flushed chunk
+#   preds.pt       final preds dict once the run completed
+
+
+def file_digest(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def model_version(model_module, tag):
+    """Version string for the tracker: a manual tag plus a hash of the model source."""
+    return f"{tag}:{file_digest(model_module.__file__)[:12]}"
+
+
+def cache_key(input_path, start_frame, num_frames, frameskip, version):
+    """Key on the video bytes plus every setting that changes the tracking output."""
+    settings = json.dumps(
+        {"start_frame": start_frame, "num_frames": num_frames, "frameskip": frameskip, "model": version},
+        sort_keys=True,
+    )
+    return hashlib.sha256(f"{file_digest(input_path)}|{settings}".encode()).hexdigest()[:32]
+
+
+def _to_cpu(value):
+    import torch
+
+    if isinstance(value, torch.Tensor):
+        return value.detach().cpu().clone()
+    if isinstance(value, dict):
+        return {k: _to_cpu(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_to_cpu(v) for v in value)
+    return value
+
+
+def _to_device(value, device):
+    import torch
+
+    if isinstance(value, torch.Tensor):
+        return value.to(device)
+    if isinstance(value, dict):
+        return {k: _to_device(v, device) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_to_device(v, device) for v in value)
+    return value
+
+
+def snapshot_tracker(model):
+    """Copy the tracking state that model.init_tracks() and forward() maintain.
+
+    CoMotion keeps its track state as plain attributes on the module, so
+    every public, non-submodule attribute plus the registered buffers is
+    captured (on CPU). Parameters are weights and are not included.
+    """
+    import torch
+
+    attributes = {
+        k: _to_cpu(v) for k, v in vars(model).items()
+        if not k.startswith("_") and k != "training" and not isinstance(v, torch.nn.Module) and not callable(v)
+    }
+    buffers = {name: buf.detach().cpu().clone() for name, buf in model.named_buffers()}
+    return {"attributes": attributes, "buffers": buffers}
+
+
+def restore_tracker(model, state, device):
+    for k, v in state["attributes"].items():
+        setattr(model, k, _to_device(v, device))
+    current = dict(model.named_buffers())
+    for name, value in state["buffers"].items():
+        current[name].copy_(value.to(current[name].device))
+
+
+def save_checkpoint(cache_dir, tracker_state, frames_done, store_rows, store_layout, chunk_frames):
+    """Atomically record that the first frames_done frames are safely in the store."""
+    import torch
+
+    cache_dir = Path(cache_dir)
+    tmp_path = cache_dir / "checkpoint.pt.tmp"
+    torch.save(
+        {
+            "tracker": tracker_state,
+            "frames_done": frames_done,
+            "store_rows": store_rows,
+            "store_layout": store_layout,
+            "chunk_frames": chunk_frames,
+        },
+        tmp_path,
+    )
+    os.replace(tmp_path, cache_dir / "checkpoint.pt")
+
+
+def load_checkpoint(cache_dir, chunk_frames):
+    """The checkpoint in cache_dir, or None (and it is discarded) if it was written with another chunk size.
+
+    Snapshots are taken on chunk boundaries, so a checkpoint is only resumable
+    with the chunk size whose flushes it recorded.
+    """
+    import torch
+
+    path = Path(cache_dir) / "checkpoint.pt"
+    if not path.exists():
+        return None
+    checkpoint = torch.load(path, map_location="cpu", weights_only=False)
+    if checkpoint.get("chunk_frames") != chunk_frames:
+        logging.warning(f"Checkpoint in {cache_dir} was written with {checkpoint.get('chunk_frames')}-frame chunks, "
+                        f"not {chunk_frames}; starting over")
+        clear_checkpoint(cache_dir)
+        return None
+    return checkpoint
+
+
+def clear_checkpoint(cache_dir):
+    path = Path(cache_dir) / "checkpoint.pt"
+    if path.exists():
+        path.unlink()
@@ -0,0 +1,497 @@
+import concurrent.futures as cf
+import logging
+import multiprocessing
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+import click
+import numpy as np
+from tqdm import tqdm
+
+from . import kinematics
+from . import telemetry
+
+# === CONFIG ===
+renderer = "aitviewer"  # "aitviewer" (OpenGL mesh) or "skeleton" (CPU joint renderer, no OpenGL needed)
+bone_thickness = 4
+joint_radius = 5
+render_workers = 1  # Worker processes for chunked rendering (each with its own renderer)
+keyframe_phases = ["jump", "bfc", "ffc", "release"]  # Frames shown on the contact sheet
+
+# SMPL bones as (joint, parent) pairs of the 24-joint tree
+SMPL_PARENTS = [-1, 0, 0, 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 9, 9, 12, 13, 14, 16, 17, 18, 19, 20, 21]
+BONES = np.array([(j, p) for j, p in enumerate(SMPL_PARENTS) if p >= 0])
+
+
+def load_aitviewer():
+    """Import and configure aitviewer on first use; False when it is not installed."""
+    try:
+        from aitviewer.configuration import CONFIG
+    except ModuleNotFoundError:
+        logging.warning("Skipped aitviewer import, ensure it is installed to run visualization.")
+        return False
+
+    from src.comotion_demo.models import comotion
+
+    comotion_model_dir = Path(comotion.__file__).parent
+    CONFIG.smplx_models = os.path.join(comotion_model_dir, "../data")
+    CONFIG.window_type = "pyqt6"
+    return True
+
+
+def prepare_scene_black_background(viewer, width, height, K, fps=30):
+    from aitviewer.scene.camera import OpenCVCamera
+
+    viewer.reset()
+    viewer.scene.floor.enabled = False
+    viewer.scene.origin.enabled = False
+    viewer.scene.bg_color = (0.0, 0.0, 0.0, 1.0)
+
+    extrinsics = np.eye(4)[:3]
+    cam = OpenCVCamera(K, extrinsics, cols=width, rows=height, viewer=viewer)
+    viewer.scene.add(cam)
+
+    # Farther back and angled downward so legs/toes fit
+    viewer.scene.camera.position = [0, 0, -25]     # <- Zoomed out
+    viewer.scene.camera.target = [0, -1.5, 0]      # <- Focus lower
+
+    viewer.auto_set_camera_target = False
+    viewer.set_temp_camera(cam)
+    viewer.playback_fps = fps
+
+
+
+def add_pose_to_scene(viewer, smpl_layer, betas, pose, trans, color=(0.6, 0.6, 0.6), alpha=1, color_ref=None):
+    from aitviewer.renderables.smpl import SMPLSequence
+
+    if betas.ndim == 2:
+        betas = betas[None]
+        pose = pose[None]
+        trans = trans[None]
+
+    poses_root = pose[..., :3]
+    poses_body = pose[..., 3:]
+    max_people = pose.shape[1]
+
+    if (betas != 0).any():
+        for person_idx in range(max_people):
+            person_color = (
+                color if color_ref is None
+                else (color_ref[person_idx % len(color_ref)] * 0.4 + 0.3)
+            )
+            person_color = [float(c) for c in person_color] + [alpha]
+
+            valid_vals = (betas[:, person_idx] != 0).any(-1)
+            if valid_vals.any():
+                trans[~valid_vals, person_idx, 2] = -10000
+                viewer.scene.add(
+                    SMPLSequence(
+                        smpl_layer=smpl_layer,
+                        betas=betas[:, person_idx],
+                        poses_root=poses_root[:, person_idx],
+                        poses_body=poses_body[:, person_idx],
+                        trans=trans[:, person_idx],
+                        color=person_color,
+                    )
+                )
+
+
+@click.command()
+@click.option("--width", default=1920, type=int, help="Width of output video.")
+@click.option("--height", default=1080, type=int, help="Height of output video.")
+@click.option("--fps", default=30, type=int, help="Frames per second.")
+@click.option("--color-r", default=0.6, type=float)
+@click.option("--color-g", default=0.6, type=float)
+@click.option("--color-b", default=0.6, type=float)
+@click.option("--alpha", default=1.0, type=float)
+@click.option("--renderer", "renderer_name", default=renderer, type=click.Choice(["aitviewer", "skeleton"]))
+@click.option("--video", default=None, type=click.Path(exists=True), help="Draw skeletons onto this video (skeleton renderer).")
+@click.option("--workers", default=render_workers, type=int, help="Render in this many parallel chunks.")
+@click.option("--keyframes", "segments_csv", default=None, type=click.Path(exists=True),
+              help="Only render the jump/BFC/FFC/release frames of this segments CSV as a contact sheet.")
+def visualize_pt_on_black_hardcoded(width, height, fps, color_r, color_g, color_b, alpha, renderer_name, video,
+                                    workers, segments_csv):
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(funcName)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    input_pt_path = Path("results/hardik.pt")
+    output_video_path = Path("rendered") / f"{input_pt_path.stem}"
+    options = {"width": width, "height": height, "fps": fps}
+    if renderer_name == "skeleton":
+        options["background_video"] = video
+    else:
+        options.update(color=(color_r, color_g, color_b), alpha=alpha)
+
+    if segments_csv:
+        render_contact_sheet(input_pt_path, segments_csv, Path("rendered") / f"{input_pt_path.stem}_keyframes.png",
+                             renderer_name, **options)
+    else:
+        render(input_pt_path, output_video_path, renderer_name, workers, **options)
+
+
+def render(input_pt_path, output_video_path, renderer_name=renderer, workers=render_workers, **kwargs):
+    """Render with the given renderer (in parallel chunks when workers > 1); returns the .mp4 path or None."""
+    if workers > 1:
+        return render_parallel(input_pt_path, output_video_path, workers, renderer_name, **kwargs)
+    if renderer_name == "skeleton":
+        return render_skeleton(input_pt_path, output_video_path, **kwargs)
+    return render_pt(input_pt_path, output_video_path, **kwargs)
+
+
+def frame_count(frame_idx, background_video=None):
+    """Frames a render covers: through the last detection, or the whole background video if that is longer."""
+    num_frames = int(max(frame_idx)) + 1 if len(frame_idx) else 0
+    if background_video:
+        import cv2
+
+        cap = cv2.VideoCapture(str(background_video))
+        num_frames = max(num_frames, int(cap.get(cv2.CAP_PROP_FRAME_COUNT)))
+        cap.release()
+    return num_frames
+
+
+def dense_tracks(preds, num_frames):
+    """Scatter detection rows into dense (frames, people, dim) betas/pose/trans, people ordered by track id."""
+    import torch
+
+    frame_idx = torch.as_tensor(preds["frame_idx"]).long()
+    if "id" in preds and len(preds["id"]) > 0:
+        ids = torch.as_tensor(preds["id"]).long().reshape(-1)
+        unique_ids = torch.unique(ids)
+        people = torch.searchsorted(unique_ids, ids)
+    else:
+        unique_ids = torch.zeros(1, dtype=torch.long)
+        people = torch.zeros_like(frame_idx)
+
+    dense = []
+    for key in ("betas", "pose", "trans"):
+        values = torch.as_tensor(preds[key])
+        out = torch.zeros(num_frames, len(unique_ids), values.shape[-1], dtype=values.dtype)
+        out[frame_idx, people] = values
+        dense.append(out)
+    return dense
+
+
+@telemetry.timed("render")
+def render_pt(input_pt_path, output_video_path, width=1920, height=1080, fps=30, color=(0.6, 0.6, 0.6), alpha=1.0,
+              frames=None):
+    """Render the SMPL sequence of a CoMotion .pt on a black background to output_video_path.
+
+    frames restricts the video to those source frame numbers, in order.
+    """
+    input_pt_path = Path(input_pt_path)
+    output_video_path = Path(output_video_path)
+    output_video_dir = output_video_path.parent
+    color_r, color_g, color_b = color
+
+    if not load_aitviewer():
+        logging.error("AITViewer is not available. Please install it to run visualization.")
+        return
+
+    import torch
+    from aitviewer.headless import HeadlessRenderer
+    from aitviewer.renderables.smpl import SMPLLayer
+    from src.comotion_demo.utils import dataloading, helper
+
+    logging.info(f"Visualizing SMPL poses from {input_pt_path} to {output_video_path}")
+
+    K = dataloading.get_default_K(torch.zeros(1, 3, height, width)).cpu().numpy()
+    viewer = HeadlessRenderer(size=(width, height))
+
+    smpl_layer = SMPLLayer(model_type="smpl", gender="neutral")
+    if not input_pt_path.exists():
+        logging.error(f"Error: .pt file not found at {input_pt_path}")
+        return
+
+    try:
+        preds = torch.load(input_pt_path, map_location="cpu")
+    except Exception as e:
+        logging.error(f"Error loading .pt file: {e}")
+        return
+
+    if "frame_idx" not in preds:
+        logging.error("'.pt' file must contain 'frame_idx' to visualize sequence.")
+        return
+
+    max_frame_idx = preds["frame_idx"].max().item()
+    num_total_frames = max_frame_idx + 1
+    span = telemetry.current()
+    span.add(num_total_frames)
+    mark = span.clock()
+
+    if not ("id" in preds and len(preds["id"]) > 0):
+        logging.warning("No 'id' field found in .pt file or no detections. Assuming a single person.")
+    keep = torch.as_tensor(list(frames), dtype=torch.long) if frames is not None else None
+    # Frames past the last detection (e.g. the tail of a chunk) come out as empty rows, which render nothing
+    dense_frames = max(num_total_frames, int(keep.max()) + 1) if keep is not None and len(keep) else num_total_frames
+    all_betas, all_pose, all_trans = dense_tracks(preds, dense_frames)
+    max_people_to_render = all_betas.shape[1]
+    if keep is not None:
+        all_betas, all_pose, all_trans = all_betas[keep], all_pose[keep], all_trans[keep]
+        if not (all_betas != 0).any():
+            # Nobody to add to the scene: aitviewer would not know the length, so write the empty frames directly
+            return write_black_video(output_video_path.with_suffix(".mp4"), len(keep), width, height, fps)
+
+    mark = span.lap("prepare", mark, num_total_frames)
+    prepare_scene_black_background(viewer, width, height, K, fps)
+
+    rendering_colors = [np.array([color_r, color_g, color_b])] * max_people_to_render
+    if 'id' in preds and max_people_to_render > 0:
+        rendering_colors = [helper.color_ref[idx % len(helper.color_ref)] for idx in range(max_people_to_render)]
+        rendering_colors = np.array(rendering_colors)
+
+    add_pose_to_scene(
+        viewer,
+        smpl_layer,
+        all_betas,
+        all_pose,
+        all_trans,
+        color=(color_r, color_g, color_b),
+        alpha=alpha,
+        color_ref=rendering_colors,
+    )
+
+    output_video_dir.mkdir(parents=True, exist_ok=True)
+    viewer.save_video(
+        video_dir=str(output_video_path),
+        output_fps=fps,
+        ensure_no_overwrite=False,
+    )
+    span.lap("render_encode", mark, num_total_frames)
+    logging.info(f"Video saved to {output_video_path}")
+    return output_video_path.with_suffix(".mp4")
+
+
+
+def write_black_video(output_video_path, num_frames, width, height, fps):
+    """num_frames black frames, for render ranges without any detection."""
+    import cv2
+
+    output_video_path.parent.mkdir(parents=True, exist_ok=True)
+    out = cv2.VideoWriter(str(output_video_path), cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    black = np.zeros((height, width, 3), dtype=np.uint8)
+    for _ in range(num_frames):
+        out.write(black)
+    out.release()
+    return output_video_path
+
+
+# === CPU skeleton renderer ===
+def project(points, K):
+    """Camera-space points [..., 3] to pixels [..., 2] through a 2x3 or 3x3 intrinsics K."""
+    K = np.asarray(K, dtype=np.float64)[:2]
+    z = np.maximum(points[..., 2:], 1e-6)
+    return points[..., :2] / z @ K[:, :2].T + K[:, 2]
+
+
+def draw_skeletons(canvas, pixels, depth, colors):
+    """Draw the bones and joints of every person (far to near) in one frame."""
+    import cv2
+
+    for i in np.argsort(-depth):
+        points = np.round(pixels[i]).astype(np.int32)
+        cv2.polylines(canvas, list(points[BONES]), False, colors[i], bone_thickness, cv2.LINE_AA)
+        for u, v in points:
+            cv2.circle(canvas, (int(u), int(v)), joint_radius, colors[i], -1, cv2.LINE_AA)
+    return canvas
+
+
+@telemetry.timed("render")
+def render_skeleton(input_pt_path, output_video_path, width=1920, height=1080, fps=30, background_video=None,
+                    smpl_path=kinematics.smpl_model_path, frames=None):
+    """Project the 24 SMPL joints of a CoMotion .pt through get_default_K and draw the bones with OpenCV.
+
+    Draws on a black canvas, or onto background_video (whose size and fps
+    then win). Writes output_video_path with an .mp4 suffix, like render_pt;
+    frames restricts it to those source frame numbers, in order.
+    """
+    import cv2
+    import torch
+    from src.comotion_demo.utils import dataloading, helper
+
+    output_video_path = Path(output_video_path).with_suffix(".mp4")
+    preds = torch.load(input_pt_path, map_location="cpu")
+    span = telemetry.current()
+    mark = span.clock()
+
+    cap = None
+    if background_video:
+        cap = cv2.VideoCapture(str(background_video))
+        if not cap.isOpened():
+            raise FileNotFoundError(f"Cannot open {background_video}")
+        width, height = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        fps = cap.get(cv2.CAP_PROP_FPS) or fps
+    K = dataloading.get_default_K(torch.zeros(1, 3, height, width)).cpu().numpy().reshape(-1, 3)
+
+    # Joints of every detection in one vectorized FK pass, then projected at once
+    joints, frame_idx, ids = kinematics.extract_joints(kinematics.load_skeleton(smpl_path), preds)
+    pixels = project(joints, K)
+    depth = joints[:, 0, 2]
+    visible = depth > 0.1
+    palette = {int(i): tuple(int(255 * c) for c in helper.color_ref[k % len(helper.color_ref)][::-1])
+               for k, i in enumerate(np.unique(ids))}
+    colors = [palette[int(i)] for i in ids]
+
+    order = np.argsort(frame_idx, kind="stable")
+    sorted_frames = frame_idx[order]
+    if frames is None:
+        frames = range(frame_count(frame_idx, background_video))
+    mark = span.lap("prepare", mark, len(frame_idx))
+
+    output_video_path.parent.mkdir(parents=True, exist_ok=True)
+    out = cv2.VideoWriter(str(output_video_path), cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    black = np.zeros((height, width, 3), dtype=np.uint8)
+    next_frame = 0
+    for f in tqdm(frames, desc="Rendering skeletons"):
+        if cap:
+            if f != next_frame:  # chunk start or sparse frames
+                cap.set(cv2.CAP_PROP_POS_FRAMES, f)
+            ret, canvas = cap.read()
+            if not ret:
+                break
+            next_frame = f + 1
+        else:
+            canvas = black.copy()
+        mark = span.lap("decode", mark)
+        rows = order[np.searchsorted(sorted_frames, f):np.searchsorted(sorted_frames, f, side="right")]
+        rows = rows[visible[rows]]
+        draw_skeletons(canvas, pixels[rows], depth[rows], [colors[r] for r in rows])
+        mark = span.lap("draw", mark)
+        out.write(canvas)
+        mark = span.lap("encode", mark)
+        span.add()
+
+    if cap:
+        cap.release()
+    out.release()
+    logging.info(f"Video saved to {output_video_path}")
+    return output_video_path
+
+
+
+# === Parallel chunked rendering ===
+def concat_videos(parts, output):
+    """Join mp4 segments: stream copy with ffmpeg when available, else re-encode with OpenCV."""
+    import cv2
+
+    if shutil.which("ffmpeg"):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.writelines(f"file '{Path(part).resolve()}'\n" for part in parts)
+        try:
+            subprocess.run(["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", f.name,
+                            "-c", "copy", str(output)], check=True)
+        finally:
+            os.remove(f.name)
+        return
+
+    logging.warning("ffmpeg not found: re-encoding the segments with OpenCV instead of a lossless stream copy")
+    out = None
+    for part in parts:
+        cap = cv2.VideoCapture(str(part))
+        if out is None:
+            size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+            out = cv2.VideoWriter(str(output), cv2.VideoWriter_fourcc(*"mp4v"), cap.get(cv2.CAP_PROP_FPS), size)
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            out.write(frame)
+        cap.release()
+    if out is not None:
+        out.release()
+
+
+def _render_chunk(renderer_name, input_pt_path, part_path, frames, kwargs):
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(funcName)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    return render(input_pt_path, part_path, renderer_name, workers=1, frames=frames, **kwargs)
+
+
+def render_parallel(input_pt_path, output_video_path, workers=4, renderer_name=renderer, **kwargs):
+    """Split the frame range into one chunk per worker, render each in its own process and join them."""
+    import torch
+
+    output_video_path = Path(output_video_path)
+    frame_idx = torch.load(input_pt_path, map_location="cpu")["frame_idx"].tolist()
+    # Same range as a serial render, so both outputs have the same length
+    num_frames = frame_count(frame_idx, kwargs.get("background_video"))
+    chunks = [c.tolist() for c in np.array_split(np.arange(num_frames), min(workers, num_frames))]
+    part_paths = [output_video_path.parent / f"{output_video_path.stem}_part{k:03d}" for k in range(len(chunks))]
+    logging.info(f"Rendering {num_frames} frames in {len(chunks)} chunks with the {renderer_name} renderer")
+
+    ctx = multiprocessing.get_context("spawn")
+    with cf.ProcessPoolExecutor(len(chunks), mp_context=ctx) as pool:
+        parts = list(pool.map(_render_chunk, [renderer_name] * len(chunks), [str(input_pt_path)] * len(chunks),
+                              part_paths, chunks, [kwargs] * len(chunks)))
+    if any(part is None for part in parts):
+        logging.error("A render chunk failed")
+        return None
+
+    final = output_video_path.with_suffix(".mp4")
+    concat_videos(parts, final)
+    for part in parts:
+        os.remove(part)
+    logging.info(f"Video saved to {final}")
+    return final
+
+
+# === Keyframe contact sheet ===
+def phase_keyframes(segments_csv, phases=keyframe_phases):
+    """First labelled frame of each phase in a segments CSV, as {phase: frame}."""
+    import pandas as pd
+
+    labels = pd.read_csv(segments_csv)
+    return {phase: int(labels.loc[labels["label"] == phase, "frame"].min())
+            for phase in phases if (labels["label"] == phase).any()}
+
+
+def render_contact_sheet(input_pt_path, segments_csv, output_image, renderer_name=renderer, tile_width=640,
+                         **kwargs):
+    """Render only the phase keyframes and tile them, labelled, into one image for a quick review."""
+    import cv2
+
+    keyframes = phase_keyframes(segments_csv)
+    if not keyframes:
+        logging.error(f"No {'/'.join(keyframe_phases)} labels in {segments_csv}")
+        return None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = render(input_pt_path, Path(tmp) / "keyframes", renderer_name, workers=1,
+                       frames=list(keyframes.values()), **kwargs)
+        if video is None:
+            return None
+        cap = cv2.VideoCapture(str(video))
+        tiles = []
+        for phase, frame in keyframes.items():
+            ret, image = cap.read()
+            if not ret:
+                break
+            image = cv2.resize(image, (tile_width, round(image.shape[0] * tile_width / image.shape[1])))
+            cv2.putText(image, f"{phase.upper()}  frame {frame}", (15, 35), cv2.FONT_HERSHEY_SIMPLEX, 0.9,
+                        (0, 255, 255), 2, cv2.LINE_AA)
+            tiles.append(image)
+        cap.release()
+    if not tiles:
+        logging.error(f"No keyframes could be read back from the render of {input_pt_path}")
+        return None
+
+    # Two tiles per row, padded with black
+    if len(tiles) % 2:
+        tiles.append(np.zeros_like(tiles[0]))
+    sheet = np.vstack([np.hstack(tiles[i:i + 2]) for i in range(0, len(tiles), 2)])
+    Path(output_image).parent.mkdir(parents=True, exist_ok=True)
+    cv2.imwrite(str(output_image), sheet)
+    logging.info(f"Contact sheet saved to {output_image}")
+    return output_image
+
+
+if __name__ == "__main__":
+    visualize_pt_on_black_hardcoded()
@@ -0,0 +1,7 @@
+# Convert legacy per-phase CSVs into a joint store — implementation in fastbowliq/joint_store.py
+import sys
+
+from fastbowliq.joint_store import convert_phase_csvs
+
+if __name__ == "__main__":
+    convert_phase_csvs(sys.argv[1], sys.argv[2])
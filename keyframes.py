@@ -0,0 +1,5 @@
+# Evaluate adaptive keyframe sampling against dense tracking — implementation in fastbowliq/keyframes.py
+from fastbowliq.keyframes import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+# Parity check of joints-only FK against smplx — implementation in fastbowliq/kinematics.py
+from fastbowliq.kinematics import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+# Offline rule-based biomechanics report — implementation in fastbowliq/report.py
+from fastbowliq.report import report
+
+if __name__ == "__main__":
+    report()
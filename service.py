@@ -0,0 +1,5 @@
+# Local HTTP service with warm models and a job queue — implementation in fastbowliq/service.py
+from fastbowliq.service import serve
+
+if __name__ == "__main__":
+    serve()
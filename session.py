@@ -0,0 +1,5 @@
+# Split a long nets session into deliveries and analyse each — implementation in fastbowliq/session.py
+from fastbowliq.session import session
+
+if __name__ == "__main__":
+    session()
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from fastbowliq import autosegment
+
+
+def standing_joints(num_frames):
+    """Flat-footed bowler (y points down): feet on the ground, wrist below the shoulder."""
+    joints = np.zeros((num_frames, 24, 3))
+    joints[:, :, 2] = np.linspace(10, 5, num_frames)[:, None]
+    joints[:, [autosegment.L_ANKLE, autosegment.R_ANKLE], 0] = [[-0.1, 0.1]]
+    joints[:, [autosegment.L_FOOT, autosegment.R_FOOT], 0] = [[-0.1, 0.1]]
+    joints[:, [autosegment.L_SHOULDER, autosegment.R_SHOULDER], 1] = -1.4
+    joints[:, [autosegment.L_WRIST, autosegment.R_WRIST], 1] = -1.0
+    return joints
+
+
+@pytest.mark.parametrize("release", [0, 1])
+def test_release_at_clip_start_raises_clear_error(release):
+    joints = standing_joints(30)
+    joints[release, autosegment.R_WRIST, 1] = -3.0  # arm straight up: release frame
+
+    with pytest.raises(ValueError, match="Cannot detect FFC"):
+        autosegment.detect_events(joints, np.arange(100, 130))
+
+
+def test_landing_index_finds_plant_after_swing():
+    height = np.r_[np.zeros(5), 0.1, 0.2, 0.3, 0.2, 0.1, np.zeros(10)]
+
+    apex, landing = autosegment.landing_index(height, 2, len(height))
+
+    assert apex == 7
+    assert landing == 11  # first frame at rest: frames 9-10 are still moving down
@@ -0,0 +1,59 @@
+import os
+
+import numpy as np
+import pytest
+
+from fastbowliq import kinematics
+
+torch = pytest.importorskip("torch")
+lbs = pytest.importorskip("smplx.lbs")
+
+from benchmarks.synthetic import synthetic_preds, synthetic_skeleton  # noqa: E402
+
+SMPL_WEIGHTS = os.path.join(kinematics.smpl_model_path, "SMPL_NEUTRAL.pkl")
+
+
+def smplx_joints(skeleton, pose, betas, trans):
+    """Posed joints from smplx's own rigid chain on the same rest skeleton."""
+    rest = torch.from_numpy(skeleton.rest_joints(betas))
+    rot_mats = lbs.batch_rodrigues(torch.from_numpy(pose).reshape(-1, 3)).reshape(len(pose), 24, 3, 3)
+    posed, _ = lbs.batch_rigid_transform(rot_mats, rest, torch.from_numpy(skeleton.parents), dtype=torch.float64)
+    return posed.numpy() + trans[:, None]
+
+
+def test_forward_kinematics_matches_smplx_rigid_transform():
+    rng = np.random.default_rng(0)
+    skeleton = synthetic_skeleton()
+    pose = rng.normal(0, 0.8, (64, 72))
+    betas = rng.normal(0, 1, (64, skeleton.num_betas))
+    betas[32:] = betas[0]  # shared shapes go through the unique-betas gather
+    trans = rng.normal(0, 5, (64, 3))
+
+    joints = kinematics.forward_kinematics(skeleton, pose, betas, trans)
+
+    np.testing.assert_allclose(joints, smplx_joints(skeleton, pose, betas, trans), atol=1e-9)
+
+
+def test_extract_joints_keeps_row_order():
+    skeleton = synthetic_skeleton()
+    preds = synthetic_preds(40)
+
+    joints, frame_idx, ids = kinematics.extract_joints(skeleton, preds, chunk_size=16)
+
+    expected = kinematics.forward_kinematics(
+        skeleton, preds["pose"].float().numpy(), preds["betas"].float().numpy(), preds["trans"].float().numpy()
+    )
+    np.testing.assert_allclose(joints, expected, atol=1e-5)
+    np.testing.assert_array_equal(frame_idx, preds["frame_idx"].numpy())
+    np.testing.assert_array_equal(ids, preds["id"].numpy())
+
+
+@pytest.mark.skipif(not os.path.exists(SMPL_WEIGHTS), reason=f"SMPL weights not found at {SMPL_WEIGHTS}")
+def test_parity_with_full_smpl_forward():
+    from smplx import SMPL
+
+    smpl = SMPL(model_path=kinematics.smpl_model_path, gender="neutral", batch_size=1)
+
+    max_err, _, _ = kinematics.check_parity(smpl, synthetic_preds(60))
+
+    assert max_err < kinematics.parity_tolerance
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from fastbowliq import analysis, metrics
+from fastbowliq.joint_store import save_store
+
+
+def bowler_frame(knee=180.0, elbow_bend=0.0, stride=(0.0, 0.0, 0.8), reach=1.0):
+    """One (24, 3) frame built so every metric has a hand-computable value.
+
+    knee       — angle (deg) at the left knee between thigh and shin
+    elbow_bend — bowling-arm deviation from straight (deg)
+    stride     — right ankle minus left ankle
+    reach      — z gap between the bowling hand and the front toe
+    Hips and shoulders lie along x (side-on), collars are 45° off the hips,
+    the spine leans 45° sideways and the head is 1.7 above the left ankle.
+    """
+    j = np.zeros((24, 3))
+    j[metrics.L_HIP], j[metrics.R_HIP] = (0.1, 1.0, 0.0), (-0.1, 1.0, 0.0)
+    j[metrics.L_KNEE] = (0.1, 0.5, 0.0)
+    k = np.radians(knee)
+    j[metrics.L_ANKLE] = j[metrics.L_KNEE] + 0.5 * np.array([np.sin(k), np.cos(k), 0.0])
+    j[metrics.R_ANKLE] = j[metrics.L_ANKLE] + stride
+    j[metrics.HEAD] = j[metrics.L_ANKLE] + (0.0, 1.7, 0.0)
+    j[metrics.L_FOOT] = (0.1, 0.0, 0.2)
+    j[metrics.R_HAND] = (-0.2, 2.0, 0.2 + reach)
+
+    j[metrics.L_SHOULDER], j[metrics.R_SHOULDER] = (0.2, 1.5, 0.0), (-0.2, 1.5, 0.0)
+    j[metrics.R_ELBOW] = (-0.2, 1.8, 0.0)
+    b = np.radians(elbow_bend)
+    j[metrics.R_WRIST] = j[metrics.R_ELBOW] + 0.3 * np.array([np.sin(b), np.cos(b), 0.0])
+    j[metrics.L_COLLAR], j[metrics.R_COLLAR] = (0.1, 1.4, 0.0), (-0.1, 1.4, 0.2)
+
+    j[metrics.PELVIS], j[metrics.SPINE3] = (0.0, 1.0, 0.0), (0.3, 1.3, 0.0)
+    return j
+
+
+def test_metric_series_matches_hand_computed_values():
+    joints = np.stack([
+        bowler_frame(knee=90, elbow_bend=5, stride=(0.3, 0.0, 0.4), reach=0.5),
+        bowler_frame(knee=150, elbow_bend=15, stride=(0.6, 0.0, 0.8), reach=1.0),
+        bowler_frame(knee=175, elbow_bend=30, stride=(0.0, 0.0, 1.5), reach=1.5),
+    ])
+
+    series = metrics.metric_series(joints)
+
+    np.testing.assert_allclose(series["knee_angle"], [90, 150, 175], atol=1e-4)
+    np.testing.assert_allclose(series["elbow_extension"], [5, 15, 30], atol=1e-4)
+    np.testing.assert_allclose(series["stride_raw"], [0.5, 1.0, 1.5])
+    np.testing.assert_allclose(series["reach_raw"], [0.5, 1.0, 1.5])
+    np.testing.assert_allclose(series["model_height"], [1.8, 1.8, 1.8])
+    np.testing.assert_allclose(series["hip_shoulder_separation"], [45, 45, 45], atol=1e-4)
+    np.testing.assert_allclose(series["lateral_flexion"], [45, 45, 45])
+    assert metrics.classify_alignment(joints[0]) == "side-on"
+
+
+def test_metric_series_batches_deliveries():
+    one = np.stack([bowler_frame(knee=k, elbow_bend=e) for k, e in [(120, 5), (160, 20)]])
+    two = np.stack([bowler_frame(knee=k, elbow_bend=e) for k, e in [(100, 0), (175, 10)]])
+
+    batched = metrics.metric_series(np.stack([one, two]))
+
+    for name, values in batched.items():
+        np.testing.assert_allclose(values[0], metrics.metric_series(one)[name])
+        np.testing.assert_allclose(values[1], metrics.metric_series(two)[name])
+
+
+def test_analyze_reports_phase_metrics(tmp_path):
+    frames = np.arange(100, 106)
+    labels = ["jump", "bfc", "bfc", "ffc", "release", "followthrough"]
+    joints = np.stack([
+        bowler_frame(),
+        bowler_frame(knee=90),                                  # BFC
+        bowler_frame(knee=150),                                 # BFC
+        bowler_frame(stride=(0.6, 0.0, 0.8)),                   # FFC: stride 1.0
+        bowler_frame(knee=170, elbow_bend=12, reach=0.9),       # release
+        bowler_frame(elbow_bend=40),                            # outside every phase
+    ])
+    save_store(tmp_path / "store", joints, frames, labels)
+
+    row = analysis.analyze(tmp_path / "store", tmp_path / "out", force=True).iloc[0]
+
+    scale = analysis.actual_height / 1.8  # model height at FFC
+    assert (row["Frame_BFC"], row["Frame_FFC"], row["Frame_Release"]) == (101, 103, 104)
+    assert row["Back_Knee_Angle_BFC"] == pytest.approx(120, abs=1e-4)
+    assert row["Stride_Length_m"] == pytest.approx(1.0 * scale)
+    assert row["Stride_Length_in"] == pytest.approx(1.0 * scale * 39.3701)
+    assert row["Alignment"] == "side-on"
+    assert row["Max_Elbow_Angle"] == pytest.approx(12, abs=1e-4)
+    assert row["Hip_Shoulder_Separation"] == pytest.approx(45, abs=1e-4)
+    assert row["Front_Knee_Angle_Release"] == pytest.approx(170, abs=1e-4)
+    assert row["Delivery_Reach_m"] == pytest.approx(0.9 * scale)
+    assert row["Lateral_Flexion"] == pytest.approx(45)